@@ -9,18 +9,56 @@ pip install selenium undetected-chromedriver webdriver-manager
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.common.keys import Keys
 import json
 import csv
-import time
-import random
 import re
 from datetime import datetime, timedelta
 
+from indeed_cards import CARD_TAGS
+from indeed_enrichment import TEXT_ENRICHER_DETAILS
+from indeed_lazy_load import LazyLoader
+from indeed_pacing import Pacer
+from indeed_page_scripts import arm_pane_wait, card_field, extract_cards, extract_scoped, wait_for_pane
+from indeed_resource_blocker import ResourceBlocker
+from indeed_selectors import SelectorCascade
+
+# Card fields read in-page by extract_cards (selectors tried in order)
+CARD_FIELDS = {
+    'title': card_field('h2.jobTitle span', 'h2.jobTitle a', 'a.jcs-JobTitle', 'span[id^="jobTitle-"]'),
+    'apply_url': card_field('h2.jobTitle a, a.jcs-JobTitle', attr='href'),
+    'company': card_field('span[data-testid="company-name"]', '.companyName', 'span.companyName'),
+    'rating': card_field('.ratingNumber, span[class*="rating"]'),
+    'location': card_field('div[data-testid="text-location"]', '.companyLocation', 'div.companyLocation'),
+    'salary': card_field('.salary-snippet-container, .salary-snippet, span.salary'),
+    'snippet': card_field('.job-snippet, ul.job-snippet'),
+    'posted_date': card_field('.date, span.date'),
+    'logo': card_field('img[class*="logo"], img[class*="avatar"]', attr='src'),
+}
+# Detail pane fields, read with one extract_scoped call after a click (scoped to the first root found)
+DETAIL_ROOTS = ('#jobsearch-ViewjobPaneWrapper', '.jobsearch-ViewJobLayout-jobDisplay',
+                '.jobsearch-JobComponent', 'body')
+DETAIL_FIELDS = {
+    'description': card_field('#jobDescriptionText'),
+    'company': card_field('[data-company-name="true"]'),
+    'location': card_field('div[data-testid="jobsearch-JobInfoHeader-companyLocation"]',
+                           'div.jobsearch-JobInfoHeader-subtitle-container div',
+                           'div.jobsearch-CompanyInfoWithoutHeaderImage'),
+    'salary': card_field('#salaryInfoAndJobType', 'div[id*="salary"]', 'span[class*="salary"]'),
+    'posted_date': card_field('span.jobsearch-JobMetadataFooter-item span'),
+    'apply_url': card_field('#applyButtonLinkContainer a, button#indeedApplyButton', attr='href'),
+    'logo': card_field('img[alt*="logo"], img.jobsearch-CompanyAvatar-image', attr='src'),
+}
+DETAIL_TAGS = {
+    'urgent': {'words': ('urge contratar', 'urgently hiring', 'contratación urgente'),
+               'css': CARD_TAGS['urgent']['css']},
+}
+# Job card selectors for the results page (tried best-first, see indeed_selectors)
+LISTING_SELECTORS = ('div.job_seen_beacon', 'div[data-jk]', 'td.resultContent', 'li.css-5lfssm')
+
 class IndeedFullDetailsScraper:
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, block_resources=True):
         """Initialize Selenium driver"""
         options = uc.ChromeOptions()
         
@@ -35,7 +73,15 @@ class IndeedFullDetailsScraper:
         options.add_argument('--window-size=1920,1080')
         
         print("🚀 Initializing Chrome driver...")
-        self.driver = uc.Chrome(options=options)
+        self.driver = uc.Chrome(options=options, enable_cdp_events=block_resources)
+        # drop images/fonts/media/trackers - we only read DOM text
+        self.blocker = ResourceBlocker(enabled=block_resources)
+        self.blocker.attach_selenium(self.driver)
+        self.pacer = Pacer(initial_rate=0.5)
+        self.listing_cascade = SelectorCascade('selenium.details.cards', LISTING_SELECTORS)
+        # replaces the 2-4s render sleep + 1s scroll sleep
+        self.lazy_loader = LazyLoader(baseline=4.0, selector=', '.join(LISTING_SELECTORS))
+        self.listing_url = None
         self.driver.set_page_load_timeout(30)
         self.wait = WebDriverWait(self.driver, 10)
         print("✅ Driver ready!\n")
@@ -107,222 +153,84 @@ class IndeedFullDetailsScraper:
     
     def extract_experience_from_text(self, text):
         """Extract experience requirements from text"""
-        if not text:
-            return None, None
-        
-        text_lower = text.lower()
-        
-        # Look for experience patterns
-        exp_patterns = [
-            r'(\d+)\+?\s*(años?|years?)\s*(?:de\s*)?(?:experiencia|experience)',
-            r'(?:experiencia|experience)\s*(?:de\s*)?(\d+)\+?\s*(años?|years?)',
-            r'(\d+)\s*-\s*(\d+)\s*(años?|years?)',
-        ]
-        
-        for pattern in exp_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                years = int(match.group(1))
-                
-                if years >= 7:
-                    return f"{years}+ years", 'senior'
-                elif years >= 3:
-                    return f"{years}+ years", 'mid'
-                elif years >= 1:
-                    return f"{years}+ years", 'junior'
-                else:
-                    return f"{years} years", 'entry'
-        
-        # Check for keywords
-        if any(word in text_lower for word in ['senior', 'sr.', 'lead', 'principal']):
-            return '5+ years', 'senior'
-        elif any(word in text_lower for word in ['junior', 'jr.', 'entry level', 'entry-level', 'sin experiencia']):
-            return '0-2 years', 'entry'
-        elif any(word in text_lower for word in ['mid', 'intermediate', 'intermedio']):
-            return '2-5 years', 'mid'
-        
-        return None, None
+        return TEXT_ENRICHER_DETAILS.experience(text)
     
     def extract_qualification(self, text):
         """Extract education qualification from text"""
-        if not text:
-            return None
-        
-        text_lower = text.lower()
-        
-        if any(word in text_lower for word in ['phd', 'doctorado', 'doctorate', 'ph.d']):
-            return 'doctorate'
-        elif any(word in text_lower for word in ['maestría', 'master', 'msc', 'mba', "master's", 'postgrado']):
-            return 'master'
-        elif any(word in text_lower for word in ['licenciatura', 'bachelor', 'grado', 'universitario', 'university degree', "bachelor's"]):
-            return 'bachelor'
-        elif any(word in text_lower for word in ['técnico', 'technical', 'associate', 'diploma']):
-            return 'associate'
-        elif any(word in text_lower for word in ['secundaria', 'high school', 'bachillerato']):
-            return 'high_school'
-        
-        return None
+        return TEXT_ENRICHER_DETAILS.qualification(text)
     
     def extract_job_type(self, text):
         """Extract job type from text"""
-        if not text:
-            return None
-        
-        text_lower = text.lower()
-        
-        if 'tiempo completo' in text_lower or 'full time' in text_lower or 'full-time' in text_lower:
-            return 'full-time'
-        elif 'medio tiempo' in text_lower or 'part time' in text_lower or 'part-time' in text_lower:
-            return 'part-time'
-        elif 'temporal' in text_lower or 'temporary' in text_lower:
-            return 'temporary'
-        elif 'contrato' in text_lower or 'contract' in text_lower or 'contractor' in text_lower:
-            return 'contract'
-        elif 'internship' in text_lower or 'pasantía' in text_lower or 'intern' in text_lower:
-            return 'internship'
-        elif 'freelance' in text_lower or 'por proyecto' in text_lower:
-            return 'freelance'
-        
-        return None
+        return TEXT_ENRICHER_DETAILS.job_type(text)
     
     def click_job_and_extract_details(self, job_element, job_data):
         """Click on a job and extract full details from the detail pane"""
         try:
             # Click the job card to open details
+            self.pacer.wait(self.listing_url)
+            arm_pane_wait(self.driver, "#jobDescriptionText")
             job_element.click()
-            time.sleep(random.uniform(1.5, 3))
             
-            # Wait for detail pane to load
+            # Wait until the detail pane shows this job (not the previous one)
             try:
-                self.wait.until(EC.presence_of_element_located((By.ID, "jobDescriptionText")))
+                loaded = wait_for_pane(self.driver, "#jobDescriptionText", job_data['job_id'], timeout=10)
+                self.pacer.record(self.listing_url, loaded, 'pane timeout')
             except:
                 pass
             
-            # Extract full description
-            try:
-                desc_elem = self.driver.find_element(By.ID, "jobDescriptionText")
-                full_description = desc_elem.text.strip()
-                job_data['description'] = full_description
-                
-                # Extract experience and qualification from description
-                exp, career_level = self.extract_experience_from_text(full_description)
-                if exp:
-                    job_data['experience'] = exp
-                if career_level:
-                    job_data['career_level'] = career_level
-                
-                qualification = self.extract_qualification(full_description)
-                if qualification:
-                    job_data['qualification'] = qualification
-                
-                # Extract job type if not already found
-                if not job_data['type']:
-                    job_type = self.extract_job_type(full_description)
-                    if job_type:
-                        job_data['type'] = job_type
-                
-            except:
-                pass
-            
-            # Extract company details from detail pane
-            try:
-                company_elem = self.driver.find_element(By.CSS_SELECTOR, '[data-company-name="true"]')
-                if not job_data['company']:
-                    job_data['company'] = company_elem.text.strip()
-            except:
-                pass
-            
-            # Extract full location/address
-            try:
-                location_selectors = [
-                    'div[data-testid="jobsearch-JobInfoHeader-companyLocation"]',
-                    'div.jobsearch-JobInfoHeader-subtitle-container div',
-                    'div.jobsearch-CompanyInfoWithoutHeaderImage'
-                ]
-                
-                for selector in location_selectors:
-                    try:
-                        loc_elem = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        loc_text = loc_elem.text.strip()
-                        if loc_text and not job_data['location']:
-                            job_data['location'] = loc_text
-                            job_data['address'] = loc_text
-                            break
-                    except:
-                        continue
-            except:
-                pass
-            
-            # Extract salary from detail view
-            try:
-                salary_selectors = [
-                    '#salaryInfoAndJobType',
-                    'div[id*="salary"]',
-                    'span[class*="salary"]'
-                ]
-                
-                for selector in salary_selectors:
-                    try:
-                        salary_elem = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        salary_text = salary_elem.text.strip()
-                        if salary_text and not job_data['salary']:
-                            salary_info = self.extract_salary(salary_text)
-                            job_data.update(salary_info)
-                            break
-                    except:
-                        continue
-            except:
-                pass
-            
-            # Check for "Urgently Hiring"
-            try:
-                urgent = self.driver.find_element(By.XPATH, "//*[contains(text(), 'Urge contratar') or contains(text(), 'Urgently hiring') or contains(text(), 'contratación urgente')]")
-                if urgent:
-                    job_data['urgent'] = True
-                    if 'urgent' not in job_data['tag']:
-                        job_data['tag'].append('urgent')
-            except:
-                pass
-            
-            # Posted date from detail view
-            try:
-                date_elem = self.driver.find_element(By.CSS_SELECTOR, 'span.jobsearch-JobMetadataFooter-item span')
-                date_text = date_elem.text.strip()
-                if date_text and not job_data['posted_date']:
-                    job_data['posted_date'] = self.parse_date(date_text)
-            except:
-                pass
-            
-            # Apply button URL
-            try:
-                apply_button = self.driver.find_element(By.CSS_SELECTOR, '#applyButtonLinkContainer a, button#indeedApplyButton')
-                apply_url = apply_button.get_attribute('href')
-                if apply_url:
-                    job_data['apply_url'] = apply_url
-                    
-                    # Determine apply type
-                    if 'indeed.com' in apply_url:
-                        job_data['apply_type'] = 'indeed'
-                    else:
-                        job_data['apply_type'] = 'external'
-            except:
-                pass
-            
-            # Company logo from detail pane
-            try:
-                if not job_data['featured_image']:
-                    logo_elem = self.driver.find_element(By.CSS_SELECTOR, 'img[alt*="logo"], img.jobsearch-CompanyAvatar-image')
-                    logo_src = logo_elem.get_attribute('src')
-                    if logo_src:
-                        job_data['featured_image'] = logo_src
-            except:
-                pass
+            # Every pane field and the urgency tag in one scoped round trip
+            pane = extract_scoped(self.driver, DETAIL_ROOTS, DETAIL_FIELDS, DETAIL_TAGS)
+            if pane:
+                self.apply_detail_values(job_data, pane['values'], pane['tags'])
             
         except Exception as e:
             print(f"      ⚠️  Error extracting details: {e}")
     
+    def apply_detail_values(self, job_data, values, tags):
+        """Merge the detail pane values (see DETAIL_FIELDS) and tags into job_data"""
+        full_description = values['description']
+        if full_description:
+            job_data['description'] = full_description
+            
+            # Experience, qualification and job type in one pass over the description
+            derived = TEXT_ENRICHER_DETAILS.enrich(full_description)
+            if derived['experience']:
+                job_data['experience'] = derived['experience']
+            if derived['career_level']:
+                job_data['career_level'] = derived['career_level']
+            if derived['qualification']:
+                job_data['qualification'] = derived['qualification']
+            if derived['job_type'] and not job_data['type']:
+                job_data['type'] = derived['job_type']
+        
+        if values['company'] and not job_data['company']:
+            job_data['company'] = values['company']
+        
+        if values['location'] and not job_data['location']:
+            job_data['location'] = values['location']
+            job_data['address'] = values['location']
+        
+        if values['salary'] and not job_data['salary']:
+            job_data.update(self.extract_salary(values['salary']))
+        
+        if 'urgent' in tags:
+            job_data['urgent'] = True
+            if 'urgent' not in job_data['tag']:
+                job_data['tag'].append('urgent')
+        
+        if values['posted_date'] and not job_data['posted_date']:
+            job_data['posted_date'] = self.parse_date(values['posted_date'])
+        
+        apply_url = values['apply_url']
+        if apply_url:
+            job_data['apply_url'] = apply_url
+            job_data['apply_type'] = 'indeed' if 'indeed.com' in apply_url else 'external'
+        
+        if values['logo'] and not job_data['featured_image']:
+            job_data['featured_image'] = values['logo']
+    
     def extract_job_from_card(self, card):
-        """Extract basic job data from a job card"""
+        """Build basic job data from one entry returned by extract_cards (see CARD_FIELDS)"""
         job_data = {
             'featured_image': None,
             'title': None,
@@ -357,132 +265,83 @@ class IndeedFullDetailsScraper:
             'source': 'indeed_cr'
         }
         
-        try:
-            # Job ID
-            job_data['job_id'] = card.get_attribute('data-jk')
-            
-            # Title and URL - try multiple selectors
-            title_selectors = [
-                'h2.jobTitle span',
-                'h2.jobTitle a',
-                'a.jcs-JobTitle',
-                'span[id^="jobTitle-"]'
-            ]
-            
-            for selector in title_selectors:
-                try:
-                    title_elem = card.find_element(By.CSS_SELECTOR, selector)
-                    job_data['title'] = title_elem.text.strip()
-                    
-                    # Try to get link
-                    try:
-                        if title_elem.tag_name == 'a':
-                            job_data['apply_url'] = title_elem.get_attribute('href')
-                        else:
-                            link = card.find_element(By.CSS_SELECTOR, 'h2.jobTitle a, a.jcs-JobTitle')
-                            job_data['apply_url'] = link.get_attribute('href')
-                    except:
-                        pass
-                    
-                    break
-                except:
-                    continue
-            
-            # Company
-            company_selectors = [
-                'span[data-testid="company-name"]',
-                '.companyName',
-                'span.companyName'
-            ]
-            
-            for selector in company_selectors:
-                try:
-                    company_elem = card.find_element(By.CSS_SELECTOR, selector)
-                    job_data['company'] = company_elem.text.strip()
-                    break
-                except:
-                    continue
-            
-            # Rating
-            try:
-                rating_elem = card.find_element(By.CSS_SELECTOR, '.ratingNumber, span[class*="rating"]')
-                rating_text = rating_elem.text.strip()
-                job_data['company_rating'] = float(rating_text)
-            except:
-                pass
-            
-            # Location
-            location_selectors = [
-                'div[data-testid="text-location"]',
-                '.companyLocation',
-                'div.companyLocation'
-            ]
-            
-            for selector in location_selectors:
-                try:
-                    location_elem = card.find_element(By.CSS_SELECTOR, selector)
-                    location_text = location_elem.text.strip()
-                    job_data['location'] = location_text
-                    job_data['address'] = location_text
-                    break
-                except:
-                    continue
-            
-            # Salary
-            try:
-                salary_elem = card.find_element(By.CSS_SELECTOR, '.salary-snippet-container, .salary-snippet, span.salary')
-                salary_text = salary_elem.text.strip()
-                salary_info = self.extract_salary(salary_text)
-                job_data.update(salary_info)
-            except:
-                pass
-            
-            # Snippet description
-            try:
-                snippet_elem = card.find_element(By.CSS_SELECTOR, '.job-snippet, ul.job-snippet')
-                snippet_text = snippet_elem.text.strip()
-                job_data['description'] = snippet_text
-                
-                # Detect job type from snippet
-                job_type = self.extract_job_type(snippet_text)
-                if job_type:
-                    job_data['type'] = job_type
-            except:
-                pass
-            
-            # Posted date
+        values = card['values']
+        
+        # Job ID
+        job_data['job_id'] = card['jk']
+        
+        # Title, URL and company
+        job_data['title'] = values['title']
+        job_data['apply_url'] = values['apply_url']
+        job_data['company'] = values['company']
+        
+        # Rating
+        if values['rating']:
             try:
-                date_elem = card.find_element(By.CSS_SELECTOR, '.date, span.date')
-                date_text = date_elem.text.strip()
-                job_data['posted_date'] = self.parse_date(date_text)
-            except:
+                job_data['company_rating'] = float(values['rating'])
+            except ValueError:
                 pass
+        
+        # Location
+        job_data['location'] = values['location']
+        job_data['address'] = values['location']
+        
+        # Salary
+        if values['salary']:
+            salary_info = self.extract_salary(values['salary'])
+            job_data.update(salary_info)
+        
+        # Snippet description
+        if values['snippet']:
+            job_data['description'] = values['snippet']
             
-            # Check for tags
-            card_html = card.get_attribute('innerHTML').lower()
-            
-            if 'patrocinado' in card_html or 'sponsored' in card_html:
-                job_data['featured'] = True
-                job_data['tag'].append('sponsored')
+            # Detect job type from snippet
+            job_type = self.extract_job_type(values['snippet'])
+            if job_type:
+                job_data['type'] = job_type
+        
+        # Posted date
+        if values['posted_date']:
+            job_data['posted_date'] = self.parse_date(values['posted_date'])
+        
+        # Check for tags (label nodes or the card's text, see indeed_cards.CARD_TAGS)
+        tags = card['tags']
+        
+        if 'sponsored' in tags:
+            job_data['featured'] = True
+            job_data['tag'].append('sponsored')
+        
+        if 'urgent' in tags:
+            job_data['urgent'] = True
+            job_data['tag'].append('urgent')
+        
+        if 'new' in tags or ('hoy' in (job_data['posted_date'] or '')):
+            job_data['tag'].append('new')
+        
+        # Logo
+        job_data['featured_image'] = values['logo']
+        
+        return job_data
+    
+    def load_listing(self, url, attempts=2):
+        """Open a results page (paced) and return its job cards; an empty list backs off and retries"""
+        self.listing_url = url
+        for attempt in range(attempts):
+            self.pacer.wait(url)
+            self.driver.get(url)
             
-            if 'urge contratar' in card_html or 'urgently' in card_html or 'urgente' in card_html:
-                job_data['urgent'] = True
-                job_data['tag'].append('urgent')
+            # Scroll until the card count stops changing
+            self.lazy_loader.selenium(self.driver)
             
-            if 'nuevo' in card_html or ('hoy' in (job_data['posted_date'] or '')):
-                job_data['tag'].append('new')
+            # Find job cards (last page's winning selector first)
+            _, cards = self.listing_cascade.find(lambda css: self.driver.find_elements(By.CSS_SELECTOR, css))
+            if cards:
+                print(f"  ✅ Found {len(cards)} jobs\n")
+                self.pacer.success(url)
+                return cards
             
-            # Logo
-            try:
-                logo = card.find_element(By.CSS_SELECTOR, 'img[class*="logo"], img[class*="avatar"]')
-                job_data['featured_image'] = logo.get_attribute('src')
-            except:
-                pass
-            
-        except Exception as e:
-            print(f"      ⚠️  Error extracting from card: {e}")
-        
-        return job_data
+            self.pacer.failure(url, 'no cards')
+        return None
     
     def scrape_jobs(self, search_url, max_pages=5, max_jobs=None, extract_full_details=True):
         """Scrape jobs with optional full details extraction"""
@@ -502,31 +361,7 @@ class IndeedFullDetailsScraper:
             print(f"📄 Page {page + 1}/{max_pages}")
             
             try:
-                self.driver.get(url)
-                time.sleep(random.uniform(2, 4))
-                
-                # Scroll to load content
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-                time.sleep(1)
-                
-                # Find job cards
-                job_cards = None
-                selectors = [
-                    'div.job_seen_beacon',
-                    'div[data-jk]',
-                    'td.resultContent',
-                    'li.css-5lfssm'
-                ]
-                
-                for selector in selectors:
-                    try:
-                        cards = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        if cards:
-                            job_cards = cards
-                            print(f"  ✅ Found {len(cards)} jobs\n")
-                            break
-                    except:
-                        continue
+                job_cards = self.load_listing(url)
                 
                 if not job_cards:
                     print("  ⚠️  No job cards found")
@@ -535,11 +370,18 @@ class IndeedFullDetailsScraper:
                         f.write(self.driver.page_source)
                     break
                 
+                # Read every card's fields in one round trip
+                try:
+                    cards_info = extract_cards(self.driver, job_cards, CARD_FIELDS, CARD_TAGS)
+                except Exception as e:
+                    print(f"  ⚠️  Card extraction failed: {e}")
+                    break
+                
                 # Extract jobs
-                for idx, card in enumerate(job_cards, 1):
+                for idx, (card, card_info) in enumerate(zip(job_cards, cards_info), 1):
                     try:
                         # Extract basic info
-                        job_data = self.extract_job_from_card(card)
+                        job_data = self.extract_job_from_card(card_info)
                         
                         if not job_data['title']:
                             continue
@@ -559,20 +401,15 @@ class IndeedFullDetailsScraper:
                             print(f"\n✅ Reached max jobs limit ({max_jobs})")
                             return all_jobs
                         
-                        # Small delay between jobs
-                        time.sleep(random.uniform(0.5, 1.5))
-                        
                     except Exception as e:
                         print(f"      ❌ Error: {e}")
                         continue
                 
                 print()  # Blank line between pages
                 
-                # Delay between pages
+                # Next page is paced by load_listing
                 if page < max_pages - 1:
-                    delay = random.uniform(3, 6)
-                    print(f"  ⏳ Waiting {delay:.1f}s before next page...\n")
-                    time.sleep(delay)
+                    print(f"  ⏳ Pacing at {self.pacer.current_rate(url):.2f} req/s\n")
                 
             except Exception as e:
                 print(f"  ❌ Page error: {e}")
@@ -583,6 +420,10 @@ class IndeedFullDetailsScraper:
     def close(self):
         """Close browser"""
         print("\n🔒 Closing browser...")
+        self.blocker.report()
+        self.pacer.report()
+        self.listing_cascade.report()
+        self.lazy_loader.report()
         self.driver.quit()
     
     def save_to_json(self, jobs, filename='indeed_jobs.json'):
@@ -15,10 +15,32 @@ import time
 import random
 import re
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
+
+from indeed_cards import detect_card_tags, extract_mosaic_cards
+from indeed_html import SERP_REGION, parse_fragment, parse_region, select_by_class_pattern
+from indeed_page_scripts import probe_selectors
+from indeed_lazy_load import LazyLoader
+from indeed_network import SeleniumDocumentCapture
+from indeed_pacing import Pacer
+from indeed_resource_blocker import ResourceBlocker
+from indeed_selectors import SelectorCascade
+
+# Job list selectors as (type, selector), tried best-first (see indeed_selectors)
+JOB_SELECTORS = (
+    ('CSS', 'div.job_seen_beacon'),
+    ('CSS', 'div[data-jk]'),
+    ('CSS', 'td.resultContent'),
+    ('CSS', 'div.jobsearch-SerpJobCard'),
+    ('CSS', 'li[data-jk]'),
+    ('CSS', 'div.slider_container div.slider_item'),
+    ('CSS', 'table.jobCard_mainContent'),
+    ('CSS', 'div[class*="job"]'),
+    ('XPATH', '//div[contains(@class, "job")]'),
+    ('XPATH', '//td[contains(@class, "resultContent")]'),
+)
 
 class ImprovedIndeedScraper:
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, block_resources=True):
         """Initialize with better options"""
         options = uc.ChromeOptions()
         
@@ -40,7 +62,20 @@ class ImprovedIndeedScraper:
         
         print("🚀 Initializing Chrome driver...")
         try:
-            self.driver = uc.Chrome(options=options, version_main=None)
+            # CDP events feed the document capture (and the blocker's counts)
+            self.driver = uc.Chrome(options=options, version_main=None, enable_cdp_events=True)
+            # drop images/fonts/media/trackers - we only read DOM text
+            self.blocker = ResourceBlocker(enabled=block_resources)
+            self.blocker.attach_selenium(self.driver)
+            # the SERP's server response; pages whose mosaic JSON parses skip the render wait
+            self.capture = SeleniumDocumentCapture(self.driver)
+            if not self.capture.attach():
+                print("⚠️ Network capture unavailable, pages will be rendered")
+            self.raw_pages = 0
+            self.pacer = Pacer(initial_rate=0.25)
+            self.job_cascade = SelectorCascade('selenium.job_list', JOB_SELECTORS)
+            # replaces the 3s load sleep + 1s scroll sleep
+            self.lazy_loader = LazyLoader(baseline=4.0)
             self.driver.set_page_load_timeout(30)
             self.wait = WebDriverWait(self.driver, 15)
             print("✅ Driver ready!\n")
@@ -112,68 +147,38 @@ class ImprovedIndeedScraper:
         """Wait for page to load and find job elements using multiple strategies"""
         print("  🔍 Analyzing page structure...")
         
-        # Wait for page to fully load
-        time.sleep(3)
+        # Scroll until the card count stops changing (instead of fixed load/scroll sleeps)
+        self.lazy_loader.selenium(self.driver)
         
-        # Try to scroll first
+        # Count every selector in one script (best hit rate first); more than 3 matches = valid job list
+        ordered = self.job_cascade.ordered()
         try:
-            self.driver.execute_script("window.scrollTo(0, 500);")
-            time.sleep(1)
-        except:
-            pass
-        
-        # Get page source for analysis
-        soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-        
-        # Try multiple selectors
-        job_selectors = [
-            ('CSS', 'div.job_seen_beacon'),
-            ('CSS', 'div[data-jk]'),
-            ('CSS', 'td.resultContent'),
-            ('CSS', 'div.jobsearch-SerpJobCard'),
-            ('CSS', 'li[data-jk]'),
-            ('CSS', 'div.slider_container div.slider_item'),
-            ('CSS', 'table.jobCard_mainContent'),
-            ('CSS', 'div[class*="job"]'),
-            ('XPATH', '//div[contains(@class, "job")]'),
-            ('XPATH', '//td[contains(@class, "resultContent")]'),
-        ]
-        
-        jobs_found = []
-        
-        for selector_type, selector in job_selectors:
-            try:
-                if selector_type == 'CSS':
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                else:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                
-                if elements and len(elements) > 3:  # Found valid job list
-                    print(f"  ✅ Found {len(elements)} jobs using: {selector}")
-                    jobs_found = elements
-                    break
-            except:
-                continue
-        
-        # If no jobs found with selenium, try parsing HTML directly
-        if not jobs_found:
-            print("  🔧 Trying HTML parsing fallback...")
-            
-            # Look for job cards in HTML
-            job_cards = (
-                soup.find_all('div', class_='job_seen_beacon') or
-                soup.find_all('div', attrs={'data-jk': True}) or
-                soup.find_all('td', class_='resultContent') or
-                soup.find_all('div', class_=re.compile(r'jobsearch.*Card')) or
-                soup.find_all('li', attrs={'data-jk': True})
-            )
-            
-            if job_cards:
-                print(f"  ✅ Found {len(job_cards)} jobs in HTML")
-                return job_cards, 'html'
-        
-        if jobs_found:
-            return jobs_found, 'selenium'
+            counts, elements = probe_selectors(self.driver, ordered, min_count=4)
+        except Exception:
+            counts, elements = [None] * len(ordered), []
+        counts = dict(zip(ordered, counts))
+        selector, _ = self.job_cascade.find(counts.get, accept=lambda count: count > 3)
+        
+        if selector and elements:
+            print(f"  ✅ Found {len(elements)} jobs using: {selector[1]}")
+            return elements, 'selenium'
+        
+        # If no jobs found with selenium, try parsing HTML directly (page source only fetched now)
+        print("  🔧 Trying HTML parsing fallback...")
+        soup = parse_region(self.driver.page_source, SERP_REGION)
+        
+        # Look for job cards in HTML
+        job_cards = (
+            soup.select('div.job_seen_beacon') or
+            soup.select('div[data-jk]') or
+            soup.select('td.resultContent') or
+            select_by_class_pattern(soup, 'div', r'jobsearch.*Card') or
+            soup.select('li[data-jk]')
+        )
+        
+        if job_cards:
+            print(f"  ✅ Found {len(job_cards)} jobs in HTML")
+            return job_cards, 'html'
         
         # Last resort - save debug info
         print("  ❌ Could not find jobs. Analyzing page...")
@@ -185,7 +190,7 @@ class ImprovedIndeedScraper:
             return None, None
         
         # Look for any links that might be jobs
-        all_links = soup.find_all('a', href=True)
+        all_links = soup.select('a[href]')
         job_links = [a for a in all_links if '/viewjob' in a.get('href', '') or 'jk=' in a.get('href', '')]
         
         if job_links:
@@ -195,7 +200,7 @@ class ImprovedIndeedScraper:
         return None, None
     
     def extract_from_html(self, soup_element):
-        """Extract job data from BeautifulSoup element"""
+        """Extract job data from a parsed element (see indeed_html)"""
         job_data = self.get_empty_job_dict()
         
         try:
@@ -204,15 +209,15 @@ class ImprovedIndeedScraper:
             
             # Title
             title_elem = (
-                soup_element.find('h2', class_='jobTitle') or
-                soup_element.find('a', class_=re.compile(r'jcs.*JobTitle')) or
-                soup_element.find('span', id=re.compile(r'jobTitle'))
+                soup_element.select_one('h2.jobTitle') or
+                select_by_class_pattern(soup_element, 'a', r'jcs.*JobTitle', first=True) or
+                soup_element.select_one('span[id*="jobTitle"]')
             )
             if title_elem:
                 job_data['title'] = title_elem.get_text(strip=True)
                 
                 # URL
-                link = title_elem.find('a') if title_elem.name != 'a' else title_elem
+                link = title_elem.select_one('a') if title_elem.name != 'a' else title_elem
                 if link and link.get('href'):
                     href = link['href']
                     if href.startswith('http'):
@@ -222,14 +227,14 @@ class ImprovedIndeedScraper:
             
             # Company
             company_elem = (
-                soup_element.find('span', attrs={'data-testid': 'company-name'}) or
-                soup_element.find('span', class_='companyName')
+                soup_element.select_one('span[data-testid="company-name"]') or
+                soup_element.select_one('span.companyName')
             )
             if company_elem:
                 job_data['company'] = company_elem.get_text(strip=True)
             
             # Rating
-            rating_elem = soup_element.find('span', class_='ratingNumber')
+            rating_elem = soup_element.select_one('span.ratingNumber')
             if rating_elem:
                 try:
                     job_data['company_rating'] = float(rating_elem.get_text(strip=True))
@@ -238,8 +243,8 @@ class ImprovedIndeedScraper:
             
             # Location
             location_elem = (
-                soup_element.find('div', attrs={'data-testid': 'text-location'}) or
-                soup_element.find('div', class_='companyLocation')
+                soup_element.select_one('div[data-testid="text-location"]') or
+                soup_element.select_one('div.companyLocation')
             )
             if location_elem:
                 loc_text = location_elem.get_text(strip=True)
@@ -247,28 +252,28 @@ class ImprovedIndeedScraper:
                 job_data['address'] = loc_text
             
             # Salary
-            salary_elem = soup_element.find('div', class_=re.compile(r'salary'))
+            salary_elem = soup_element.select_one('div[class*="salary"]')
             if salary_elem:
                 salary_info = self.extract_salary(salary_elem.get_text())
                 job_data.update(salary_info)
             
             # Description snippet
-            snippet_elem = soup_element.find('div', class_='job-snippet')
+            snippet_elem = soup_element.select_one('div.job-snippet')
             if snippet_elem:
                 job_data['description'] = snippet_elem.get_text(strip=True)
             
             # Date
-            date_elem = soup_element.find('span', class_='date')
+            date_elem = soup_element.select_one('span.date')
             if date_elem:
                 job_data['posted_date'] = self.parse_date(date_elem.get_text())
             
             # Tags
-            html_text = str(soup_element).lower()
-            if 'patrocinado' in html_text or 'sponsored' in html_text:
+            tags = detect_card_tags(soup_element)
+            if 'sponsored' in tags:
                 job_data['featured'] = True
                 job_data['tag'].append('sponsored')
             
-            if 'urge contratar' in html_text or 'urgently' in html_text:
+            if 'urgent' in tags:
                 job_data['urgent'] = True
                 job_data['tag'].append('urgent')
             
@@ -277,6 +282,35 @@ class ImprovedIndeedScraper:
         
         return job_data
     
+    def extract_from_mosaic(self, card):
+        """Extract job data from a normalized mosaic card (see indeed_cards.extract_mosaic_cards)"""
+        job_data = self.get_empty_job_dict()
+        job_data['job_id'] = card['job_key']
+        job_data['title'] = card['title']
+        job_data['apply_url'] = card['url']
+        job_data['company'] = card['company']
+        try:
+            job_data['company_rating'] = float(card['company_rating']) if card['company_rating'] else None
+        except (TypeError, ValueError):
+            pass
+        if card['location']:
+            job_data['location'] = card['location']
+            job_data['address'] = card['location']
+        if card['salary']:
+            job_data.update(self.extract_salary(card['salary']))
+        job_data['description'] = card['snippet']
+        if card['posted']:
+            job_data['posted_date'] = self.parse_date(card['posted'])
+        
+        if card['sponsored']:
+            job_data['featured'] = True
+            job_data['tag'].append('sponsored')
+        if card['urgent']:
+            job_data['urgent'] = True
+            job_data['tag'].append('urgent')
+        
+        return job_data
+    
     def extract_from_selenium(self, element):
         """Extract from Selenium element"""
         job_data = self.get_empty_job_dict()
@@ -284,8 +318,7 @@ class ImprovedIndeedScraper:
         try:
             # Get the HTML and parse it
             html = element.get_attribute('outerHTML')
-            soup = BeautifulSoup(html, 'html.parser')
-            return self.extract_from_html(soup)
+            return self.extract_from_html(parse_fragment(html))
         except StaleElementReferenceException:
             print("    ⚠️  Stale element")
             return job_data
@@ -325,12 +358,22 @@ class ImprovedIndeedScraper:
             print(f"📄 Page {page + 1}/{max_pages}")
             
             try:
-                # Load page
+                # Load page (paced per host)
+                self.pacer.wait(url)
+                self.capture.arm()
                 self.driver.get(url)
-                time.sleep(random.uniform(3, 5))
                 
-                # Find jobs
-                job_elements, element_type = self.wait_and_find_jobs()
+                # The server response already carries every card as mosaic JSON;
+                # wait for render and scroll only when it doesn't
+                job_elements = extract_mosaic_cards(self.capture.wait())
+                if job_elements:
+                    element_type = 'mosaic'
+                    self.raw_pages += 1
+                    print(f"  ✅ Found {len(job_elements)} jobs in the server response (mosaic JSON)")
+                else:
+                    time.sleep(random.uniform(3, 5))
+                    job_elements, element_type = self.wait_and_find_jobs()
+                self.pacer.record(url, bool(job_elements), 'no cards')
                 
                 if not job_elements:
                     print("  ⚠️  No jobs found. Saving debug files...")
@@ -345,7 +388,9 @@ class ImprovedIndeedScraper:
                 
                 for idx, element in enumerate(job_elements, 1):
                     try:
-                        if element_type == 'html':
+                        if element_type == 'mosaic':
+                            job_data = self.extract_from_mosaic(element)
+                        elif element_type == 'html':
                             job_data = self.extract_from_html(element)
                         elif element_type == 'selenium':
                             job_data = self.extract_from_selenium(element)
@@ -385,11 +430,9 @@ class ImprovedIndeedScraper:
                 except:
                     pass
                 
-                # Delay
+                # Next page is paced before it loads
                 if page < max_pages - 1:
-                    delay = random.uniform(4, 7)
-                    print(f"  ⏳ Waiting {delay:.1f}s...\n")
-                    time.sleep(delay)
+                    print(f"  ⏳ Pacing at {self.pacer.current_rate(url):.2f} req/s\n")
             
             except Exception as e:
                 print(f"  ❌ Page error: {e}")
@@ -399,6 +442,12 @@ class ImprovedIndeedScraper:
     
     def close(self):
         """Close browser safely"""
+        self.blocker.report()
+        self.pacer.report()
+        self.job_cascade.report()
+        self.lazy_loader.report()
+        if self.raw_pages:
+            print(f"📡 {self.raw_pages} pages parsed straight from the server response (no render wait)")
         try:
             if self.driver:
                 self.driver.quit()
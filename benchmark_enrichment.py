@@ -0,0 +1,298 @@
+"""
+Description Enrichment Benchmark
+Times indeed_enrichment.TextEnricher against the per-field extract_* functions it
+replaced (reimplemented below from the same rule tables) on the checked-in
+datasets, and checks that every field comes out identical. Also checks that the
+English-labelled copy rules, localised with indeed_localize, give the Spanish output.
+The reimplementations share the enricher's rule tables; tests/test_enrichment.py
+checks the enricher against golden values of the removed functions themselves.
+
+--cache replays the files in order as consecutive runs through a fresh
+indeed_enrichment_cache.EnrichmentCache and reports the hit rate and time per run.
+
+--profile splits enrich() time by stage and times the substring rules as one
+trie alternation scan (the same lookahead regex finds every word of the three
+word lists in one pass) against the plain `in` chains enrich() uses.
+
+--baseline REV times enrich() against the scrapers' own extract_* methods as they
+were at git revision REV (default ce2935d, before any enrichment work), loaded with
+`git show`. Categories changed meaning since then (word-bounded, scored), so this
+compares time only.
+
+Usage:
+python benchmark_enrichment.py                        # indeed_cr_jobs_*.json, 5 runs
+python benchmark_enrichment.py jobs.json --runs 10
+python benchmark_enrichment.py --verify               # exit 1 if any field differs
+python benchmark_enrichment.py --cache                # cross-run enrichment cache
+python benchmark_enrichment.py --profile              # where enrich() spends its time
+python benchmark_enrichment.py --baseline             # against the ce2935d extractors
+"""
+
+import argparse
+import ast
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+from indeed_enrichment import (CATEGORY_MATCHER, CATEGORY_MATCHER_EN, CATEGORY_MATCHER_ES, TEXT_ENRICHER_EN,
+                               TEXT_ENRICHER_ES, TEXT_RULES, TEXT_RULES_BASIC, TEXT_RULES_DETAILS, TEXT_RULES_EN,
+                               TEXT_RULES_ES, TextEnricher, trie_pattern)
+from indeed_enrichment_cache import EnrichmentCache
+from indeed_localize import localize_jobs
+
+# rule set -> category matcher of the scraper using it (None: it has no category)
+RULE_SETS = {
+    'nodriver': (TEXT_RULES, CATEGORY_MATCHER),
+    'details': (TEXT_RULES_DETAILS, None),
+    'full details': (TEXT_RULES_BASIC, CATEGORY_MATCHER),
+    'spanish': (TEXT_RULES_ES, CATEGORY_MATCHER_ES),
+    'english (copy)': (TEXT_RULES_EN, CATEGORY_MATCHER_EN),
+}
+# enrich() keys -> job_data columns
+# word-list rules of TEXT_RULES (substring checks, first group that hits wins)
+SUBSTRING_RULES = ('qualification', 'job_type', 'experience_words')
+# scraper at the baseline revision -> (its rules' enricher, title passed to enrich())
+BASELINE_SCRAPERS = {
+    'indeed_arc_details_scraper.py': ('nodriver', True),
+    'indeed_full_details_scraper.py': ('full details', True),
+}
+BASELINE_METHODS = ('extract_experience_from_text', 'extract_qualification', 'extract_job_type', 'extract_category')
+FIELD_COLUMNS = {'experience': '_job_experience', 'career_level': '_job_career_level',
+                 'qualification': '_job_qualification', 'job_type': '_job_type', 'category': '_job_category'}
+
+
+# -------------------------
+# Per-field functions, as the scrapers had them
+# -------------------------
+def legacy_experience(text, rules):
+    if not text:
+        return None, None
+    s = text.lower()
+    for pattern, _ in rules['experience_patterns']:
+        m = re.search(pattern, s)
+        if m:
+            years = int(m.group(1))
+            for minimum, experience, level in rules['experience_levels']:
+                if years >= minimum:
+                    return experience.format(years=years), level
+    for words, found in rules['experience_words']:
+        if any(w in s for w in words):
+            return found
+    return None, None
+
+
+def legacy_first(text, rules):
+    if not text:
+        return None
+    s = text.lower()
+    for words, value in rules:
+        if any(w in s for w in words):
+            return value
+    return None
+
+
+def legacy_enrich(title, description, rules, matcher):
+    experience, career_level = legacy_experience(description, rules)
+    fields = {
+        'experience': experience,
+        'career_level': career_level,
+        'qualification': legacy_first(description, rules['qualification']),
+        'job_type': legacy_first(description, rules['job_type']),
+    }
+    if matcher is not None:
+        fields['category'] = matcher.classify(title, description)
+    return fields
+
+
+def load_jobs(files):
+    jobs = []
+    for path in files:
+        with open(path, encoding='utf-8') as f:
+            jobs.extend(json.load(f))
+    return [(job.get('_job_title') or '', job.get('_job_description') or '') for job in jobs]
+
+
+def best_time(run, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = run()
+        times.append(time.perf_counter() - start)
+    return min(times), output
+
+
+def benchmark(files, runs=5):
+    jobs = load_jobs(files)
+    print(f"🧪 {len(jobs)} jobs from {', '.join(files)}\n")
+    print(f"  {'rules':14s} {'per-field':>10s} {'enricher':>10s} {'speedup':>8s}  output")
+
+    all_identical = True
+    for name, (rules, matcher) in RULE_SETS.items():
+        enricher = TextEnricher(rules, matcher)
+        title_of = (lambda title: title) if matcher is not None else (lambda title: None)
+        old_s, old = best_time(lambda: [legacy_enrich(t, d, rules, matcher) for t, d in jobs], runs)
+        new_s, new = best_time(lambda: [enricher.enrich(d, title_of(t)) for t, d in jobs], runs)
+
+        # the single-field helpers are used on card snippets
+        same = old == new and all(
+            enricher.experience(d) == legacy_experience(d, rules)
+            and enricher.job_type(d) == legacy_first(d, rules['job_type'])
+            and enricher.qualification(d) == legacy_first(d, rules['qualification']) for _, d in jobs)
+        all_identical &= same
+        status = '✅ identical' if same else '❌ differs'
+        print(f"  {name:14s} {old_s * 1000:8.1f}ms {new_s * 1000:8.1f}ms {old_s / new_s:7.1f}x  {status}")
+        if not same:
+            for (title, _), a, b in zip(jobs, old, new):
+                if a != b:
+                    print(f"     {title[:50]}: {a} != {b}")
+                    break
+
+    # the copy scraper enriches in English and localises at save time
+    as_columns = lambda fields: {FIELD_COLUMNS[k]: v for k, v in fields.items()}
+    english = [as_columns(TEXT_ENRICHER_EN.enrich(d, t)) for t, d in jobs]
+    start = time.perf_counter()
+    localized = localize_jobs(english, 'es')
+    localize_s = time.perf_counter() - start
+    same = localized == [as_columns(TEXT_ENRICHER_ES.enrich(d, t)) for t, d in jobs]
+    all_identical &= same
+    status = '✅ identical to spanish' if same else '❌ differs from spanish'
+    print(f"  {'localized es':14s} {'':>10s} {localize_s * 1000:8.1f}ms {'':>8s}  {status}")
+    print()
+    return all_identical
+
+
+def benchmark_cache(files):
+    """Each file as one run: enrichment through a persistent cache vs from scratch"""
+    print(f"🗃️ Cross-run enrichment cache ({len(files)} runs)\n")
+    print(f"  {'run':36s} {'jobs':>5s} {'hits':>5s} {'scratch':>9s} {'cached':>9s}  output")
+    identical = True
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = EnrichmentCache(os.path.join(tmp, 'enrichment.sqlite'))
+        enricher = TextEnricher(TEXT_RULES, CATEGORY_MATCHER)
+        for path in files:
+            texts = [(d, t) for t, d in load_jobs([path])]
+            start = time.perf_counter()
+            scratch = [enricher.enrich(d, t) if d else None for d, t in texts]
+            scratch_s = time.perf_counter() - start
+            hits = cache.hits
+            start = time.perf_counter()
+            cached = cache.enrich_many(enricher, texts)
+            cached_s = time.perf_counter() - start
+            same = cached == scratch
+            identical &= same
+            print(f"  {os.path.basename(path):36s} {len(texts):5d} {cache.hits - hits:5d} "
+                  f"{scratch_s * 1000:7.1f}ms {cached_s * 1000:7.1f}ms  {'✅' if same else '❌'}")
+        cache.close()
+    print()
+    return identical
+
+
+def baseline_extractors(revision, path):
+    """The scraper's extract_* methods at `revision`, as plain functions (they never use self)"""
+    source = subprocess.run(['git', 'show', f'{revision}:{path}'], capture_output=True, text=True, check=True).stdout
+    methods = [node for node in ast.walk(ast.parse(source))
+               if isinstance(node, ast.FunctionDef) and node.name in BASELINE_METHODS]
+    namespace = {'re': re}
+    exec(compile(ast.Module(body=methods, type_ignores=[]), f'{revision}:{path}', 'exec'), namespace)
+    return [namespace[name] for name in BASELINE_METHODS]
+
+
+def benchmark_baseline(files, revision, runs=5):
+    """enrich() against the per-field extractors the scrapers had at `revision`"""
+    jobs = load_jobs(files)
+    print(f"📏 enrich() vs the extract_* methods at {revision}, {len(jobs)} jobs\n")
+    print(f"  {'scraper':32s} {revision:>10s} {'enrich()':>10s} {'speedup':>8s}")
+    for path, (rule_set, _) in BASELINE_SCRAPERS.items():
+        experience, qualification, job_type, category = baseline_extractors(revision, path)
+        enricher = TextEnricher(*RULE_SETS[rule_set])
+
+        def old_fields(title, description):
+            return (experience(None, description), qualification(None, description),
+                    job_type(None, description), category(None, title, description))
+        old_s, _ = best_time(lambda: [old_fields(t, d) for t, d in jobs], runs)
+        new_s, _ = best_time(lambda: [enricher.enrich(d, t) for t, d in jobs], runs)
+        print(f"  {path:32s} {old_s * 1000:8.1f}ms {new_s * 1000:8.1f}ms {old_s / new_s:7.2f}x")
+    print()
+
+
+def alternation_scan(rules):
+    """The SUBSTRING_RULES of `rules` from one regex pass: {rule: first group with a word in the text}"""
+    words = {word for key in SUBSTRING_RULES for group, _ in rules[key] for word in group}
+    # zero-width, so it is tried at every position; the trie returns the longest word there
+    pattern = re.compile(f"(?=({trie_pattern(words)}))")
+    # words found at a position: the longest one and every word it starts with
+    prefixes = {word: {other for other in words if word.startswith(other)} for word in words}
+
+    def scan(text):
+        found = set()
+        for word in set(pattern.findall(text)):
+            found |= prefixes[word]
+        return {key: next((value for group, value in rules[key] if not found.isdisjoint(group)), None)
+                for key in SUBSTRING_RULES}
+    return scan
+
+
+def profile(files, runs=5):
+    """Per-job time of each enrich() stage (nodriver rules), and the substring rules as one alternation"""
+    jobs = load_jobs(files)
+    enricher = TextEnricher(TEXT_RULES, CATEGORY_MATCHER)
+    lowered = [(title.lower(), description.lower()) for title, description in jobs if description]
+    per_job = lambda seconds: seconds * 1e6 / len(lowered)
+    print(f"⏱️ enrich() by stage, {len(lowered)} descriptions (avg {sum(len(d) for _, d in lowered) // len(lowered)} chars)\n")
+
+    stages = {
+        'lowercase': lambda: [(title.lower(), description.lower()) for title, description in jobs if description],
+        'experience regexes': lambda: [enricher._experience(d) for _, d in lowered],
+        'qualification': lambda: [enricher._first(d, TEXT_RULES['qualification']) for _, d in lowered],
+        'job type': lambda: [enricher._first(d, TEXT_RULES['job_type']) for _, d in lowered],
+        'category words': lambda: [enricher.matcher.best(enricher.matcher.scores(f"{t} {d}", lowered=True))
+                                   for t, d in lowered],
+        'category regex': lambda: [enricher.matcher.best(enricher.matcher.regex_scores(f"{t} {d}", lowered=True))
+                                   for t, d in lowered],
+    }
+    times = {name: best_time(run, runs)[0] for name, run in stages.items()}
+    total, _ = best_time(lambda: [enricher.enrich(d, t) for t, d in jobs if d], runs)
+    for name, seconds in times.items():
+        print(f"  {name:20s} {per_job(seconds):7.1f}us/job")
+    print(f"  {'enrich() total':20s} {per_job(total):7.1f}us/job\n")
+
+    scan = alternation_scan(TEXT_RULES)
+    chains_s, chains = best_time(lambda: [{key: enricher._first(d, TEXT_RULES[key]) for key in SUBSTRING_RULES}
+                                          for _, d in lowered], runs)
+    scan_s, scanned = best_time(lambda: [scan(d) for _, d in lowered], runs)
+    status = '✅ identical' if scanned == chains else '❌ differs'
+    print(f"  substring rules: `in` chains {per_job(chains_s):.1f}us/job, "
+          f"one alternation scan {per_job(scan_s):.1f}us/job ({chains_s / scan_s:.2f}x)  {status}")
+    print()
+    return scanned == chains
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark and verify indeed_enrichment.TextEnricher")
+    parser.add_argument('files', nargs='*', default=sorted(glob.glob('indeed_cr_jobs_*.json')))
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--verify', action='store_true', help="exit with status 1 if any field differs")
+    parser.add_argument('--cache', action='store_true', help="replay the files as runs through the enrichment cache")
+    parser.add_argument('--profile', action='store_true', help="time enrich() by stage")
+    parser.add_argument('--baseline', nargs='?', const='ce2935d', metavar='REV',
+                        help="time enrich() against the extract_* methods at git revision REV (default ce2935d)")
+    args = parser.parse_args()
+    identical = benchmark(args.files, runs=args.runs)
+    if args.cache:
+        identical &= benchmark_cache(args.files)
+    if args.profile:
+        identical &= profile(args.files, runs=args.runs)
+    if args.baseline:
+        benchmark_baseline(args.files, args.baseline, runs=args.runs)
+    if args.verify:
+        print("✅ Enricher output identical" if identical else "❌ Enricher output differs")
+        sys.exit(0 if identical else 1)
+
+
+if __name__ == "__main__":
+    main()
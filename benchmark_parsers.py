@@ -0,0 +1,228 @@
+"""
+HTML Parser Benchmark
+Times every installed indeed_html backend on the checked-in SERP and checks
+that the extractors give identical output with each of them.
+
+Usage:
+python benchmark_parsers.py                       # diagnostic_full_page.html, 5 runs
+python benchmark_parsers.py page1.html page2.html --runs 10
+
+Pick the fastest backend marked identical and export it:
+INDEED_HTML_PARSER=selectolax python cloudflare_bypass_scraper.py
+
+Each file also gets a tracemalloc comparison of card tag detection: the old
+str(card).lower() scan vs detect_card_tags(). It also gets a comparison of a full
+parse vs parse_region() (SERP cards container / viewjob component): time, peak
+memory, and whether the region extractors give the same output.
+"""
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+from indeed_cards import detect_card_tags
+from indeed_html import SERP_REGION, VIEWJOB_REGION, available_backends, parse_html, parse_region
+from indeed_manual_browser import IndeedManualCookieScraper
+from cloudflare_bypass_scraper import IndeedPlaywrightMethod
+
+try:
+    from indeed_arc_details_scraper import IndeedFullDetailsScraper as NodriverScraper
+except ImportError:
+    NodriverScraper = None
+
+REFERENCE_BACKEND = 'html.parser'
+
+# same probes as indeed_diagnostic.py
+DIAGNOSTIC_SELECTORS = (
+    'div.job_seen_beacon', 'div[data-jk]', 'td.resultContent', 'li.css-5lfssm',
+    'div.slider_item', 'h2.jobTitle', 'span.companyName', 'a[href*="/viewjob"]', 'a[href*="jk="]',
+)
+
+
+def build_extractors():
+    """name -> function(doc, html) returning JSON-serializable output"""
+    cookie_scraper = IndeedManualCookieScraper()
+    playwright_method = IndeedPlaywrightMethod(block_resources=False)
+
+    extractors = {
+        'cookie session cards': lambda doc, html: cookie_scraper.extract_jobs(doc),
+        'playwright cards': lambda doc, html: playwright_method.extract_jobs_from_html(doc),
+        'diagnostic selectors': lambda doc, html: {sel: len(doc.select(sel)) for sel in DIAGNOSTIC_SELECTORS},
+        'job links': lambda doc, html: [(a.get_text(strip=True), a.get('href')) for a in doc.select('a[href]')
+                                        if '/viewjob' in a.get('href') or 'jk=' in a.get('href')],
+    }
+    if NodriverScraper:
+        nodriver_scraper = NodriverScraper(block_resources=False)
+        extractors['nodriver cards'] = lambda doc, html: [
+            nodriver_scraper.extract_job_from_card_soup(card) for card in doc.select('div.job_seen_beacon')]
+        extractors['nodriver detail'] = lambda doc, html: detail_output(nodriver_scraper, html)
+    return extractors
+
+
+# extractors that only read the region parse_region() keeps
+REGION_EXTRACTORS = {
+    'serp': ('cookie session cards', 'playwright cards', 'nodriver cards'),
+    'viewjob': ('nodriver detail', 'description'),
+}
+
+
+def description_text(doc, html):
+    found = doc.select_one(VIEWJOB_REGION['required'])
+    return found.get_text('\n', strip=True) if found else None
+
+
+def detail_output(scraper, html):
+    """apply_detail_html parses by itself (with INDEED_HTML_PARSER, set per backend in run_backend)"""
+    job = {'_job_title': '', '_job_type': None, '_job_featured_image': None}
+    scraper.apply_detail_html(job, html)
+    return job
+
+
+def run_backend(html, backend, extractors, runs):
+    """Best-of-`runs` parse and extraction times (seconds) plus the extractor outputs"""
+    parse_times, extract_times = [], []
+    outputs = None
+    previous = os.environ.get('INDEED_HTML_PARSER')
+    os.environ['INDEED_HTML_PARSER'] = backend
+    try:
+        for _ in range(runs):
+            start = time.perf_counter()
+            doc = parse_html(html, backend)
+            parsed = time.perf_counter()
+            outputs = {name: extract(doc, html) for name, extract in extractors.items()}
+            done = time.perf_counter()
+            parse_times.append(parsed - start)
+            extract_times.append(done - parsed)
+    finally:
+        if previous is None:
+            os.environ.pop('INDEED_HTML_PARSER', None)
+        else:
+            os.environ['INDEED_HTML_PARSER'] = previous
+    return min(parse_times), min(extract_times), outputs
+
+
+def serialized_tags(card):
+    """Tag detection before detect_card_tags: search the whole serialized card"""
+    inner = str(card).lower()
+    tags = set()
+    if 'patrocinado' in inner or 'sponsored' in inner:
+        tags.add('sponsored')
+    if 'urge contratar' in inner or 'urgently' in inner or 'urgente' in inner:
+        tags.add('urgent')
+    if 'nuevo' in inner:
+        tags.add('new')
+    return tags
+
+
+def tag_allocation(html, backend=REFERENCE_BACKEND):
+    """Peak bytes allocated per card by each tag detector (tracemalloc) and whether they agree"""
+    cards = parse_html(html, backend).select('div.job_seen_beacon')
+    if not cards:
+        return None
+    results = {}
+    for name, detect in (('str(card).lower()', serialized_tags), ('detect_card_tags', detect_card_tags)):
+        peaks, tags = [], []
+        for card in cards:
+            tracemalloc.start()
+            tags.append(sorted(detect(card)))
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        results[name] = (sum(peaks) / len(peaks), tags)
+    return len(cards), results
+
+
+def measure_parse(parse, runs):
+    """Best-of-`runs` seconds and tracemalloc peak bytes of parse() (measured separately)"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        doc = parse()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    parse()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(times), peak, doc
+
+
+def region_comparison(html, backend, extractors, runs):
+    """Full parse vs parse_region for each region: (name, full, region, identical outputs)"""
+    extractors = dict(extractors, description=description_text)
+    rows = []
+    for name, region in (('serp', SERP_REGION), ('viewjob', VIEWJOB_REGION)):
+        names = [n for n in REGION_EXTRACTORS[name] if n in extractors]
+        full_s, full_peak, full_doc = measure_parse(lambda: parse_html(html, backend), runs)
+        part_s, part_peak, part_doc = measure_parse(lambda: parse_region(html, region, backend), runs)
+        same = all(json.dumps(extractors[n](full_doc, html), sort_keys=True, default=str)
+                   == json.dumps(extractors[n](part_doc, html), sort_keys=True, default=str) for n in names)
+        rows.append((name, (full_s, full_peak), (part_s, part_peak), same))
+    return rows
+
+
+def benchmark(files, runs=5):
+    extractors = build_extractors()
+    backends = available_backends()
+    print(f"🧪 Backends: {', '.join(backends)} | extractors: {', '.join(extractors)}\n")
+
+    totals = {b: 0.0 for b in backends}
+    identical = {b: True for b in backends}
+
+    for path in files:
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        print(f"📄 {path} ({len(html) / 1024:.0f} KB)")
+        print(f"  {'backend':12s} {'parse':>9s} {'extract':>9s} {'total':>9s}  output")
+
+        results = {b: run_backend(html, b, extractors, runs) for b in backends}
+        reference = json.dumps(results[REFERENCE_BACKEND][2], sort_keys=True, default=str)
+
+        for backend, (parse_s, extract_s, outputs) in results.items():
+            same = json.dumps(outputs, sort_keys=True, default=str) == reference
+            if not same:
+                identical[backend] = False
+                diff = [name for name in outputs
+                        if json.dumps(outputs[name], sort_keys=True, default=str)
+                        != json.dumps(results[REFERENCE_BACKEND][2][name], sort_keys=True, default=str)]
+            totals[backend] += parse_s + extract_s
+            status = '✅ identical' if same else f"❌ differs ({', '.join(diff)})"
+            print(f"  {backend:12s} {parse_s * 1000:7.1f}ms {extract_s * 1000:7.1f}ms "
+                  f"{(parse_s + extract_s) * 1000:7.1f}ms  {status}")
+
+        print("  targeted parse (full document -> parse_region):")
+        for backend in backends:
+            for name, (full_s, full_peak), (part_s, part_peak), same in region_comparison(
+                    html, backend, extractors, runs):
+                print(f"    {backend:12s} {name:8s} {full_s * 1000:7.1f}ms -> {part_s * 1000:6.1f}ms  "
+                      f"{full_peak / 2**20:6.1f} MB -> {part_peak / 2**20:5.1f} MB peak  "
+                      f"{'✅ same output' if same else '❌ different output'}")
+
+        allocation = tag_allocation(html)
+        if allocation:
+            n_cards, detectors = allocation
+            reference_tags = next(iter(detectors.values()))[1]
+            print(f"  tag detection, {n_cards} cards ({REFERENCE_BACKEND}):")
+            for name, (per_card, tags) in detectors.items():
+                same = '✅ same tags' if tags == reference_tags else '❌ different tags'
+                print(f"    {name:18s} {per_card / 1024:6.1f} KB peak/card  {same}")
+        print()
+
+    candidates = [b for b in backends if identical[b]]
+    fastest = min(candidates, key=lambda b: totals[b])
+    print(f"🏁 Fastest backend with identical output: {fastest} "
+          f"({totals[REFERENCE_BACKEND] / totals[fastest]:.1f}x vs {REFERENCE_BACKEND})")
+    print(f"   export INDEED_HTML_PARSER={fastest}")
+    return fastest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the indeed_html parser backends")
+    parser.add_argument('files', nargs='*', default=['diagnostic_full_page.html'])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+    benchmark(args.files, runs=args.runs)
+
+
+if __name__ == "__main__":
+    main()
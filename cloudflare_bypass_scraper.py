@@ -4,6 +4,7 @@ Indeed Scraper with Multiple Cloudflare Bypass Methods
 Solutions:
 1. Use cloudscraper (bypasses Cloudflare automatically)
 2. Use Playwright (better than Selenium for stealth)
+   - scrape_jobs_parallel(): K isolated contexts in one browser (PLAYWRIGHT_CONTEXTS, default 3)
 3. Manual cookie extraction
 
 Install:
@@ -11,13 +12,19 @@ pip install cloudscraper playwright beautifulsoup4
 python -m playwright install chromium
 """
 
+import asyncio
 import json
 import csv
-import time
-import random
+import os
 import re
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
+
+from indeed_cards import extract_mosaic_cards
+from indeed_html import SERP_REGION, parse_region
+from indeed_lazy_load import LazyLoader
+from indeed_pacing import Pacer
+from indeed_parse_cache import ParseCache
+from indeed_resource_blocker import ResourceBlocker
 
 # ============================================================================
 # METHOD 1: CloudScraper (Easiest - bypasses Cloudflare automatically)
@@ -45,6 +52,8 @@ class IndeedCloudScraperMethod:
                 'desktop': True
             }
         )
+        self.pacer = Pacer(initial_rate=0.25)
+        self.parse_cache = ParseCache()
     
     def scrape_jobs(self, url, max_pages=5):
         """Scrape jobs using cloudscraper"""
@@ -60,48 +69,68 @@ class IndeedCloudScraperMethod:
             
             try:
                 # CloudScraper automatically bypasses Cloudflare
+                self.pacer.wait(page_url)
                 response = self.scraper.get(page_url, timeout=30)
                 
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
                     # Check if we got through Cloudflare
                     if 'cloudflare' in response.text.lower() and 'verification' in response.text.lower():
                         print("  ❌ Cloudflare still blocking")
+                        self.pacer.failure(page_url, 'challenge')
                         break
                     
-                    # Extract jobs
-                    jobs = self.extract_jobs_from_html(soup)
+                    # Extract jobs (a page seen before comes from the parse cache)
+                    jobs = self.parse_cache.get_or_parse(response.text, 'serp', self.extract_page_jobs)
                     
                     if jobs:
                         print(f"  ✅ Found {len(jobs)} jobs")
+                        self.pacer.success(page_url)
                         all_jobs.extend(jobs)
                     else:
                         print("  ⚠️  No jobs found")
+                        self.pacer.failure(page_url, 'no cards')
                         break
                 else:
                     print(f"  ❌ Status: {response.status_code}")
+                    self.pacer.failure(page_url, str(response.status_code))
                     break
-                
-                # Delay
-                if page < max_pages - 1:
-                    time.sleep(random.uniform(3, 6))
             
             except Exception as e:
                 print(f"  ❌ Error: {e}")
                 break
         
+        self.pacer.report()
+        self.parse_cache.report()
         return all_jobs
     
+    def extract_page_jobs(self, html):
+        """Jobs of a SERP: embedded JSON first, HTML cards as fallback"""
+        jobs = self.extract_jobs_from_mosaic(html)
+        if jobs is None:
+            jobs = self.extract_jobs_from_html(parse_region(html, SERP_REGION))
+        return jobs
+    
+    def extract_jobs_from_mosaic(self, html):
+        """Extract jobs from the embedded mosaic JSON (None if the page doesn't have it)"""
+        cards = extract_mosaic_cards(html)
+        if cards is None:
+            return None
+        
+        return [{
+            'title': card['title'], 'company': card['company'], 'location': card['location'],
+            'salary': card['salary'], 'description': card['snippet'], 'posted_date': card['posted'],
+            'apply_url': card['url'], 'job_id': card['job_key'], 'source': 'indeed_cr'
+        } for card in cards if card['title']]
+    
     def extract_jobs_from_html(self, soup):
         """Extract jobs from HTML"""
         jobs = []
         
         # Find job cards
         job_cards = (
-            soup.find_all('div', class_='job_seen_beacon') or
-            soup.find_all('div', attrs={'data-jk': True}) or
-            soup.find_all('td', class_='resultContent')
+            soup.select('div.job_seen_beacon') or
+            soup.select('div[data-jk]') or
+            soup.select('td.resultContent')
         )
         
         for card in job_cards:
@@ -123,35 +152,35 @@ class IndeedCloudScraperMethod:
         job['job_id'] = card.get('data-jk')
         
         # Title
-        title_elem = card.find('h2', class_='jobTitle') or card.find('a', class_='jcs-JobTitle')
+        title_elem = card.select_one('h2.jobTitle') or card.select_one('a.jcs-JobTitle')
         if title_elem:
             job['title'] = title_elem.get_text(strip=True)
-            link = title_elem.find('a') if title_elem.name != 'a' else title_elem
+            link = title_elem.select_one('a') if title_elem.name != 'a' else title_elem
             if link and link.get('href'):
                 job['apply_url'] = f"https://cr.indeed.com{link['href']}"
         
         # Company
-        company_elem = card.find('span', {'data-testid': 'company-name'})
+        company_elem = card.select_one('span[data-testid="company-name"]')
         if company_elem:
             job['company'] = company_elem.get_text(strip=True)
         
         # Location
-        location_elem = card.find('div', {'data-testid': 'text-location'})
+        location_elem = card.select_one('div[data-testid="text-location"]')
         if location_elem:
             job['location'] = location_elem.get_text(strip=True)
         
         # Salary
-        salary_elem = card.find('div', class_='salary-snippet')
+        salary_elem = card.select_one('div.salary-snippet')
         if salary_elem:
             job['salary'] = salary_elem.get_text(strip=True)
         
         # Description
-        desc_elem = card.find('div', class_='job-snippet')
+        desc_elem = card.select_one('div.job-snippet')
         if desc_elem:
             job['description'] = desc_elem.get_text(strip=True)
         
         # Date
-        date_elem = card.find('span', class_='date')
+        date_elem = card.select_one('span.date')
         if date_elem:
             job['posted_date'] = date_elem.get_text(strip=True)
         
@@ -164,15 +193,70 @@ class IndeedCloudScraperMethod:
 
 try:
     from playwright.sync_api import sync_playwright
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
     PLAYWRIGHT_AVAILABLE = True
 except:
     PLAYWRIGHT_AVAILABLE = False
     print("⚠️  playwright not installed. Install with: pip install playwright")
 
+BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+]
+
+# Realistic context settings
+CONTEXT_OPTIONS = {
+    'viewport': {'width': 1920, 'height': 1080},
+    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'locale': 'es-CR',
+    'timezone_id': 'America/Costa_Rica',
+}
+
+# Remove automation indicators
+STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+    Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
+    Object.defineProperty(navigator, 'languages', {get: () => ['es-CR', 'es', 'en']});
+"""
+
+# Resolves once the SERP has its job cards (embedded JSON or rendered cards)
+CARDS_READY_JS = """() => !!((window.mosaic && window.mosaic.providerData
+    && window.mosaic.providerData['mosaic-provider-jobcards'])
+    || document.querySelector('div.job_seen_beacon, td.resultContent'))"""
+
 
 class IndeedPlaywrightMethod:
     """Uses Playwright to bypass Cloudflare"""
     
+    def __init__(self, block_resources=True):
+        # drop images/fonts/media/trackers - we only read DOM text
+        self.blocker = ResourceBlocker(enabled=block_resources)
+        self.pacer = Pacer(initial_rate=0.2)
+        self.parse_cache = ParseCache()
+        # replaces the 2s scroll sleep of the rendered-page fallback
+        self.lazy_loader = LazyLoader(baseline=2.0)
+        self.raw_pages = 0
+    
+    def raw_page_jobs(self, response):
+        """Jobs in the document as the server sent it (goto's response), [] if it has none"""
+        try:
+            html = response.text() if response is not None else None
+        except Exception:
+            return []
+        return self.parse_cache.get_or_parse(html, 'serp', self.extract_page_jobs) if html else []
+    
+    async def raw_page_jobs_async(self, response):
+        try:
+            html = await response.text() if response is not None else None
+        except Exception:
+            return []
+        return self.parse_cache.get_or_parse(html, 'serp', self.extract_page_jobs) if html else []
+    
+    def report_raw_pages(self):
+        if self.raw_pages:
+            print(f"📡 {self.raw_pages} pages parsed straight from the server response (no render wait)")
+    
     def scrape_jobs(self, url, max_pages=5, headless=False):
         """Scrape using Playwright"""
         if not PLAYWRIGHT_AVAILABLE:
@@ -185,29 +269,12 @@ class IndeedPlaywrightMethod:
         
         with sync_playwright() as p:
             # Launch browser with stealth settings
-            browser = p.chromium.launch(
-                headless=headless,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox',
-                ]
-            )
+            browser = p.chromium.launch(headless=headless, args=BROWSER_ARGS)
             
             # Create context with realistic settings
-            context = browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                locale='es-CR',
-                timezone_id='America/Costa_Rica'
-            )
-            
-            # Remove automation indicators
-            context.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-                Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
-                Object.defineProperty(navigator, 'languages', {get: () => ['es-CR', 'es', 'en']});
-            """)
+            context = browser.new_context(**CONTEXT_OPTIONS)
+            context.add_init_script(STEALTH_SCRIPT)
+            self.blocker.attach_playwright(context)
             
             page = context.new_page()
             
@@ -217,48 +284,29 @@ class IndeedPlaywrightMethod:
                 print(f"📄 Page {page_num + 1}/{max_pages}")
                 
                 try:
-                    # Navigate with human-like behavior
-                    page.goto(page_url, wait_until='domcontentloaded', timeout=60000)
+                    # Navigate with human-like behavior (paced per host)
+                    self.pacer.wait(page_url)
+                    response = page.goto(page_url, wait_until='commit', timeout=60000)
                     
-                    # Wait for Cloudflare to load
-                    time.sleep(random.uniform(5, 8))
-                    
-                    # Check if Cloudflare challenge is present
-                    content = page.content()
-                    if 'cloudflare' in content.lower() and 'verification' in content.lower():
-                        print("  ⏳ Waiting for Cloudflare challenge...")
-                        
-                        # Wait up to 30 seconds for Cloudflare to complete
-                        for i in range(30):
-                            time.sleep(1)
-                            content = page.content()
-                            if 'cloudflare' not in content.lower() or 'verification' not in content.lower():
-                                print("  ✅ Cloudflare passed!")
-                                break
-                        else:
-                            print("  ❌ Cloudflare challenge not completed")
-                            page.screenshot(path=f'cloudflare_challenge_{page_num + 1}.png')
+                    # The server HTML already carries the mosaic JSON: parse it as soon as it
+                    # arrives and only wait for render / challenge / scroll when it has no jobs
+                    jobs = self.raw_page_jobs(response)
+                    if jobs:
+                        self.raw_pages += 1
+                    else:
+                        jobs = self.rendered_page_jobs(page, page_url, page_num)
+                        if jobs is None:
                             continue
                     
-                    # Scroll to load content
-                    page.evaluate('window.scrollTo(0, document.body.scrollHeight / 2)')
-                    time.sleep(2)
-                    
-                    # Extract jobs
-                    soup = BeautifulSoup(page.content(), 'html.parser')
-                    jobs = self.extract_jobs_from_html(soup)
-                    
                     if jobs:
                         print(f"  ✅ Found {len(jobs)} jobs")
+                        self.pacer.success(page_url)
                         all_jobs.extend(jobs)
                     else:
                         print("  ⚠️  No jobs found")
                         page.screenshot(path=f'no_jobs_page_{page_num + 1}.png')
+                        self.pacer.failure(page_url, 'no cards')
                         break
-                    
-                    # Delay
-                    if page_num < max_pages - 1:
-                        time.sleep(random.uniform(4, 7))
                 
                 except Exception as e:
                     print(f"  ❌ Error: {e}")
@@ -266,16 +314,192 @@ class IndeedPlaywrightMethod:
             
             browser.close()
         
+        self.blocker.report()
+        self.pacer.report()
+        self.parse_cache.report()
+        self.report_raw_pages()
+        self.lazy_loader.report()
         return all_jobs
     
+    # -------------------------
+    # Parallel contexts (async API)
+    # -------------------------
+    def scrape_jobs_parallel(self, url, max_pages=5, headless=False, contexts=3):
+        """Scrape with `contexts` isolated browser contexts sharing one browser process"""
+        if not PLAYWRIGHT_AVAILABLE:
+            raise ImportError("playwright is required")
+        return asyncio.run(self.scrape_jobs_async(url, max_pages=max_pages, headless=headless, contexts=contexts))
+    
+    async def scrape_jobs_async(self, url, max_pages=5, headless=False, contexts=3):
+        """
+        Async Playwright mode: one browser, K contexts pulling SERP pages from a shared queue
+        
+        Each context has its own cookies/cache, so a challenge in one doesn't stall the others.
+        Results are merged in page order (duplicates across pages dropped by job_id).
+        """
+        contexts = max(1, min(contexts, max_pages))
+        print(f"🔍 Using Playwright method ({contexts} parallel contexts)...")
+        print(f"📍 URL: {url}\n")
+        
+        pages_queue = asyncio.Queue()
+        for page_num in range(max_pages):
+            pages_queue.put_nowait(page_num)
+        results = {}
+        # first page without jobs ends the listing; later pages are skipped
+        state = {'last_page': max_pages}
+        
+        async def worker(browser, worker_id):
+            context = await browser.new_context(**CONTEXT_OPTIONS)
+            await context.add_init_script(STEALTH_SCRIPT)
+            await self.blocker.attach_playwright_async(context)
+            page = await context.new_page()
+            try:
+                while True:
+                    try:
+                        page_num = pages_queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    if page_num >= state['last_page']:
+                        continue
+                    jobs = await self.scrape_page_async(page, url, page_num, worker_id)
+                    if jobs is None:
+                        continue
+                    if not jobs:
+                        state['last_page'] = min(state['last_page'], page_num)
+                        continue
+                    results[page_num] = jobs
+            finally:
+                await context.close()
+        
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=headless, args=BROWSER_ARGS)
+            try:
+                await asyncio.gather(*(worker(browser, i + 1) for i in range(contexts)))
+            finally:
+                await browser.close()
+        
+        all_jobs = []
+        seen = set()
+        for page_num in sorted(results):
+            if page_num >= state['last_page']:
+                continue
+            for job in results[page_num]:
+                if job['job_id'] and job['job_id'] in seen:
+                    continue
+                seen.add(job['job_id'])
+                all_jobs.append(job)
+        
+        self.blocker.report()
+        self.pacer.report()
+        self.parse_cache.report()
+        self.report_raw_pages()
+        return all_jobs
+    
+    async def scrape_page_async(self, page, url, page_num, worker_id):
+        """Load one SERP in `page`; returns its jobs, [] if it has none, None if challenged/failed"""
+        page_url = url if page_num == 0 else f"{url}&start={page_num * 10}"
+        print(f"📄 [ctx {worker_id}] Page {page_num + 1}")
+        
+        try:
+            await self.pacer.wait_async(page_url)
+            response = await page.goto(page_url, wait_until='commit', timeout=60000)
+            
+            # Parse the server HTML as soon as it arrives; the live DOM is only waited for without jobs
+            jobs = await self.raw_page_jobs_async(response)
+            if jobs:
+                self.raw_pages += 1
+            else:
+                jobs = await self.rendered_page_jobs_async(page, page_url, page_num, worker_id)
+                if jobs is None:
+                    return None
+            
+            if jobs:
+                print(f"  ✅ [ctx {worker_id}] Page {page_num + 1}: {len(jobs)} jobs")
+                self.pacer.success(page_url)
+            else:
+                print(f"  ⚠️  [ctx {worker_id}] Page {page_num + 1}: no jobs found")
+                await page.screenshot(path=f'no_jobs_page_{page_num + 1}.png')
+                self.pacer.failure(page_url, 'no cards')
+            return jobs
+        
+        except Exception as e:
+            print(f"  ❌ [ctx {worker_id}] Page {page_num + 1} error: {e}")
+            return None
+    
+    def rendered_page_jobs(self, page, page_url, page_num):
+        """Sync API version of rendered_page_jobs_async, scrolling until the card count is stable"""
+        # Wait for the cards instead of a fixed delay; give a challenge up to 30s more
+        try:
+            page.wait_for_function(CARDS_READY_JS, timeout=15000)
+        except PlaywrightTimeoutError:
+            content = page.content().lower()
+            if 'cloudflare' in content and 'verification' in content:
+                print("  ⏳ Waiting for Cloudflare challenge...")
+                try:
+                    page.wait_for_function(CARDS_READY_JS, timeout=30000)
+                    print("  ✅ Cloudflare passed!")
+                except PlaywrightTimeoutError:
+                    print("  ❌ Cloudflare challenge not completed")
+                    page.screenshot(path=f'cloudflare_challenge_{page_num + 1}.png')
+                    self.pacer.failure(page_url, 'challenge')
+                    return None
+        
+        # Scroll until the card count stops changing
+        self.lazy_loader.playwright(page)
+        
+        # Extract jobs (a page seen before comes from the parse cache)
+        content = page.content()
+        return self.parse_cache.get_or_parse(content, 'serp', self.extract_page_jobs)
+    
+    async def rendered_page_jobs_async(self, page, page_url, page_num, worker_id):
+        """Jobs of the rendered page after the cards (or a challenge) resolve; None if challenged"""
+        # Wait for the cards instead of a fixed delay; give a challenge up to 30s more
+        try:
+            await page.wait_for_function(CARDS_READY_JS, timeout=15000)
+        except PlaywrightTimeoutError:
+            content = (await page.content()).lower()
+            if 'cloudflare' in content and 'verification' in content:
+                print(f"  ⏳ [ctx {worker_id}] Waiting for Cloudflare challenge...")
+                try:
+                    await page.wait_for_function(CARDS_READY_JS, timeout=30000)
+                    print(f"  ✅ [ctx {worker_id}] Cloudflare passed!")
+                except PlaywrightTimeoutError:
+                    print(f"  ❌ [ctx {worker_id}] Cloudflare challenge not completed")
+                    await page.screenshot(path=f'cloudflare_challenge_{page_num + 1}.png')
+                    self.pacer.failure(page_url, 'challenge')
+                    return None
+        
+        # Extract jobs (a page seen before comes from the parse cache)
+        content = await page.content()
+        return self.parse_cache.get_or_parse(content, 'serp', self.extract_page_jobs)
+    
+    def extract_page_jobs(self, html):
+        """Jobs of a SERP: embedded JSON first, HTML cards as fallback"""
+        jobs = self.extract_jobs_from_mosaic(html)
+        if jobs is None:
+            jobs = self.extract_jobs_from_html(parse_region(html, SERP_REGION))
+        return jobs
+    
+    def extract_jobs_from_mosaic(self, html):
+        """Extract jobs from the embedded mosaic JSON (None if the page doesn't have it)"""
+        cards = extract_mosaic_cards(html)
+        if cards is None:
+            return None
+        
+        return [{
+            'title': card['title'], 'company': card['company'], 'location': card['location'],
+            'salary': card['salary'], 'description': card['snippet'], 'apply_url': card['url'],
+            'job_id': card['job_key'], 'source': 'indeed_cr'
+        } for card in cards if card['title']]
+    
     def extract_jobs_from_html(self, soup):
         """Extract jobs from HTML"""
         jobs = []
         
         job_cards = (
-            soup.find_all('div', class_='job_seen_beacon') or
-            soup.find_all('div', attrs={'data-jk': True}) or
-            soup.find_all('td', class_='resultContent')
+            soup.select('div.job_seen_beacon') or
+            soup.select('div[data-jk]') or
+            soup.select('td.resultContent')
         )
         
         for card in job_cards:
@@ -286,15 +510,15 @@ class IndeedPlaywrightMethod:
             }
             
             # Extract fields
-            title_elem = card.find('h2', class_='jobTitle')
+            title_elem = card.select_one('h2.jobTitle')
             if title_elem:
                 job['title'] = title_elem.get_text(strip=True)
             
-            company_elem = card.find('span', {'data-testid': 'company-name'})
+            company_elem = card.select_one('span[data-testid="company-name"]')
             if company_elem:
                 job['company'] = company_elem.get_text(strip=True)
             
-            location_elem = card.find('div', {'data-testid': 'text-location'})
+            location_elem = card.select_one('div[data-testid="text-location"]')
             if location_elem:
                 job['location'] = location_elem.get_text(strip=True)
             
@@ -364,7 +588,11 @@ def main():
         print("-"*70)
         try:
             scraper = IndeedPlaywrightMethod()
-            jobs = scraper.scrape_jobs(url, max_pages=3, headless=False)
+            contexts = int(os.getenv('PLAYWRIGHT_CONTEXTS', '3'))
+            if contexts > 1:
+                jobs = scraper.scrape_jobs_parallel(url, max_pages=3, headless=False, contexts=contexts)
+            else:
+                jobs = scraper.scrape_jobs(url, max_pages=3, headless=False)
             
             if jobs:
                 print(f"\n✅ Success! Scraped {len(jobs)} jobs with Playwright\n")
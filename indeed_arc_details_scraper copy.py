@@ -6,6 +6,10 @@ pip install nodriver beautifulsoup4 lxml
 
 Run:
 python indeed_arc_details_scraper.py
+
+Jobs are scraped and enriched with English labels; the Spanish records are made
+from them at save time (indeed_localize), so one crawl writes both
+indeed_cr_jobs_<timestamp>.json/.csv (Spanish) and indeed_cr_jobs_<timestamp>_en.json/.csv.
 """
 
 import asyncio
@@ -17,12 +21,26 @@ import csv
 import warnings
 from datetime import datetime, timedelta
 
-from bs4 import BeautifulSoup
-
 import nodriver as nd
 
+from indeed_cards import detect_card_tags
+from indeed_enrichment import CATEGORY_MATCHER_EN, TEXT_ENRICHER_EN
+from indeed_html import SERP_REGION, VIEWJOB_REGION, parse_region
+from indeed_localize import localize_jobs
+from indeed_pacing import Pacer
+from indeed_selectors import SelectorCascade
+
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
+# SERP card selectors (tried best-first, see indeed_selectors)
+CARD_SELECTORS = (
+    'a.tapItem',            # common modern selector
+    'div.job_seen_beacon',
+    'div[data-jk]',
+    'td.resultContent',
+    'li.css-5lfssm',
+)
+
 
 class IndeedFullDetailsScraper:
     def __init__(self, headless=False):
@@ -30,6 +48,10 @@ class IndeedFullDetailsScraper:
         self.browser = None
         self.page = None
         self.headless = headless
+        # AIMD pacing per host for listing and detail navigations
+        self.pacer = Pacer(initial_rate=0.5)
+        # card selector fallbacks, reordered by hit rate across runs
+        self.card_cascade = SelectorCascade('nodriver.cards', CARD_SELECTORS)
 
     # -------------------------
     # Async startup / cloudflare
@@ -95,60 +117,8 @@ class IndeedFullDetailsScraper:
     # Utilities (copied/adapted)
     # -------------------------
     def extract_category(self, title, description):
-        if not title and not description:
-            return None
-        text = f"{title or ''} {description or ''}".lower()
-        categories = {
-            'Desarrollo de TI/Software': [
-                'software', 'developer', 'programming', 'engineer', 'web', 'mobile',
-                'frontend', 'backend', 'fullstack', 'devops', 'cloud', 'java', 'python',
-                'javascript', 'react', 'angular', 'node', 'php', 'dotnet', '.net',
-                'desarrollo', 'programador', 'desarrollador', 'sistemas', 'typescript',
-                'ruby', 'golang', 'kotlin', 'swift', 'android', 'ios', 'data scientist'
-            ],
-            'Servicio al cliente': [
-                'customer service', 'call center', 'support', 'help desk', 'servicio al cliente',
-                'atención al cliente', 'soporte', 'representante', 'agent', 'cliente',
-                'atención', 'contact center', 'bpo'
-            ],
-            'Ventas y Marketing': [
-                'sales', 'marketing', 'ventas', 'vendedor', 'comercial', 'digital marketing',
-                'seo', 'sem', 'social media', 'content', 'branding', 'advertising'
-            ],
-            'Recursos Humanos': [
-                'human resources', 'hr', 'rrhh', 'recursos humanos', 'reclutamiento',
-                'recruitment', 'talent', 'payroll', 'nómina', 'benefits'
-            ],
-            'Finanzas y Contabilidad': [
-                'finance', 'accounting', 'finanzas', 'contabilidad', 'contador',
-                'auditor', 'financial', 'bookkeeper', 'tax', 'impuestos'
-            ],
-            'Administración': [
-                'administration', 'administrative', 'administración', 'administrativo',
-                'office', 'oficina', 'secretary', 'secretaria', 'assistant', 'asistente'
-            ],
-            'Educación': [
-                'teacher', 'education', 'educación', 'profesor', 'maestro', 'tutor',
-                'instructor', 'trainer', 'capacitador', 'teaching'
-            ],
-            'Salud': [
-                'health', 'healthcare', 'salud', 'medical', 'médico', 'nurse',
-                'enfermera', 'doctor', 'physician', 'clinical'
-            ],
-            'Ingeniería': [
-                'engineering', 'ingeniería', 'ingeniero', 'engineer', 'mechanical',
-                'civil', 'electrical', 'industrial', 'mecánico', 'eléctrico'
-            ],
-            'Diseño': [
-                'design', 'diseño', 'designer', 'diseñador', 'graphic', 'gráfico',
-                'ux', 'ui', 'creative', 'creativo', 'illustrator', 'photoshop'
-            ],
-        }
-        for category, keywords in categories.items():
-            for keyword in keywords:
-                if keyword in text:
-                    return category
-        return 'General/Otro'
+        # one pass of the keyword regex compiled at import (see indeed_enrichment)
+        return CATEGORY_MATCHER_EN.classify(title, description)
 
     def parse_date(self, date_str):
         if not date_str:
@@ -183,13 +153,13 @@ class IndeedFullDetailsScraper:
         if not text:
             return {'_job_salary_type': None, '_job_salary': None, '_job_max_salary': None}
         text_lower = text.lower()
-        salary_data = {'_job_salary_type': 'mensual', '_job_salary': None, '_job_max_salary': None}
+        salary_data = {'_job_salary_type': 'monthly', '_job_salary': None, '_job_max_salary': None}
         if 'hora' in text_lower or 'hour' in text_lower or '/hr' in text_lower:
-            salary_data['_job_salary_type'] = 'por hora'
+            salary_data['_job_salary_type'] = 'hourly'
         elif 'año' in text_lower or 'year' in text_lower or 'anual' in text_lower or '/yr' in text_lower:
-            salary_data['_job_salary_type'] = 'anual'
+            salary_data['_job_salary_type'] = 'yearly'
         elif 'mes' in text_lower or 'month' in text_lower or '/mo' in text_lower:
-            salary_data['_job_salary_type'] = 'mensual'
+            salary_data['_job_salary_type'] = 'monthly'
         numbers = re.findall(r'[\d\.,]+(?:\.\d{2})?', text)
         if numbers:
             cleaned = []
@@ -206,212 +176,24 @@ class IndeedFullDetailsScraper:
         return salary_data
 
     def extract_experience_from_text(self, text):
-        if not text:
-            return None, None
-        s = text.lower()
-        exp_patterns = [
-            r'(\d+)\+?\s*(años?|years?)\s*(?:de\s*)?(?:experiencia|experience)',
-            r'(?:experiencia|experience)\s*(?:de\s*)?(\d+)\+?\s*(años?|years?)',
-            r'(\d+)\s*-\s*(\d+)\s*(años?|years?)',
-        ]
-        for pattern in exp_patterns:
-            m = re.search(pattern, s)
-            if m:
-                years = int(m.group(1))
-                if years >= 7:
-                    return f"{years}+ años", 'sénior'
-                elif years >= 3:
-                    return f"{years}+ años", 'medio'
-                elif years >= 1:
-                    return f"{years}+ años", 'júnior'
-                else:
-                    return f"{years} años", 'entrada'
-        if any(w in s for w in ['senior', 'sr.', 'lead', 'principal', 'sénior']):
-            return '5+ años', 'sénior'
-        if any(w in s for w in ['junior', 'jr.', 'entry level', 'sin experiencia', 'júnior']):
-            return '0-2 años', 'júnior'
-        if any(w in s for w in ['mid', 'intermediate', 'intermedio', 'medio']):
-            return '2-5 años', 'medio'
-        return None, None
+        return TEXT_ENRICHER_EN.experience(text)
 
     def extract_qualification(self, text):
-        if not text:
-            return None
-        s = text.lower()
-        if any(word in s for word in ['phd', 'doctorado', 'doctorate', 'ph.d']):
-            return 'doctorado'
-        if any(word in s for word in ['maestría', 'master', 'msc', 'mba', "master's"]):
-            return 'maestría'
-        if any(word in s for word in ['licenciatura', 'bachelor', 'grado', 'university degree', "bachelor's"]):
-            return 'licenciatura'
-        if any(word in s for word in ['técnico', 'technical', 'associate', 'diploma']):
-            return 'técnico'
-        if any(word in s for word in ['secundaria', 'high school', 'bachillerato']):
-            return 'secundaria'
-        return None
+        return TEXT_ENRICHER_EN.qualification(text)
 
     def extract_job_type(self, text):
-        if not text:
-            return None
-        s = text.lower()
-        if 'tiempo completo' in s or 'full time' in s or 'full-time' in s:
-            return 'tiempo completo'
-        if 'medio tiempo' in s or 'part time' in s or 'part-time' in s:
-            return 'medio tiempo'
-        if 'temporal' in s or 'temporary' in s:
-            return 'temporal'
-        if 'contrato' in s or 'contract' in s:
-            return 'contrato'
-        if 'internship' in s or 'pasantía' in s or 'intern' in s:
-            return 'pasantía'
-        if 'freelance' in s or 'por proyecto' in s:
-            return 'freelance'
-        return None
+        return TEXT_ENRICHER_EN.job_type(text)
 
     def translate_to_spanish(self, job_data):
-        """Translate English terms to Spanish in the job data"""
-        
-        # Translate category names
-        category_map = {
-            'IT/Software Development': 'Desarrollo de TI/Software',
-            'Customer Service': 'Servicio al cliente',
-            'Sales and Marketing': 'Ventas y Marketing',
-            'Human Resources': 'Recursos Humanos',
-            'Finance and Accounting': 'Finanzas y Contabilidad',
-            'Administration': 'Administración',
-            'Education': 'Educación',
-            'Health': 'Salud',
-            'Engineering': 'Ingeniería',
-            'Design': 'Diseño',
-            'General/Other': 'General/Otro',
-        }
-        if job_data.get('_job_category'):
-            category = job_data['_job_category']
-            job_data['_job_category'] = category_map.get(category, job_data['_job_category'])
-        
-        # Translate salary type
-        salary_type_map = {
-            'hourly': 'por hora',
-            'hour': 'por hora',
-            'por hora': 'por hora',
-            'monthly': 'mensual',
-            'month': 'mensual',
-            'mensual': 'mensual',
-            'annual': 'anual',
-            'yearly': 'anual',
-            'year': 'anual',
-            'anual': 'anual',
-        }
-        if job_data.get('_job_salary_type'):
-            salary_type = str(job_data['_job_salary_type']).lower().strip()
-            job_data['_job_salary_type'] = salary_type_map.get(salary_type, job_data['_job_salary_type'])
-        
-        # Translate career level
-        career_level_map = {
-            'senior': 'sénior',
-            'sénior': 'sénior',
-            'sr': 'sénior',
-            'sr.': 'sénior',
-            'junior': 'júnior',
-            'júnior': 'júnior',
-            'jr': 'júnior',
-            'jr.': 'júnior',
-            'entry': 'entrada',
-            'entry level': 'entrada',
-            'entrada': 'entrada',
-            'mid': 'medio',
-            'mid level': 'medio',
-            'medio': 'medio',
-            'intermediate': 'medio',
-            'intermedio': 'medio',
-        }
-        if job_data.get('_job_career_level'):
-            career_level = str(job_data['_job_career_level']).lower().strip()
-            job_data['_job_career_level'] = career_level_map.get(career_level, job_data['_job_career_level'])
-        
-        # Translate qualification
-        qualification_map = {
-            'high school': 'secundaria',
-            'secundaria': 'secundaria',
-            'bachillerato': 'secundaria',
-            'associate': 'técnico',
-            'technical': 'técnico',
-            'técnico': 'técnico',
-            'diploma': 'técnico',
-            'bachelor': 'licenciatura',
-            "bachelor's": 'licenciatura',
-            'licenciatura': 'licenciatura',
-            'grado': 'licenciatura',
-            'university degree': 'licenciatura',
-            'master': 'maestría',
-            "master's": 'maestría',
-            'maestría': 'maestría',
-            'mba': 'maestría',
-            'msc': 'maestría',
-            'doctorate': 'doctorado',
-            'doctorado': 'doctorado',
-            'phd': 'doctorado',
-            'ph.d': 'doctorado',
-            'ph.d.': 'doctorado',
-        }
-        if job_data.get('_job_qualification'):
-            qualification = str(job_data['_job_qualification']).lower().strip()
-            job_data['_job_qualification'] = qualification_map.get(qualification, job_data['_job_qualification'])
-        
-        # Translate job type
-        job_type_map = {
-            'full time': 'tiempo completo',
-            'full-time': 'tiempo completo',
-            'fulltime': 'tiempo completo',
-            'tiempo completo': 'tiempo completo',
-            'part time': 'medio tiempo',
-            'part-time': 'medio tiempo',
-            'parttime': 'medio tiempo',
-            'medio tiempo': 'medio tiempo',
-            'temporary': 'temporal',
-            'temporal': 'temporal',
-            'contract': 'contrato',
-            'contrato': 'contrato',
-            'internship': 'pasantía',
-            'intern': 'pasantía',
-            'pasantía': 'pasantía',
-            'freelance': 'freelance',
-            'por proyecto': 'freelance',
-        }
-        if job_data.get('_job_type'):
-            job_type = str(job_data['_job_type']).lower().strip()
-            job_data['_job_type'] = job_type_map.get(job_type, job_data['_job_type'])
-        
-        # Translate tags
-        tag_map = {
-            'sponsored': 'patrocinado',
-            'patrocinado': 'patrocinado',
-            'urgent': 'urgente',
-            'urgente': 'urgente',
-            'new': 'nuevo',
-            'nuevo': 'nuevo',
-            'costa rica': 'Costa Rica',
-        }
-        if job_data.get('_job_tag'):
-            translated_tags = []
-            for tag in job_data['_job_tag']:
-                tag_lower = str(tag).lower().strip()
-                translated_tags.append(tag_map.get(tag_lower, tag))
-            job_data['_job_tag'] = translated_tags
-        
-        # Translate experience text (e.g., "5+ years" -> "5+ años")
-        if job_data.get('_job_experience'):
-            exp = str(job_data['_job_experience'])
-            exp = exp.replace('years', 'años').replace('year', 'año').replace('Years', 'años').replace('Year', 'año')
-            job_data['_job_experience'] = exp
-        
+        """Translate English terms to Spanish in the job data (in place; see indeed_localize)"""
+        job_data.update(localize_jobs([job_data], 'es')[0])
         return job_data
 
     # -------------------------
-    # Parsing helpers (BeautifulSoup)
+    # Parsing helpers (indeed_html backends)
     # -------------------------
     def extract_job_from_card_soup(self, card):
-        """card is a BeautifulSoup tag for single job card"""
+        """card is a parsed element (indeed_html) for single job card"""
         job_data = {
             '_job_featured_image': None,
             '_job_title': None,
@@ -486,16 +268,16 @@ class IndeedFullDetailsScraper:
             if jt:
                 job_data['_job_type'] = jt
 
-        # Tags: sponsored/urgent/new
-        inner = str(card).lower()
-        if 'patrocinado' in inner or 'sponsored' in inner:
+        # Tags: sponsored/urgent/new (label nodes or the card's text, which includes the snippet)
+        tags = detect_card_tags(card)
+        if 'sponsored' in tags:
             job_data['_job_featured'] = 1
-            job_data['_job_tag'].append('patrocinado')
-        if 'urge contratar' in inner or 'urgently' in inner or 'urgente' in inner:
+            job_data['_job_tag'].append('sponsored')
+        if 'urgent' in tags:
             job_data['_job_urgent'] = 1
-            job_data['_job_tag'].append('urgente')
-        if 'nuevo' in inner or 'nuevo' in (job_data['_job_description'] or '').lower():
-            job_data['_job_tag'].append('nuevo')
+            job_data['_job_tag'].append('urgent')
+        if 'new' in tags:
+            job_data['_job_tag'].append('new')
 
         # Logo heuristics inside card
         img = card.select_one('img')
@@ -521,6 +303,7 @@ class IndeedFullDetailsScraper:
 
             print(f"\n📄 Page {page_no + 1}/{max_pages}: {url}")
             try:
+                await self.pacer.wait_async(url)
                 await self.page.get(url)
                 # wait a bit for JS to render
                 await asyncio.sleep(3 + random.random() * 2)
@@ -532,23 +315,11 @@ class IndeedFullDetailsScraper:
                 await asyncio.sleep(1 + random.random() * 1.5)
 
                 html = await self.page.evaluate("document.documentElement.outerHTML")
-                soup = BeautifulSoup(html, "lxml")
-
-                # Try multiple selectors for job cards
-                card_selectors = [
-                    'a.tapItem',            # common modern selector
-                    'div.job_seen_beacon',
-                    'div[data-jk]',
-                    'td.resultContent',
-                    'li.css-5lfssm'
-                ]
-                job_cards = []
-                for sel in card_selectors:
-                    found = soup.select(sel)
-                    if found:
-                        job_cards = found
-                        break
+                soup = parse_region(html, SERP_REGION)
+                _, job_cards = self.card_cascade.find(soup.select)
+                job_cards = job_cards or []
 
+                self.pacer.record(url, bool(job_cards), 'no cards')
                 if not job_cards:
                     print("  ⚠️ No job cards found on this page — saving debug and continuing.")
                     with open(f"debug_page_{page_no+1}.html", "w", encoding="utf-8") as f:
@@ -568,14 +339,14 @@ class IndeedFullDetailsScraper:
 
                         # If requested, fetch detail page to get full description
                         if extract_full_details and job_data['_job_apply_url']:
-                            # small randomized delay
-                            await asyncio.sleep(0.6 + random.random() * 0.8)
+                            await self.pacer.wait_async(job_data['_job_apply_url'])
                             try:
                                 # navigate to detail page (keeps same page)
                                 await self.page.get(job_data['_job_apply_url'])
                                 await asyncio.sleep(2 + random.random() * 1.5)
                                 detail_html = await self.page.evaluate("document.documentElement.outerHTML")
-                                detail_soup = BeautifulSoup(detail_html, "lxml")
+                                self.pacer.record(url, 'jobDescriptionText' in detail_html, 'no description')
+                                detail_soup = parse_region(detail_html, VIEWJOB_REGION)
 
                                 # description selectors
                                 desc = detail_soup.select_one('#jobDescriptionText') or detail_soup.select_one('div#jobDescriptionText') or detail_soup.select_one('.jobsearch-JobComponent-description') or detail_soup.select_one('.jobsearch-jobDescriptionText')
@@ -583,21 +354,18 @@ class IndeedFullDetailsScraper:
                                     full_desc = desc.get_text("\n", strip=True)
                                     job_data['_job_description'] = full_desc
 
-                                    # extract experience / qualification / type / category
-                                    exp, lev = self.extract_experience_from_text(full_desc)
-                                    if exp:
-                                        job_data['_job_experience'] = exp
-                                    if lev:
-                                        job_data['_job_career_level'] = lev
-                                    qual = self.extract_qualification(full_desc)
-                                    if qual:
-                                        job_data['_job_qualification'] = qual
-                                    jt = self.extract_job_type(full_desc)
-                                    if jt and not job_data['_job_type']:
-                                        job_data['_job_type'] = jt
-                                    cat = self.extract_category(job_data['_job_title'], full_desc)
-                                    if cat:
-                                        job_data['_job_category'] = cat
+                                    # experience / qualification / type / category in one pass
+                                    derived = TEXT_ENRICHER_EN.enrich(full_desc, job_data['_job_title'])
+                                    if derived['experience']:
+                                        job_data['_job_experience'] = derived['experience']
+                                    if derived['career_level']:
+                                        job_data['_job_career_level'] = derived['career_level']
+                                    if derived['qualification']:
+                                        job_data['_job_qualification'] = derived['qualification']
+                                    if derived['job_type'] and not job_data['_job_type']:
+                                        job_data['_job_type'] = derived['job_type']
+                                    if derived['category']:
+                                        job_data['_job_category'] = derived['category']
 
                                 # salary in detail page
                                 sal = detail_soup.select_one('#salaryInfoAndJobType') or detail_soup.select_one('div.salary') or detail_soup.select_one('span[class*="salary"]')
@@ -613,8 +381,8 @@ class IndeedFullDetailsScraper:
                                         job_data['_job_featured_image'] = src
 
                                 # optionally return to listing page (fast)
+                                await self.pacer.wait_async(url)
                                 await self.page.get(url)
-                                await asyncio.sleep(0.8 + random.random() * 0.8)
                             except Exception as e:
                                 # On error, continue - we don't want to stop the whole run
                                 print(f"      ⚠️ Detail page error: {e}")
@@ -623,30 +391,26 @@ class IndeedFullDetailsScraper:
                         if not job_data['_job_category']:
                             job_data['_job_category'] = self.extract_category(job_data['_job_title'], job_data['_job_description'])
 
-                        # TRANSLATE ALL ENGLISH TERMS TO SPANISH
-                        job_data = self.translate_to_spanish(job_data)
+                        # (labels stay English here; main() localises the whole list at save time)
 
                         all_jobs.append(job_data)
                         if max_jobs and len(all_jobs) >= max_jobs:
                             print(f"\n✅ Reached max jobs limit ({max_jobs})")
                             return all_jobs
-
-                        # polite small delay
-                        await asyncio.sleep(0.3 + random.random() * 0.9)
                     except Exception as e:
                         print(f"    ❌ Error extracting job card: {e}")
                         continue
 
-                # delay between pages
+                # the next page load is paced per host (AIMD)
                 if page_no < max_pages - 1:
-                    delay = random.uniform(2.0, 5.0)
-                    print(f"  ⏳ Waiting {delay:.1f}s before next page...")
-                    await asyncio.sleep(delay)
+                    print(f"  ⏳ Pacing at {self.pacer.current_rate(url):.2f} req/s")
 
             except Exception as e:
                 print(f"  ❌ Page error: {e}")
                 break
 
+        self.pacer.report()
+        self.card_cascade.report()
         return all_jobs
 
     # -------------------------
@@ -717,9 +481,13 @@ def main():
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 json_fn = f"indeed_cr_jobs_{timestamp}.json"
                 csv_fn = f"indeed_cr_jobs_{timestamp}.csv"
-                scraper.save_to_json(jobs, json_fn)
-                scraper.save_to_csv(jobs, csv_fn)
-                print(f"\n✅ Scraped {len(jobs)} jobs. Files: {json_fn}, {csv_fn}")
+                # one crawl, two outputs: Spanish (the WordPress import) and the English records
+                jobs_es = localize_jobs(jobs, 'es')
+                scraper.save_to_json(jobs_es, json_fn)
+                scraper.save_to_csv(jobs_es, csv_fn)
+                scraper.save_to_json(jobs, f"indeed_cr_jobs_{timestamp}_en.json")
+                scraper.save_to_csv(jobs, f"indeed_cr_jobs_{timestamp}_en.csv")
+                print(f"\n✅ Scraped {len(jobs)} jobs. Files: {json_fn}, {csv_fn} (+ _en)")
             else:
                 print("\n❌ No jobs scraped — check debug files.")
         except Exception as e:
@@ -6,30 +6,123 @@ pip install nodriver beautifulsoup4 lxml
 
 Run:
 python indeed_nodriver_scraper.py
+
+Detail pages are fetched concurrently in a pool of tabs; set DETAIL_TABS (default 3,
+1 = one tab, serial) to change the pool size. With DETAIL_BACKEND=hybrid (default) the
+browser only passes Cloudflare and loads SERPs; viewjob pages are fetched over a pooled
+HTTP session using the browser's cookies (DETAIL_BACKEND=browser to use tabs only).
+Detail pages are parsed and enriched in worker processes (PARSE_WORKERS, default one
+per core, 0 = parse inline) so the crawl loop never blocks on BeautifulSoup/regex work.
+Derived fields are kept in .indeed_enrichment_cache.sqlite, so postings seen in an
+earlier run are not enriched again (delete the file to start over).
+
+The browser profile (.nodriver_profile/) and cookie jar (.indeed_cookies.dat) are kept
+between runs; delete them to force a fresh Cloudflare pass.
 """
 
 import asyncio
+import os
 import time
 import random
 import re
 import json
 import csv
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
-from bs4 import BeautifulSoup
-
 import nodriver as nd
 
+from indeed_cards import CARD_TAGS, MOSAIC_KEYS, detect_card_tags, extract_mosaic_cards, normalize_mosaic_card
+from indeed_enrichment import CATEGORY_MATCHER, TEXT_ENRICHER
+from indeed_enrichment_cache import CACHE_FILE as ENRICHMENT_CACHE_FILE, EnrichmentCache
+from indeed_html import SERP_REGION, VIEWJOB_REGION, node_field, parse_region, read_fields
+from indeed_manual_browser import IndeedManualCookieScraper
+from indeed_lazy_load import LazyLoader
+from indeed_network import DocumentCapture
+from indeed_pacing import Pacer
+from indeed_page_scripts import extract_detail_in_page, extract_serp_in_page
+from indeed_parse_cache import ParseCache
+from indeed_parse_pool import ParsePool
+from indeed_resource_blocker import ResourceBlocker
+from indeed_selectors import SelectorCascade
+
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
+# heuristics for Cloudflare / recaptcha
+CHALLENGE_MARKERS = ("verify you are human", "cf-browser-verification", "recaptcha", "checking your browser")
+# heuristics for real Indeed page (spanish headings or known markers)
+LISTING_MARKERS = ("empleos en costa rica",)
+# SERP card selectors, used when the mosaic JSON is missing (tried best-first, see indeed_selectors)
+CARD_SELECTORS = (
+    'a.tapItem',            # common modern selector
+    'div.job_seen_beacon',
+    'div[data-jk]',
+    'td.resultContent',
+    'li.css-5lfssm',
+)
+# Fields read from a card / a detail page, in Python (read_fields) or in-page (indeed_page_scripts)
+CARD_VALUES = {
+    'title': node_field('h2.jobTitle span', 'h2.jobTitle', 'a.jcs-JobTitle', 'a.tapItem'),
+    'href': node_field('a.tapItem', 'a.jcs-JobTitle', 'h2.jobTitle a', attr='href'),
+    'location': node_field('div[data-testid="text-location"]', '.companyLocation', '.location'),
+    'salary': node_field('.salary-snippet-container', '.salary-snippet', 'span.salaryText', 'div.salary', sep=' '),
+    'snippet': node_field('.job-snippet', '.summary', 'div.job-snippet', sep=' '),
+    'logo': node_field('img', attr='src'),
+}
+DETAIL_VALUES = {
+    'description': node_field('#jobDescriptionText', 'div#jobDescriptionText', '.jobsearch-JobComponent-description',
+                              '.jobsearch-jobDescriptionText', sep='\n'),
+    'salary': node_field('#salaryInfoAndJobType', 'div.salary', 'span[class*="salary"]', sep=' '),
+    'logo': node_field('div[data-testid="inlineHeader-companyLogo"] img', '.jobsearch-CompanyAvatar-image',
+                       'img[alt*="logo"]', attr='src'),
+}
+
 
 class IndeedFullDetailsScraper:
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, detail_tabs=3, snapshot_listing=True,
+                 profile_dir='.nodriver_profile', cookie_file='.indeed_cookies.dat', block_resources=True,
+                 detail_backend='hybrid', http_workers=8, parse_workers=None,
+                 enrichment_cache_file=ENRICHMENT_CACHE_FILE):
         # placeholders; actual browser/page started in async start()
         self.browser = None
         self.page = None
         self.headless = headless
+        # number of tabs fetching detail pages concurrently (1 = old serial behaviour in self.page)
+        self.detail_tabs = max(1, int(detail_tabs or 1))
+        self._tab_pool = None
+        # keep the parsed SERP cards and never navigate back to the listing after a detail page
+        self.snapshot_listing = snapshot_listing
+        self.navigations = 0
+        # browser profile + cookie jar persisted between runs so a passed challenge is reused
+        self.profile_dir = profile_dir
+        self.cookie_file = cookie_file
+        # drop images/fonts/media/trackers in every tab (we only read DOM text)
+        self.blocker = ResourceBlocker(enabled=block_resources)
+        # 'hybrid': viewjob pages over a pooled HTTP session with the browser's clearance,
+        # falling back to a browser tab when challenged; 'browser': tabs only
+        self.detail_backend = detail_backend
+        self.http_workers = http_workers
+        self.http_client = None
+        self.http_executor = None
+        self.http_failures = 0
+        # AIMD pacing per host, shared by SERP loads, detail tabs and the HTTP client
+        self.pacer = Pacer(initial_rate=1.0, max_rate=4.0)
+        # card selector fallbacks, reordered by hit rate across runs
+        self.card_cascade = SelectorCascade('nodriver.cards', CARD_SELECTORS)
+        # scroll-until-stable in place of the 3-5s render sleep and two scroll sleeps (~7s)
+        self.lazy_loader = LazyLoader(baseline=7.2)
+        # extracted SERP cards / detail fields by HTML hash (retries and revisits skip parsing)
+        self.parse_cache = ParseCache()
+        # raw document bodies captured from the network, per tab; pages that parse from it skip rendering
+        self.captures = {}
+        self.raw_pages = 0
+        # detail pages are parsed in worker processes and joined back by job key
+        self.parse_pool = ParsePool(workers=parse_workers)
+        self.pending_details = {}
+        self.parsed_details = []
+        # derived fields of descriptions seen in earlier runs (None: no cache)
+        self.enrichment_cache = EnrichmentCache(enrichment_cache_file)
 
     # -------------------------
     # Async startup / cloudflare
@@ -37,26 +130,28 @@ class IndeedFullDetailsScraper:
     async def start(self, start_url="https://cr.indeed.com/jobs?q=&l=costa+rica"):
         """Start nodriver browser and ensure the real page is loaded (no Cloudflare challenge)."""
         print("🚀 Starting nodriver browser...")
-        self.browser = await nd.start()
-        # open page
-        self.page = await self.browser.get(start_url)
+        self.browser = await nd.start(headless=self.headless, user_data_dir=self.profile_dir)
+        await self.load_clearance()
+        # open page (request blocking is attached before the first real navigation)
+        self.page = await self.browser.get("about:blank")
+        await self.prepare_tab(self.page)
+        await self.page.get(start_url)
         print("🌐 Navigated to", start_url)
 
+        # one cheap probe: saved clearance (profile/cookies) usually lands us on the real page
+        if await self.probe_page() == 'ready':
+            print("✅ Real Indeed page detected (saved clearance reused).")
+            await self.save_clearance()
+            await self.open_http_client()
+            return True
+
         # wait loop: check innerText for challenge or job markers
         max_attempts = 40
         for attempt in range(max_attempts):
             await asyncio.sleep(20 + random.random() * 1.5)
-            try:
-                inner_text = await self.page.evaluate("document.documentElement.innerText")
-            except Exception:
-                inner_text = ""
+            state = await self.probe_page(settle=0)
 
-            text_low = (inner_text[:500] or "").lower()
-
-            # print(text_low)
-
-            # heuristics for Cloudflare / recaptcha
-            if "verify you are human" in text_low or "cf-browser-verification" in text_low or "recaptcha" in text_low or "checking your browser" in text_low:
+            if state == 'challenge':
                 print(f"⏳ Cloudflare/challenge detected (attempt {attempt+1}/{max_attempts}). refreshing...")
                 try:
                     await self.page.reload()
@@ -65,17 +160,12 @@ class IndeedFullDetailsScraper:
                 await asyncio.sleep(3 + random.random() * 3)
                 continue
 
-            # heuristics for real Indeed page (spanish headings or known markers)
-            if "empleos en costa rica" in text_low:
+            if state == 'ready':
                 print("✅ Real Indeed page detected.")
+                await self.save_clearance()
+                await self.open_http_client()
                 return True
 
-            # falling back: check if there's a significant amount of text / HTML
-            # html_len = len(await self.page.evaluate("document.documentElement.outerHTML") or "")
-            # if html_len > 2000:
-            #     print("✅ Page has content (len:", html_len, ") — proceeding.")
-            #     return True
-
             # otherwise refresh and retry
             try:
                 await self.page.reload()
@@ -89,37 +179,78 @@ class IndeedFullDetailsScraper:
             input("Press Enter after solving the captcha in the browser (or Ctrl+C to abort)...")
         except KeyboardInterrupt:
             raise
+        await self.save_clearance()
+        await self.open_http_client()
         return True
 
+    async def prepare_tab(self, tab):
+        """Request blocking and document capture for a new tab"""
+        await self.blocker.attach_nodriver(tab)
+        capture = DocumentCapture(tab)
+        try:
+            await capture.attach()
+            self.captures[id(tab)] = capture
+        except Exception as e:
+            print(f"⚠️ Network capture unavailable, pages will be rendered: {e}")
+
+    async def navigate(self, tab, url):
+        """tab.get(url); returns the document body as the server sent it (None if not captured)"""
+        capture = self.captures.get(id(tab))
+        if capture:
+            capture.arm()
+        await tab.get(url)
+        self.navigations += 1
+        return await capture.wait() if capture else None
+
+    async def probe_page(self, settle=2):
+        """Classify the current page as 'challenge', 'ready' or None from its visible text"""
+        if settle:
+            await asyncio.sleep(settle + random.random())
+        try:
+            inner_text = await self.page.evaluate("document.documentElement.innerText")
+        except Exception:
+            inner_text = ""
+
+        text_low = (inner_text[:500] or "").lower()
+        if any(marker in text_low for marker in CHALLENGE_MARKERS):
+            return 'challenge'
+        if any(marker in text_low for marker in LISTING_MARKERS):
+            return 'ready'
+        return None
+
+    async def load_clearance(self):
+        """Load cookies (cf_clearance etc.) saved by a previous successful run"""
+        if not self.cookie_file or not os.path.exists(self.cookie_file):
+            return False
+        try:
+            await self.browser.cookies.load(self.cookie_file)
+            cookies = await self.browser.cookies.get_all()
+            clearance = [c for c in cookies if c.name == 'cf_clearance']
+            if clearance and all(c.expires and 0 < c.expires < time.time() for c in clearance):
+                print("🍪 Saved cf_clearance has expired — challenge will probably run again.")
+            else:
+                print(f"🍪 Loaded {len(cookies)} saved cookies from {self.cookie_file}")
+            return True
+        except Exception as e:
+            print(f"⚠️ Could not load saved cookies: {e}")
+            return False
+
+    async def save_clearance(self):
+        """Persist the cookie jar after a successful pass so the next start() can skip the wait loop"""
+        if not self.cookie_file:
+            return
+        try:
+            await self.browser.cookies.save(self.cookie_file)
+            print(f"💾 Saved clearance cookies to {self.cookie_file}")
+        except Exception as e:
+            print(f"⚠️ Could not save cookies: {e}")
+
     # -------------------------
     # Utilities (copied/adapted)
     # -------------------------
     def extract_category(self, title, description):
-        if not title and not description:
-            return None
-        text = f"{title or ''} {description or ''}".lower()
-        categories = {
-            'IT/Software Development': [
-                'software', 'developer', 'programming', 'engineer', 'web', 'mobile',
-                'frontend', 'backend', 'fullstack', 'devops', 'cloud', 'java', 'python',
-                'javascript', 'react', 'angular', 'node', 'php', 'dotnet', '.net',
-                'desarrollo', 'programador', 'desarrollador', 'sistemas', 'typescript',
-                'ruby', 'golang', 'kotlin', 'swift', 'android', 'ios', 'data scientist'
-            ],
-            'Customer Service': [
-                'customer service', 'call center', 'support', 'help desk', 'servicio al cliente',
-                'atención al cliente', 'soporte', 'representante', 'agent', 'cliente',
-                'atención', 'contact center', 'bpo'
-            ],
-            # (rest omitted for brevity — re-use your full categories mapping)
-        }
-        # Note: include all categories as in your original — truncated here for readability
-        # Merge back the rest of category lists in real use
-        for category, keywords in categories.items():
-            for keyword in keywords:
-                if keyword in text:
-                    return category
-        return 'General/Other'
+        # one pass of the keyword regex compiled at import (see indeed_enrichment)
+        return CATEGORY_MATCHER.classify(title, description)
 
     def parse_date(self, date_str):
         if not date_str:
@@ -151,100 +282,24 @@ class IndeedFullDetailsScraper:
         return datetime.now().strftime('%Y-%m-%d')
 
     def extract_salary(self, text):
-        if not text:
-            return {'_job_salary_type': None, '_job_salary': None, '_job_max_salary': None}
-        text_lower = text.lower()
-        salary_data = {'_job_salary_type': 'monthly', '_job_salary': None, '_job_max_salary': None}
-        if 'hora' in text_lower or 'hour' in text_lower or '/hr' in text_lower:
-            salary_data['_job_salary_type'] = 'hourly'
-        elif 'año' in text_lower or 'year' in text_lower or 'anual' in text_lower or '/yr' in text_lower:
-            salary_data['_job_salary_type'] = 'yearly'
-        elif 'mes' in text_lower or 'month' in text_lower or '/mo' in text_lower:
-            salary_data['_job_salary_type'] = 'monthly'
-        numbers = re.findall(r'[\d\.,]+(?:\.\d{2})?', text)
-        if numbers:
-            cleaned = []
-            for n in numbers:
-                n2 = n.replace('.', '').replace(',', '')
-                try:
-                    cleaned.append(float(n2))
-                except Exception:
-                    continue
-            if cleaned:
-                salary_data['_job_salary'] = cleaned[0]
-                if len(cleaned) > 1:
-                    salary_data['_job_max_salary'] = cleaned[1]
-        return salary_data
+        return extract_salary(text)
 
+    # single fields (card snippets); detail pages go through TEXT_ENRICHER.enrich in one pass
     def extract_experience_from_text(self, text):
-        if not text:
-            return None, None
-        s = text.lower()
-        exp_patterns = [
-            r'(\d+)\+?\s*(años?|years?)\s*(?:de\s*)?(?:experiencia|experience)',
-            r'(?:experiencia|experience)\s*(?:de\s*)?(\d+)\+?\s*(años?|years?)',
-            r'(\d+)\s*-\s*(\d+)\s*(años?|years?)',
-        ]
-        for pattern in exp_patterns:
-            m = re.search(pattern, s)
-            if m:
-                years = int(m.group(1))
-                if years >= 7:
-                    return f"{years}+ years", 'senior'
-                elif years >= 3:
-                    return f"{years}+ years", 'mid'
-                elif years >= 1:
-                    return f"{years}+ years", 'junior'
-                else:
-                    return f"{years} years", 'entry'
-        if any(w in s for w in ['senior', 'sr.', 'lead', 'principal']):
-            return '5+ years', 'senior'
-        if any(w in s for w in ['junior', 'jr.', 'entry level', 'sin experiencia']):
-            return '0-2 years', 'entry'
-        if any(w in s for w in ['mid', 'intermediate', 'intermedio']):
-            return '2-5 years', 'mid'
-        return None, None
+        return TEXT_ENRICHER.experience(text)
 
     def extract_qualification(self, text):
-        if not text:
-            return None
-        s = text.lower()
-        if any(word in s for word in ['phd', 'doctorado', 'doctorate', 'ph.d']):
-            return 'doctorate'
-        if any(word in s for word in ['maestría', 'master', 'msc', 'mba', "master's"]):
-            return 'master'
-        if any(word in s for word in ['licenciatura', 'bachelor', 'grado', 'university degree', "bachelor's"]):
-            return 'bachelor'
-        if any(word in s for word in ['técnico', 'technical', 'associate', 'diploma']):
-            return 'associate'
-        if any(word in s for word in ['secundaria', 'high school', 'bachillerato']):
-            return 'high_school'
-        return None
+        return TEXT_ENRICHER.qualification(text)
 
     def extract_job_type(self, text):
-        if not text:
-            return None
-        s = text.lower()
-        if 'tiempo completo' in s or 'full time' in s or 'full-time' in s:
-            return 'full-time'
-        if 'medio tiempo' in s or 'part time' in s or 'part-time' in s:
-            return 'part-time'
-        if 'temporal' in s or 'temporary' in s:
-            return 'temporary'
-        if 'contrato' in s or 'contract' in s:
-            return 'contract'
-        if 'internship' in s or 'pasantía' in s or 'intern' in s:
-            return 'internship'
-        if 'freelance' in s or 'por proyecto' in s:
-            return 'freelance'
-        return None
+        return TEXT_ENRICHER.job_type(text)
 
     # -------------------------
-    # Parsing helpers (BeautifulSoup)
+    # Parsing helpers (indeed_html backends)
     # -------------------------
-    def extract_job_from_card_soup(self, card):
-        """card is a BeautifulSoup tag for single job card"""
-        job_data = {
+    def new_job_data(self):
+        """Empty record with every field of the export schema"""
+        return {
             '_job_featured_image': None,
             '_job_title': None,
             '_job_featured': 0,
@@ -273,71 +328,382 @@ class IndeedFullDetailsScraper:
             '_job_map_location': None
         }
 
+    def extract_job_from_mosaic_card(self, card):
+        """card is a normalized dict from indeed_cards.extract_mosaic_cards"""
+        job_data = self.new_job_data()
+        job_data['_job_title'] = card['title']
+        job_data['_job_apply_url'] = card['url']
+        if card['location']:
+            job_data['_job_location'] = card['location']
+            job_data['_job_address'] = card['location']
+        if card['salary']:
+            job_data.update(self.extract_salary(card['salary']))
+        if card['snippet']:
+            job_data['_job_description'] = card['snippet']
+            jt = self.extract_job_type(card['snippet'])
+            if jt:
+                job_data['_job_type'] = jt
+
+        if card['sponsored']:
+            job_data['_job_featured'] = 1
+            job_data['_job_tag'].append('sponsored')
+        if card['urgent']:
+            job_data['_job_urgent'] = 1
+            job_data['_job_tag'].append('urgent')
+        if card['new'] or 'nuevo' in (card['snippet'] or '').lower():
+            job_data['_job_tag'].append('new')
+
+        logo = card['logo']
+        if logo and 'indeed' not in logo.lower() and len(logo) > 20:
+            job_data['_job_featured_image'] = logo
+        return job_data
+
+    def extract_listing(self, html):
+        """
+        Every titled card of a SERP: {'found': n, 'source': ..., 'cards': [(idx, job_data, jk)]}
+
+        All cards are embedded as JSON (mosaic-provider-jobcards); the CSS selectors
+        are only used when that blob is missing
+        """
+        job_cards = extract_mosaic_cards(html)
+        from_mosaic = bool(job_cards)
+        if not from_mosaic:
+            soup = parse_region(html, SERP_REGION)
+            _, job_cards = self.card_cascade.find(soup.select)
+            job_cards = job_cards or []
+
+        cards = []
+        for idx, card in enumerate(job_cards, start=1):
+            try:
+                if from_mosaic:
+                    job_data, jk = self.extract_job_from_mosaic_card(card), card['job_key']
+                else:
+                    job_data = self.extract_job_from_card_soup(card)
+                    jk = self.extract_job_key(card, job_data)
+            except Exception as e:
+                print(f"    ❌ Error extracting job card: {e}")
+                continue
+            if job_data['_job_title']:
+                cards.append((idx, job_data, jk))
+        return {'found': len(job_cards), 'source': 'mosaic JSON' if from_mosaic else 'using selector', 'cards': cards}
+
+    def extract_listing_in_page(self, data):
+        """Same as extract_listing, from the in-page extractor's output (see indeed_page_scripts)"""
+        if data.get('mosaic'):
+            cards = [normalize_mosaic_card(r) for r in data['mosaic'] if isinstance(r, dict)]
+            jobs = [(self.extract_job_from_mosaic_card(card), card['job_key']) for card in cards]
+            source, found = 'mosaic JSON, in page', len(cards)
+        else:
+            # keep the selector stats: the page tried the selectors in cascade order
+            self.card_cascade.find(lambda sel: data['cards'] if sel == data['selector'] else None)
+            jobs = []
+            for card in data['cards']:
+                job_data = self.extract_job_from_card_values(card['values'], set(card['tags']))
+                jobs.append((job_data, card['jk'] or self.job_key_from_url(job_data['_job_apply_url'])))
+            source, found = 'using selector, in page', len(data['cards'])
+        cards = [(idx, job_data, jk) for idx, (job_data, jk) in enumerate(jobs, start=1) if job_data['_job_title']]
+        return {'found': found, 'source': source, 'cards': cards}
+
+    def extract_job_from_card_soup(self, card):
+        """card is a parsed element (indeed_html) for single job card"""
+        return self.extract_job_from_card_values(read_fields(card, CARD_VALUES), detect_card_tags(card))
+
+    def extract_job_from_card_values(self, values, tags):
+        """Job record from a card's CARD_VALUES (read_fields or in-page) and its CARD_TAGS"""
+        job_data = self.new_job_data()
+
         # Title
-        title = None
-        # common selectors
-        selectors = [
-            ('a', 'h2.jobTitle span'),
-            ('a', 'h2.jobTitle'),
-            ('a', 'a.jcs-JobTitle'),
-            ('a', 'a.tapItem')
-        ]
-        # Try generic patterns
-        t = card.select_one('h2.jobTitle span') or card.select_one('h2.jobTitle') or card.select_one('a.jcs-JobTitle') or card.select_one('a.tapItem')
-        if t:
-            job_data['_job_title'] = t.get_text(strip=True)
+        if values['title'] is not None:
+            job_data['_job_title'] = values['title']
 
         # Apply url
-        link = card.select_one('a.tapItem') or card.select_one('a.jcs-JobTitle') or card.select_one('h2.jobTitle a')
-        if link and link.has_attr('href'):
-            href = link['href']
+        href = values['href']
+        if href:
             # relative links on Indeed often start with /rc/ or /company/ or /viewjob
             if href.startswith('/'):
                 href = 'https://cr.indeed.com' + href
             job_data['_job_apply_url'] = href
 
         # Location
-        loc = card.select_one('div[data-testid="text-location"]') or card.select_one('.companyLocation') or card.select_one('.location')
-        if loc:
-            job_data['_job_location'] = loc.get_text(strip=True)
+        if values['location'] is not None:
+            job_data['_job_location'] = values['location']
             job_data['_job_address'] = job_data['_job_location']
 
         # Salary (card-level)
-        sal = card.select_one('.salary-snippet-container') or card.select_one('.salary-snippet') or card.select_one('span.salaryText') or card.select_one('div.salary')
-        if sal:
-            sal_text = sal.get_text(" ", strip=True)
-            salary_info = self.extract_salary(sal_text)
+        if values['salary'] is not None:
+            salary_info = self.extract_salary(values['salary'])
             job_data.update(salary_info)
 
         # Snippet description
-        snippet = card.select_one('.job-snippet') or card.select_one('.summary') or card.select_one('div.job-snippet')
-        if snippet:
-            snippet_text = snippet.get_text(" ", strip=True)
+        snippet_text = values['snippet']
+        if snippet_text is not None:
             job_data['_job_description'] = snippet_text
             jt = self.extract_job_type(snippet_text)
             if jt:
                 job_data['_job_type'] = jt
 
-        # Tags: sponsored/urgent/new
-        inner = str(card).lower()
-        if 'patrocinado' in inner or 'sponsored' in inner:
+        # Tags: sponsored/urgent/new (label nodes or the card's text, which includes the snippet)
+        if 'sponsored' in tags:
             job_data['_job_featured'] = 1
             job_data['_job_tag'].append('sponsored')
-        if 'urge contratar' in inner or 'urgently' in inner or 'urgente' in inner:
+        if 'urgent' in tags:
             job_data['_job_urgent'] = 1
             job_data['_job_tag'].append('urgent')
-        if 'nuevo' in inner or 'nuevo' in (job_data['_job_description'] or '').lower():
+        if 'new' in tags:
             job_data['_job_tag'].append('new')
 
         # Logo heuristics inside card
-        img = card.select_one('img')
-        if img and img.has_attr('src'):
-            src = img['src']
-            if src and 'indeed' not in src.lower() and len(src) > 20:
-                job_data['_job_featured_image'] = src
+        src = values['logo']
+        if src and 'indeed' not in src.lower() and len(src) > 20:
+            job_data['_job_featured_image'] = src
 
         return job_data
 
+    def apply_detail_html(self, job_data, detail_html):
+        """Merge description/salary/logo/derived fields of a job detail page into job_data"""
+        # the same page again (retry, duplicate posting) comes from the parse cache
+        fields = self.parse_cache.get_or_parse(detail_html, 'viewjob', self.extract_detail_fields)
+        self.apply_detail_fields(job_data, fields)
+
+    def apply_detail_fields(self, job_data, fields, derived=None):
+        """
+        Merge extract_detail_fields/detail_fields_from_values output into job_data
+
+        `derived`: TEXT_ENRICHER.enrich(description, title) when the fields were parsed
+        without enrichment (parse pool + enrichment cache, see join_details)
+        """
+        fields = dict(fields)
+        if derived:
+            fields.update(self.derived_fields(derived))
+        job_type = fields.pop('_job_type', None)
+        if job_type and not job_data['_job_type']:
+            job_data['_job_type'] = job_type
+        job_data.update(fields)
+
+        full_desc = fields.get('_job_description')
+        if full_desc:
+            cat = derived['category'] if derived else self.extract_category(job_data['_job_title'], full_desc)
+            if cat:
+                job_data['_job_category'] = cat
+
+    def extract_detail_fields(self, detail_html, enrich=True):
+        return extract_detail_fields(detail_html, enrich)
+
+    def detail_fields_from_values(self, values, enrich=True):
+        return detail_fields_from_values(values, enrich)
+
+    def derived_fields(self, derived):
+        return derived_fields(derived)
+
+    def extract_job_key(self, card, job_data=None):
+        """Indeed job key (jk) of a card, from data-jk or the card link"""
+        if card.has_attr('data-jk'):
+            return card['data-jk']
+        holder = card.select_one('[data-jk]')
+        if holder:
+            return holder['data-jk']
+        return self.job_key_from_url((job_data or {}).get('_job_apply_url'))
+
+    def job_key_from_url(self, url):
+        m = re.search(r'[?&]jk=([0-9a-f]+)', url or '')
+        return m.group(1) if m else None
+
+    # -------------------------
+    # Parse pool
+    # -------------------------
+    async def queue_detail(self, job_data, worker, page, key=None):
+        """
+        Hand a detail page (raw HTML, or the in-page extractor's values) to the parse pool
+
+        worker is parse_detail_page or derive_detail_fields; join_details() enriches the
+        result and merges it into job_data. Only waits when the pool is full.
+        """
+        key = key or self.job_key_from_url(job_data['_job_apply_url']) or job_data['_job_apply_url']
+        if key in self.pending_details:
+            # the same posting twice on a page: parsed once, merged into both
+            self.pending_details[key][1].append(job_data)
+            return
+        if isinstance(page, str):
+            found, fields = self.parse_cache.lookup(page, 'viewjob parsed')
+            if found:
+                self.parsed_details.append((fields, [job_data]))
+                return
+        self.pending_details[key] = (page, [job_data])
+        await self.parse_pool.submit(key, worker, page)
+
+    async def join_details(self):
+        """Wait for the queued detail pages, enrich them in one batch and merge each into its job(s) by job key"""
+        results = await self.parse_pool.join()
+        parsed, self.parsed_details = self.parsed_details, []
+        for key, result in results.items():
+            page, jobs = self.pending_details.pop(key)
+            if isinstance(result, Exception):
+                print(f"      ⚠️ Detail parse error ({jobs[0]['_job_title'][:40]}): {result}")
+                continue
+            if isinstance(page, str):
+                self.parse_cache.store(page, 'viewjob parsed', result)
+            parsed.append((result, jobs))
+
+        derived = await self.enrich_details([(fields.get('_job_description'), jobs[0]['_job_title'] or '')
+                                             for fields, jobs in parsed])
+        for (fields, jobs), enriched in zip(parsed, derived):
+            for job_data in jobs:
+                self.apply_detail_fields(job_data, fields, enriched)
+
+    async def enrich_details(self, texts):
+        """
+        TEXT_ENRICHER.enrich() of (description, title) pairs: one enrichment cache lookup
+        for the batch, and the descriptions not seen in earlier runs enriched in one pool job
+        """
+        keys = self.enrichment_cache.keys(TEXT_ENRICHER, texts)
+        found = self.enrichment_cache.get_many([key for key, (description, _) in zip(keys, texts) if description])
+        missing = {key: text for key, text in zip(keys, texts) if text[0] and key not in found}
+        if missing:
+            await self.parse_pool.submit('enrich', enrich_texts, list(missing.values()))
+            computed = (await self.parse_pool.join(['enrich']))['enrich']
+            if isinstance(computed, Exception):
+                print(f"      ⚠️ Enrichment error, enriching inline: {computed}")
+                computed = enrich_texts(list(missing.values()))
+            computed = dict(zip(missing, computed))
+            self.enrichment_cache.put_many(computed)
+            found.update(computed)
+        return [found[key] if description else None for key, (description, _) in zip(keys, texts)]
+
+    # -------------------------
+    # Detail tabs
+    # -------------------------
+    async def open_detail_tabs(self):
+        """Open the pool of tabs (same nd browser) used to fetch detail pages concurrently"""
+        if self._tab_pool is None:
+            self._tab_pool = asyncio.Queue()
+            for _ in range(self.detail_tabs):
+                tab = await self.browser.get("about:blank", new_tab=True)
+                await self.prepare_tab(tab)
+                self._tab_pool.put_nowait(tab)
+            print(f"🗂️ Opened {self.detail_tabs} detail tabs")
+        return self._tab_pool
+
+    async def fetch_job_details(self, tab, job_data, return_url=None):
+        """Open the job detail page in `tab` and merge the results into job_data"""
+        url = job_data['_job_apply_url']
+        await self.pacer.wait_async(url)
+        try:
+            raw_html = await self.navigate(tab, url)
+            if raw_html and 'jobDescriptionText' in raw_html:
+                # the description is in the server response: no need to wait for render
+                self.raw_pages += 1
+                self.pacer.success(url)
+                await self.queue_detail(job_data, parse_detail_page, raw_html)
+            else:
+                await self.apply_rendered_details(tab, url, job_data)
+
+            if return_url:
+                # optionally return to listing page (paced like any other request to the host)
+                await self.pacer.wait_async(return_url)
+                await tab.get(return_url)
+                self.navigations += 1
+                await asyncio.sleep(0.8 + random.random() * 0.8)
+        except Exception as e:
+            # On error, continue - we don't want to stop the whole run
+            self.pacer.failure(url, 'error')
+            print(f"      ⚠️ Detail page error ({job_data['_job_title'][:40]}): {e}")
+
+    async def apply_rendered_details(self, tab, url, job_data):
+        """Wait for the detail page to render, then read its fields in the page (outerHTML as fallback)"""
+        await asyncio.sleep(2 + random.random() * 1.5)
+        # only the detail fields come back over CDP; outerHTML if the extractor can't run
+        values = await extract_detail_in_page(tab, DETAIL_VALUES)
+        if values is not None:
+            self.pacer.record(url, values['description'] is not None, 'no description')
+            await self.queue_detail(job_data, derive_detail_fields, values)
+        else:
+            detail_html = await tab.evaluate("document.documentElement.outerHTML")
+            self.pacer.record(url, 'jobDescriptionText' in detail_html, 'no description')
+            await self.queue_detail(job_data, parse_detail_page, detail_html)
+
+    async def fetch_job_details_pooled(self, job_data):
+        """Borrow a tab from the detail pool, fetch the job details and hand the tab back"""
+        pool = await self.open_detail_tabs()
+        tab = await pool.get()
+        try:
+            await self.fetch_job_details(tab, job_data)
+        finally:
+            pool.put_nowait(tab)
+
+    # -------------------------
+    # Pooled HTTP details (hybrid backend)
+    # -------------------------
+    async def open_http_client(self):
+        """Hand the browser's cookie jar and user agent to a keep-alive, connection-pooled HTTP client"""
+        if self.detail_backend != 'hybrid':
+            return None
+        try:
+            cookies = await self.browser.cookies.get_all()
+            user_agent = await self.page.evaluate("navigator.userAgent")
+        except Exception as e:
+            print(f"⚠️ Could not export browser session, using tabs for details: {e}")
+            return None
+        jar = [{'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path} for c in cookies]
+        self.http_client = IndeedManualCookieScraper.from_browser_cookies(
+            jar, user_agent=user_agent, pool_size=self.http_workers, pacer=self.pacer)
+        self.http_executor = ThreadPoolExecutor(max_workers=self.http_workers)
+        self.http_failures = 0
+        print(f"🔗 HTTP detail client ready ({len(jar)} cookies, {self.http_workers} connections)")
+        return self.http_client
+
+    async def fetch_job_details_http(self, job_data, jk):
+        """Fetch viewjob?jk= over HTTP; a challenged request or a page without the description goes back to a browser tab"""
+        client = self.http_client
+        detail_html = None
+        if client:
+            url = f"https://cr.indeed.com/viewjob?jk={jk}"
+            loop = asyncio.get_running_loop()
+            detail_html = await loop.run_in_executor(self.http_executor, client.fetch_detail_html, url)
+
+        if detail_html:
+            self.http_failures = 0
+            await self.queue_detail(job_data, parse_detail_page, detail_html, key=jk)
+            return
+
+        if client:
+            self.http_failures += 1
+            if self.http_failures >= 3 and self.http_client is client:
+                # clearance no longer accepted over HTTP — stop trying for this run
+                print("  ⚠️ HTTP detail client keeps getting challenged — switching to browser tabs.")
+                self.http_client = None
+        await self.fetch_job_details_pooled(job_data)
+
+    async def render_listing(self):
+        """Cards of the SERP in the listing tab after waiting for render and scrolling"""
+        # scroll to the bottom until the card count stops changing
+        await self.lazy_loader.nodriver(self.page, ', '.join(self.card_cascade.ordered()))
+
+        # cards are extracted in the page and come back as compact JSON; outerHTML is
+        # only shipped when the extractor can't run (parsed via the cache)
+        page = await extract_serp_in_page(self.page, self.card_cascade.ordered(), CARD_VALUES,
+                                          CARD_TAGS, MOSAIC_KEYS)
+        if page is not None:
+            return self.extract_listing_in_page(page)
+        html = await self.page.evaluate("document.documentElement.outerHTML")
+        return self.parse_cache.get_or_parse(html, 'serp', self.extract_listing)
+
+    async def lend_listing_tab(self):
+        """Add the listing tab to the detail pool once its SERP has been snapshotted"""
+        pool = await self.open_detail_tabs()
+        pool.put_nowait(self.page)
+
+    def reclaim_listing_tab(self):
+        """Take the listing tab back out of the (idle) detail pool before the next SERP"""
+        if self._tab_pool is None:
+            return
+        tabs = []
+        while not self._tab_pool.empty():
+            tab = self._tab_pool.get_nowait()
+            if tab is not self.page:
+                tabs.append(tab)
+        for tab in tabs:
+            self._tab_pool.put_nowait(tab)
+
     # -------------------------
     # Main scraping logic
     # -------------------------
@@ -353,129 +719,108 @@ class IndeedFullDetailsScraper:
 
             print(f"\n📄 Page {page_no + 1}/{max_pages}: {url}")
             try:
-                await self.page.get(url)
-                # wait a bit for JS to render
-                await asyncio.sleep(3 + random.random() * 2)
-
-                # optional extra scrolling to load lazy content
-                await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight/3);")
-                await asyncio.sleep(0.7 + random.random() * 1.5)
-                await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
-                await asyncio.sleep(1 + random.random() * 1.5)
-
-                html = await self.page.evaluate("document.documentElement.outerHTML")
-                soup = BeautifulSoup(html, "lxml")
-
-                # Try multiple selectors for job cards
-                card_selectors = [
-                    'a.tapItem',            # common modern selector
-                    'div.job_seen_beacon',
-                    'div[data-jk]',
-                    'td.resultContent',
-                    'li.css-5lfssm'
-                ]
-                job_cards = []
-                for sel in card_selectors:
-                    found = soup.select(sel)
-                    if found:
-                        job_cards = found
-                        break
+                await self.pacer.wait_async(url)
+                raw_html = await self.navigate(self.page, url)
+
+                # the server response already carries the mosaic JSON / cards;
+                # render, scroll and read the live DOM only when it doesn't
+                page_cards = self.parse_cache.get_or_parse(raw_html, 'serp', self.extract_listing) if raw_html else None
+                if page_cards and page_cards['found']:
+                    self.raw_pages += 1
+                    page_cards['source'] += ', server HTML'
+                else:
+                    page_cards = await self.render_listing()
 
-                if not job_cards:
+                self.pacer.record(url, bool(page_cards['found']), 'no cards')
+                if not page_cards['found']:
                     print("  ⚠️ No job cards found on this page — saving debug and continuing.")
+                    html = await self.page.evaluate("document.documentElement.outerHTML")
                     with open(f"debug_page_{page_no+1}.html", "w", encoding="utf-8") as f:
                         f.write(html)
                     # continue to next page or stop
                     break
 
-                print(f"  ✅ Found {len(job_cards)} job card elements (using selector).")
+                print(f"  ✅ Found {page_cards['found']} job cards ({page_cards['source']}).")
 
-                for idx, card in enumerate(job_cards, start=1):
-                    try:
-                        job_data = self.extract_job_from_card_soup(card)
-                        if not job_data['_job_title']:
-                            continue
+                # Listing snapshot: every card is parsed once from this SERP's html and kept,
+                # so detail pages never have to navigate back to the listing
+                listing = []
+                reached_limit = False
+                for idx, job_data, jk in page_cards['cards']:
+                    listing.append((idx, job_data, jk))
+                    if max_jobs and len(all_jobs) + len(listing) >= max_jobs:
+                        reached_limit = True
+                        break
 
+                use_http = extract_full_details and self.http_client is not None
+                use_pool = extract_full_details and (self.detail_tabs > 1 or use_http)
+                # (with the HTTP backend tabs are only opened lazily, for challenged jobs)
+                lent_listing_tab = use_pool and self.snapshot_listing and not use_http
+                if lent_listing_tab:
+                    # the listing is no longer needed until the next SERP
+                    await self.lend_listing_tab()
+
+                page_jobs = []
+                detail_tasks = []
+                for idx, job_data, jk in listing:
+                    try:
                         print(f"  {idx:3d}. {job_data['_job_title'][:80]:80s}")
 
                         # If requested, fetch detail page to get full description
-                        if extract_full_details and job_data['_job_apply_url']:
-                            # small randomized delay
-                            await asyncio.sleep(0.6 + random.random() * 0.8)
-                            try:
-                                # navigate to detail page (keeps same page)
-                                await self.page.get(job_data['_job_apply_url'])
-                                await asyncio.sleep(2 + random.random() * 1.5)
-                                detail_html = await self.page.evaluate("document.documentElement.outerHTML")
-                                detail_soup = BeautifulSoup(detail_html, "lxml")
-
-                                # description selectors
-                                desc = detail_soup.select_one('#jobDescriptionText') or detail_soup.select_one('div#jobDescriptionText') or detail_soup.select_one('.jobsearch-JobComponent-description') or detail_soup.select_one('.jobsearch-jobDescriptionText')
-                                if desc:
-                                    full_desc = desc.get_text("\n", strip=True)
-                                    job_data['_job_description'] = full_desc
-
-                                    # extract experience / qualification / type / category
-                                    exp, lev = self.extract_experience_from_text(full_desc)
-                                    if exp:
-                                        job_data['_job_experience'] = exp
-                                    if lev:
-                                        job_data['_job_career_level'] = lev
-                                    qual = self.extract_qualification(full_desc)
-                                    if qual:
-                                        job_data['_job_qualification'] = qual
-                                    jt = self.extract_job_type(full_desc)
-                                    if jt and not job_data['_job_type']:
-                                        job_data['_job_type'] = jt
-                                    cat = self.extract_category(job_data['_job_title'], full_desc)
-                                    if cat:
-                                        job_data['_job_category'] = cat
-
-                                # salary in detail page
-                                sal = detail_soup.select_one('#salaryInfoAndJobType') or detail_soup.select_one('div.salary') or detail_soup.select_one('span[class*="salary"]')
-                                if sal:
-                                    info = self.extract_salary(sal.get_text(" ", strip=True))
-                                    job_data.update(info)
-
-                                # try company logo on detail page
-                                logo = detail_soup.select_one('div[data-testid="inlineHeader-companyLogo"] img') or detail_soup.select_one('.jobsearch-CompanyAvatar-image') or detail_soup.select_one('img[alt*="logo"]')
-                                if logo and logo.has_attr('src'):
-                                    src = logo['src']
-                                    if 'indeed' not in src.lower() and len(src) > 20:
-                                        job_data['_job_featured_image'] = src
-
-                                # optionally return to listing page (fast)
-                                await self.page.get(url)
-                                await asyncio.sleep(0.8 + random.random() * 0.8)
-                            except Exception as e:
-                                # On error, continue - we don't want to stop the whole run
-                                print(f"      ⚠️ Detail page error: {e}")
-
-                        # fallback category detection
-                        if not job_data['_job_category']:
-                            job_data['_job_category'] = self.extract_category(job_data['_job_title'], job_data['_job_description'])
-
+                        if use_http and jk:
+                            # pooled HTTP with the browser's clearance; challenged jobs go back to a tab
+                            detail_tasks.append(asyncio.create_task(self.fetch_job_details_http(job_data, jk)))
+                        elif extract_full_details and job_data['_job_apply_url']:
+                            if use_pool:
+                                # fetched in the tab pool while we keep going through the cards
+                                detail_tasks.append(asyncio.create_task(self.fetch_job_details_pooled(job_data)))
+                            else:
+                                return_url = None if self.snapshot_listing else url
+                                await self.fetch_job_details(self.page, job_data, return_url=return_url)
+
+                        page_jobs.append(job_data)
                         all_jobs.append(job_data)
-                        if max_jobs and len(all_jobs) >= max_jobs:
-                            print(f"\n✅ Reached max jobs limit ({max_jobs})")
-                            return all_jobs
-
-                        # polite small delay
-                        await asyncio.sleep(0.3 + random.random() * 0.9)
                     except Exception as e:
                         print(f"    ❌ Error extracting job card: {e}")
                         continue
 
-                # delay between pages
+                if detail_tasks:
+                    print(f"  ⏳ Waiting for {len(detail_tasks)} detail pages ({self.detail_tabs} tabs)...")
+                    await asyncio.gather(*detail_tasks, return_exceptions=True)
+                if lent_listing_tab:
+                    self.reclaim_listing_tab()
+                # the pages were parsed in the pool while the tabs kept fetching
+                await self.join_details()
+
+                # fallback category detection
+                for job_data in page_jobs:
+                    if not job_data['_job_category']:
+                        job_data['_job_category'] = self.extract_category(job_data['_job_title'], job_data['_job_description'])
+
+                if reached_limit:
+                    print(f"\n✅ Reached max jobs limit ({max_jobs})")
+                    break
+
+                # the next page load is paced per host (AIMD)
                 if page_no < max_pages - 1:
-                    delay = random.uniform(2.0, 5.0)
-                    print(f"  ⏳ Waiting {delay:.1f}s before next page...")
-                    await asyncio.sleep(delay)
+                    print(f"  ⏳ Pacing at {self.pacer.current_rate(url):.2f} req/s")
 
             except Exception as e:
                 print(f"  ❌ Page error: {e}")
                 break
 
+        await self.join_details()
+        self.blocker.report()
+        self.pacer.report()
+        self.card_cascade.report()
+        self.parse_cache.report()
+        self.lazy_loader.report()
+        self.parse_pool.report()
+        self.enrichment_cache.report()
+        if self.raw_pages:
+            print(f"📡 {self.raw_pages} pages parsed straight from the server response (no render wait)")
+        if all_jobs:
+            print(f"🧭 {self.navigations} navigations for {len(all_jobs)} jobs ({self.navigations / len(all_jobs):.2f} per job)")
         return all_jobs
 
     # -------------------------
@@ -509,6 +854,13 @@ class IndeedFullDetailsScraper:
             print("⚠️ Save CSV error:", e)
 
     async def close(self):
+        self._tab_pool = None
+        self.parse_pool.close()
+        self.enrichment_cache.close()
+        self.http_client = None
+        if self.http_executor:
+            self.http_executor.shutdown(wait=False)
+            self.http_executor = None
         if self.browser:
             try:
                 await self.browser.stop()
@@ -516,12 +868,108 @@ class IndeedFullDetailsScraper:
                 pass
 
 
+# -------------------------
+# Detail page parsing (shared by the scraper and the parse pool workers)
+# -------------------------
+def extract_salary(text):
+    """_job_salary_type / _job_salary / _job_max_salary of a salary snippet"""
+    if not text:
+        return {'_job_salary_type': None, '_job_salary': None, '_job_max_salary': None}
+    text_lower = text.lower()
+    salary_data = {'_job_salary_type': 'monthly', '_job_salary': None, '_job_max_salary': None}
+    if 'hora' in text_lower or 'hour' in text_lower or '/hr' in text_lower:
+        salary_data['_job_salary_type'] = 'hourly'
+    elif 'año' in text_lower or 'year' in text_lower or 'anual' in text_lower or '/yr' in text_lower:
+        salary_data['_job_salary_type'] = 'yearly'
+    elif 'mes' in text_lower or 'month' in text_lower or '/mo' in text_lower:
+        salary_data['_job_salary_type'] = 'monthly'
+    numbers = re.findall(r'[\d\.,]+(?:\.\d{2})?', text)
+    if numbers:
+        cleaned = []
+        for n in numbers:
+            n2 = n.replace('.', '').replace(',', '')
+            try:
+                cleaned.append(float(n2))
+            except Exception:
+                continue
+        if cleaned:
+            salary_data['_job_salary'] = cleaned[0]
+            if len(cleaned) > 1:
+                salary_data['_job_max_salary'] = cleaned[1]
+    return salary_data
+
+
+def extract_detail_fields(detail_html, enrich=True):
+    """Parse a job detail page into the job_data fields it provides (category aside: it needs the title)"""
+    detail_soup = parse_region(detail_html, VIEWJOB_REGION)
+    return detail_fields_from_values(read_fields(detail_soup, DETAIL_VALUES), enrich)
+
+
+def detail_fields_from_values(values, enrich=True):
+    """job_data fields from a detail page's DETAIL_VALUES (read_fields or in-page)"""
+    fields = {}
+
+    full_desc = values['description']
+    if full_desc is not None:
+        fields['_job_description'] = full_desc
+
+        # experience / career level / qualification / type in one pass over the description
+        if enrich:
+            fields.update(derived_fields(TEXT_ENRICHER.enrich(full_desc)))
+
+    # salary in detail page
+    if values['salary'] is not None:
+        fields.update(extract_salary(values['salary']))
+
+    # try company logo on detail page
+    src = values['logo']
+    if src and 'indeed' not in src.lower() and len(src) > 20:
+        fields['_job_featured_image'] = src
+    return fields
+
+
+def derived_fields(derived):
+    """job_data fields of a TEXT_ENRICHER.enrich() result (category aside)"""
+    fields = {}
+    if derived['experience']:
+        fields['_job_experience'] = derived['experience']
+    if derived['career_level']:
+        fields['_job_career_level'] = derived['career_level']
+    if derived['qualification']:
+        fields['_job_qualification'] = derived['qualification']
+    if derived['job_type']:
+        fields['_job_type'] = derived['job_type']
+    return fields
+
+
+# -------------------------
+# Parse pool workers (module level so they pickle)
+# -------------------------
+def parse_detail_page(detail_html):
+    """Detail fields of a job detail page's HTML (not enriched: see join_details)"""
+    return extract_detail_fields(detail_html, enrich=False)
+
+
+def derive_detail_fields(values):
+    """Detail fields from the in-page extractor's DETAIL_VALUES (not enriched)"""
+    return detail_fields_from_values(values, enrich=False)
+
+
+def enrich_texts(texts):
+    """TEXT_ENRICHER.enrich() of (description, title) pairs"""
+    return [TEXT_ENRICHER.enrich(description, title) for description, title in texts]
+
+
 # -------------------------
 # Runner
 # -------------------------
 def main():
     search_url = "https://cr.indeed.com/jobs?q=&l=costa+rica&from=searchOnHP"
-    scraper = IndeedFullDetailsScraper(headless=False)
+    detail_tabs = int(os.getenv('DETAIL_TABS', '3'))
+    detail_backend = os.getenv('DETAIL_BACKEND', 'hybrid')
+    parse_workers = int(os.environ['PARSE_WORKERS']) if os.getenv('PARSE_WORKERS') else None
+    scraper = IndeedFullDetailsScraper(headless=False, detail_tabs=detail_tabs, detail_backend=detail_backend,
+                                       parse_workers=parse_workers)
 
     async def arun():
         try:
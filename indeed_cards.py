@@ -0,0 +1,133 @@
+"""
+SERP job card helpers shared by the scrapers
+
+Indeed renders the search results with the mosaic providers, which embed every
+card of the page as JSON in a script tag:
+
+    window.mosaic.providerData["mosaic-provider-jobcards"]={"metaData": {...}};
+
+extract_mosaic_cards() finds that payload and loads all cards with a single JSON
+decode. It returns None when the blob is missing, which is the scrapers' cue to
+fall back to their CSS selector path.
+
+On that fallback path, detect_card_tags() finds the sponsored/urgent/new labels
+from the card's text and label nodes. It no longer serializes the whole card
+subtree and searches it.
+"""
+
+import html as html_lib
+import json
+import re
+
+
+MOSAIC_JOBCARDS_RE = re.compile(r'window\.mosaic\.providerData\[["\']mosaic-provider-jobcards["\']\]\s*=\s*')
+BASE_URL = 'https://cr.indeed.com'
+
+_json_decoder = json.JSONDecoder()
+
+# Card labels: words searched in the card's lowercased text, or a label node matching `css`
+CARD_TAGS = {
+    'sponsored': {'words': ('patrocinado', 'sponsored'),
+                  'css': '[class*="sponsored"], [data-testid*="sponsored"]'},
+    'urgent': {'words': ('urge contratar', 'urgently', 'urgente'),
+               'css': '[class*="urgentlyHiring"], [data-testid*="urgently"]'},
+    'new': {'words': ('nuevo',),
+            'css': 'span.new, [class*="newJob"], [data-testid*="new-job"]'},
+}
+
+
+def find_mosaic_payload(page_html):
+    """Decode the mosaic-provider-jobcards JSON blob, or None if the page doesn't have it"""
+    if not page_html:
+        return None
+    match = MOSAIC_JOBCARDS_RE.search(page_html)
+    if not match:
+        return None
+    try:
+        payload, _ = _json_decoder.raw_decode(page_html, match.end())
+    except ValueError:
+        return None
+    return payload
+
+
+def html_to_text(fragment):
+    """Plain text of a small HTML fragment (card snippets are <ul><li>...</li></ul>)"""
+    if not fragment:
+        return None
+    text = re.sub(r'<[^>]+>', ' ', fragment)
+    text = html_lib.unescape(text)
+    return ' '.join(text.split()) or None
+
+
+def absolute_url(href, base_url=BASE_URL):
+    if not href:
+        return None
+    return href if href.startswith('http') else base_url + href
+
+
+# keys of a mosaic result read by normalize_mosaic_card (the in-page extractor ships only these)
+MOSAIC_KEYS = (
+    'jobkey', 'displayTitle', 'title', 'company', 'truncatedCompany', 'companyRating',
+    'formattedLocation', 'snippet', 'salarySnippet', 'jobTypes', 'formattedRelativeTime',
+    'link', 'viewJobLink', 'companyBrandingAttributes', 'sponsored', 'urgentlyHiring', 'newJob',
+)
+
+
+def normalize_mosaic_card(result, base_url=BASE_URL):
+    """Flatten one mosaic result into the fields the scrapers use"""
+    salary = result.get('salarySnippet') or {}
+    branding = result.get('companyBrandingAttributes') or {}
+    return {
+        'job_key': result.get('jobkey'),
+        'title': result.get('displayTitle') or result.get('title'),
+        'company': result.get('company') or result.get('truncatedCompany'),
+        'company_rating': result.get('companyRating') or None,
+        'location': result.get('formattedLocation'),
+        'snippet': html_to_text(result.get('snippet')),
+        'salary': salary.get('text') or None,
+        'job_types': list(result.get('jobTypes') or []),
+        'posted': result.get('formattedRelativeTime'),
+        'url': absolute_url(result.get('link'), base_url),
+        'view_url': absolute_url(result.get('viewJobLink'), base_url),
+        'logo': branding.get('logoUrl'),
+        'sponsored': bool(result.get('sponsored')),
+        'urgent': bool(result.get('urgentlyHiring')),
+        'new': bool(result.get('newJob')),
+    }
+
+
+def extract_mosaic_cards(page_html, base_url=BASE_URL):
+    """
+    All job cards of a SERP from the embedded mosaic JSON
+
+    Returns a list of dicts (see normalize_mosaic_card) or None when the blob is missing
+    """
+    payload = find_mosaic_payload(page_html)
+    if not payload:
+        return None
+    try:
+        results = payload['metaData']['mosaicProviderJobCardsModel']['results']
+    except (KeyError, TypeError):
+        return None
+    cards = [normalize_mosaic_card(r, base_url) for r in results if isinstance(r, dict)]
+    return cards or None
+
+
+def card_text(card):
+    """
+    The card's visible text, lowercased; detect_card_tags checks every tag's words against it
+
+    The snippet classifiers (job type) read the card's snippet field, not this text
+    """
+    return card.get_text(' ', strip=True).lower()
+
+
+def detect_card_tags(card, text=None, tags=CARD_TAGS):
+    """Names of the CARD_TAGS present on a parsed card (pass card_text(card) to reuse it)"""
+    if text is None:
+        text = card_text(card)
+    found = set()
+    for name, spec in tags.items():
+        if any(word in text for word in spec['words']) or card.select_one(spec['css']) is not None:
+            found.add(name)
+    return found
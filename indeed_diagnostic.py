@@ -6,7 +6,7 @@ Opens the page and analyzes what's actually there
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 import time
-from bs4 import BeautifulSoup
+from indeed_html import parse_html, resolve_backend
 import re
 
 def diagnose_indeed_page():
@@ -56,11 +56,12 @@ def diagnose_indeed_page():
         
         # Get page source
         html = driver.page_source
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = parse_html(html)
+        print(f"🧩 HTML parser: {resolve_backend()}")
         
         # Save full HTML
         with open('diagnostic_full_page.html', 'w', encoding='utf-8') as f:
-            f.write(soup.prettify())
+            f.write(soup.prettify() if hasattr(soup, 'prettify') else html)
         print("\n💾 Saved: diagnostic_full_page.html")
         
         # Take screenshot
@@ -98,7 +99,7 @@ def diagnose_indeed_page():
         print("ALL LINKS ANALYSIS")
         print("-"*70)
         
-        all_links = soup.find_all('a', href=True)
+        all_links = soup.select('a[href]')
         print(f"\nTotal links found: {len(all_links)}")
         
         job_related_links = []
@@ -0,0 +1,551 @@
+"""
+Job enrichment helpers shared by the scrapers
+
+Category detection used to rebuild a keyword dict on every call and run one
+substring scan of the whole title + description per keyword, so short keywords
+also hit inside other words ('hr' in "three", 'web' in "website").
+KeywordMatcher indexes every keyword of a category mapping once at import and
+scores all categories in one pass over the text, whatever the number of keywords:
+
+    CATEGORY_MATCHER.classify(title, description)                    # 'IT/Software Development'
+    CATEGORY_MATCHER.classify(title, description, with_scores=True)  # ('IT/...', {'IT/...': 3, ...})
+    CATEGORY_MATCHER.classify_many(jobs)                             # batch over job dicts
+
+Keywords match whole words, plurals included ('developer' matches "developers",
+not "developerish"), and the longest keyword at a position wins ('customer
+service' over 'service'). The best category is the one with most keyword hits; ties
+go to the category listed first, which is the old first-match order.
+
+Those are the hits of one word-bounded regex, a prefix trie of the keywords
+(KeywordMatcher.pattern). Run over the text it tries the trie at every character
+and was most of the enrichment time. scores() gets the same hits from the words
+instead: one bytes.translate/split into word runs, set lookups of single-word
+keywords and their plurals, and find() for the few multi-word keywords whose
+first word is present.
+"""
+
+import hashlib
+import re
+from collections import Counter
+
+
+DEFAULT_CATEGORY = 'General/Other'
+
+JOB_CATEGORIES = {
+    'IT/Software Development': [
+        'software', 'developer', 'programming', 'engineer', 'web', 'mobile',
+        'frontend', 'backend', 'fullstack', 'devops', 'cloud', 'java', 'python',
+        'javascript', 'react', 'angular', 'node', 'php', 'dotnet', '.net',
+        'desarrollo', 'programador', 'desarrollador', 'sistemas', 'typescript',
+        'ruby', 'golang', 'kotlin', 'swift', 'android', 'ios', 'data scientist'
+    ],
+    'Customer Service': [
+        'customer service', 'call center', 'support', 'help desk', 'servicio al cliente',
+        'atención al cliente', 'soporte', 'representante', 'agent', 'cliente',
+        'atención', 'contact center', 'bpo'
+    ],
+    'Sales/Marketing': [
+        'sales', 'marketing', 'ventas', 'comercial', 'business development',
+        'account manager', 'vendedor', 'mercadeo', 'publicidad'
+    ],
+    'Finance/Accounting': [
+        'accountant', 'finance', 'accounting', 'contador', 'contabilidad', 'finanzas',
+        'auditor', 'financial', 'cpa', 'bookkeeper'
+    ],
+    'Human Resources': [
+        'human resources', 'hr', 'recruiter', 'recursos humanos', 'reclutamiento',
+        'recruitment', 'talent', 'talento'
+    ],
+    'Administrative': [
+        'administrative', 'assistant', 'secretary', 'office', 'receptionist',
+        'administrativo', 'asistente', 'secretaria'
+    ],
+    'Management': [
+        'manager', 'director', 'supervisor', 'lead', 'gerente', 'jefe'
+    ]
+}
+
+# Spanish-labelled mapping (WordPress import of the nodriver scraper copy)
+DEFAULT_CATEGORY_ES = 'General/Otro'
+
+JOB_CATEGORIES_ES = {
+    'Desarrollo de TI/Software': JOB_CATEGORIES['IT/Software Development'],
+    'Servicio al cliente': JOB_CATEGORIES['Customer Service'],
+    'Ventas y Marketing': [
+        'sales', 'marketing', 'ventas', 'vendedor', 'comercial', 'digital marketing',
+        'seo', 'sem', 'social media', 'content', 'branding', 'advertising'
+    ],
+    'Recursos Humanos': [
+        'human resources', 'hr', 'rrhh', 'recursos humanos', 'reclutamiento',
+        'recruitment', 'talent', 'payroll', 'nómina', 'benefits'
+    ],
+    'Finanzas y Contabilidad': [
+        'finance', 'accounting', 'finanzas', 'contabilidad', 'contador',
+        'auditor', 'financial', 'bookkeeper', 'tax', 'impuestos'
+    ],
+    'Administración': [
+        'administration', 'administrative', 'administración', 'administrativo',
+        'office', 'oficina', 'secretary', 'secretaria', 'assistant', 'asistente'
+    ],
+    'Educación': [
+        'teacher', 'education', 'educación', 'profesor', 'maestro', 'tutor',
+        'instructor', 'trainer', 'capacitador', 'teaching'
+    ],
+    'Salud': [
+        'health', 'healthcare', 'salud', 'medical', 'médico', 'nurse',
+        'enfermera', 'doctor', 'physician', 'clinical'
+    ],
+    'Ingeniería': [
+        'engineering', 'ingeniería', 'ingeniero', 'engineer', 'mechanical',
+        'civil', 'electrical', 'industrial', 'mecánico', 'eléctrico'
+    ],
+    'Diseño': [
+        'design', 'diseño', 'designer', 'diseñador', 'graphic', 'gráfico',
+        'ux', 'ui', 'creative', 'creativo', 'illustrator', 'photoshop'
+    ],
+}
+
+# The same categories with English labels, in the same order (ties keep the same winner):
+# the copy scraper enriches in English and indeed_localize translates the labels at export
+JOB_CATEGORIES_EN = dict(zip(
+    ('IT/Software Development', 'Customer Service', 'Sales and Marketing', 'Human Resources',
+     'Finance and Accounting', 'Administration', 'Education', 'Health', 'Engineering', 'Design'),
+    JOB_CATEGORIES_ES.values()))
+
+
+# bytes.translate table: ASCII that is not \w -> space (non-ASCII characters are checked per text)
+_ASCII_WORDS = bytes(byte if byte >= 0x80 or chr(byte).isalnum() or byte == 0x5f else 0x20 for byte in range(256))
+_ASCII = bytes(range(0x80))
+PLURALS = ('es', 's', '')       # the keyword regex's (?:e?s)?, in the order it tries them
+
+
+def is_word_char(char):
+    """True if `char` is a word character (what \\w matches)"""
+    return char.isalnum() or char == '_'
+
+
+def word_tokens(text):
+    """re.findall(r"\\w+", text) as UTF-8 bytes, without a regex pass over the text"""
+    data = text.encode('utf-8', 'surrogatepass').translate(_ASCII_WORDS)
+    if not data.isascii():
+        # blank the few distinct non-ASCII characters that are not word characters ('•', '–', '¿')
+        for char in set(data.translate(None, _ASCII).decode('utf-8', 'surrogatepass')):
+            if not char.isalnum():
+                data = data.replace(char.encode('utf-8', 'surrogatepass'), b' ')
+    return data.split()
+
+
+def trie_pattern(keywords):
+    """
+    Regex alternation of `keywords` factored into a prefix trie ('java', 'javascript' -> 'java(?:script)?')
+
+    Python's re tries the alternatives one by one at every position; the trie
+    form rejects a position after a character or two instead of len(keywords) tries
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # greedy: the longest keyword wins, shorter ones are tried on backtracking
+        return f"(?:{pattern})?" if '' in node else pattern
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    All keywords of a {category: [keywords]} mapping, matched as whole words in one pass
+
+    scores() reads the text's words (word_tokens); regex_scores() runs the equivalent trie
+    regex, which is also what a keyword list the word index can't express falls back to
+    """
+
+    def __init__(self, categories, default=DEFAULT_CATEGORY):
+        self.default = default
+        self.order = {category: i for i, category in enumerate(categories)}
+        # a keyword can count for several categories ('engineer')
+        self.keyword_categories = {}
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                owners = self.keyword_categories.setdefault(keyword.lower(), [])
+                if category not in owners:
+                    owners.append(category)
+        self.pattern = re.compile(rf'(?<!\w)({trie_pattern(self.keyword_categories)})(?:e?s)?(?!\w)')
+        self.tokenized = self._index_words()
+
+    def _index_words(self):
+        """
+        Token tables for scores(); False when the keywords need the regex
+
+        forms: token -> the keyword the regex matches on it (keyword, +s, +es; the longest wins).
+        phrases: multi-word (or punctuated) keyword -> [(plural, keywords of the words it covers)],
+        found from its first word (triggers). Two phrases must not be able to overlap, so the
+        first word of one may not start or appear inside another.
+        """
+        words = {keyword for keyword in self.keyword_categories if all(map(is_word_char, keyword))}
+
+        def longest(form):
+            for plural in PLURALS[::-1]:
+                base = form[:len(form) - len(plural)]
+                if form.endswith(plural) and base in words:
+                    return base
+            return None
+
+        self.forms = {}
+        for keyword in words:
+            for plural in PLURALS:
+                self.forms[(keyword + plural).encode('utf-8')] = longest(keyword + plural)
+
+        self.phrases = {}
+        self.triggers = {}
+        firsts, inner = set(), set()
+        for phrase in self.keyword_categories:
+            if phrase in words:
+                continue
+            tokens = word_tokens(phrase)
+            if not tokens or tokens[0] in firsts:
+                return False
+            firsts.add(tokens[0])
+            if len(tokens) > 1:
+                inner.update(tokens[1:])
+                inner.update(tokens[-1] + plural.encode() for plural in PLURALS)
+            self.phrases[phrase] = [(plural, [self.forms[token] for token in word_tokens(phrase + plural)
+                                              if token in self.forms]) for plural in PLURALS]
+            # a one-word phrase ('.net') may carry the plural on its first word
+            for plural in PLURALS:
+                if self.triggers.setdefault(tokens[0] + plural.encode(), phrase) != phrase:
+                    return False
+        if firsts & inner:
+            return False
+        self.lookup = frozenset(self.forms) | frozenset(self.triggers)
+        return True
+
+    def scores(self, text, lowered=False):
+        """{category: keyword hits} in one pass over `text` (`lowered`: already lowercased)"""
+        if not self.tokenized:
+            return self.regex_scores(text, lowered)
+        hits = Counter()
+        if not text:
+            return hits
+        text = text if lowered else text.lower()
+        keyword_categories = self.keyword_categories
+        found = []
+        for token, count in Counter(filter(self.lookup.__contains__, word_tokens(text))).items():
+            keyword = self.forms.get(token)
+            if keyword:
+                for category in keyword_categories[keyword]:
+                    hits[category] += count
+            if token in self.triggers:
+                found.append(self.triggers[token])
+        if found:
+            for phrase in dict.fromkeys(found):
+                self._count_phrase(text, phrase, hits)
+            hits = +hits
+        return hits
+
+    def _count_phrase(self, text, phrase, hits):
+        """Add the word-bounded matches of a phrase, less the single-word hits of the words it covers"""
+        keyword_categories = self.keyword_categories
+        start = text.find(phrase)
+        while start != -1:
+            end = start + len(phrase)
+            resume = start + 1
+            if start == 0 or not is_word_char(text[start - 1]):
+                for plural, covered in self.phrases[phrase]:
+                    stop = end + len(plural)
+                    if text.startswith(plural, end) and (stop == len(text) or not is_word_char(text[stop])):
+                        for category in keyword_categories[phrase]:
+                            hits[category] += 1
+                        for keyword in covered:
+                            for category in keyword_categories[keyword]:
+                                hits[category] -= 1
+                        resume = stop
+                        break
+            start = text.find(phrase, resume)
+
+    def regex_scores(self, text, lowered=False):
+        """scores() from the keyword regex (one trie match attempt per character)"""
+        hits = Counter()
+        if text:
+            keyword_categories = self.keyword_categories
+            for keyword in self.pattern.findall(text if lowered else text.lower()):
+                for category in keyword_categories[keyword]:
+                    hits[category] += 1
+        return hits
+
+    def best(self, hits):
+        """Category with most hits (ties: first listed), or the default"""
+        if not hits:
+            return self.default
+        return min(hits, key=lambda category: (-hits[category], self.order[category]))
+
+    def classify(self, title, description, with_scores=False):
+        """Category of a job (None without title and description), optionally with the scores"""
+        if not title and not description:
+            return (None, {}) if with_scores else None
+        hits = self.scores(f"{title or ''} {description or ''}")
+        category = self.best(hits)
+        return (category, dict(hits)) if with_scores else category
+
+    def classify_many(self, jobs, title_key='_job_title', description_key='_job_description', with_scores=False):
+        """classify() for every job dict, in order"""
+        return [self.classify(job.get(title_key), job.get(description_key), with_scores) for job in jobs]
+
+
+CATEGORY_MATCHER = KeywordMatcher(JOB_CATEGORIES)
+CATEGORY_MATCHER_ES = KeywordMatcher(JOB_CATEGORIES_ES, default=DEFAULT_CATEGORY_ES)
+CATEGORY_MATCHER_EN = KeywordMatcher(JOB_CATEGORIES_EN)
+
+
+def extract_category(title, description):
+    return CATEGORY_MATCHER.classify(title, description)
+
+
+# ============================================================================
+# Description fields: experience, career level, qualification, job type
+# ============================================================================
+
+# (regex, unit_anchored): tried in order, the first that matches anywhere wins. A unit-anchored
+# pattern only has digits, whitespace, '+' and '-' before its 'año'/'year', so it is only
+# tried in the runs of those characters right before each unit instead of over the whole text
+EXPERIENCE_PATTERNS = (
+    (r'(\d+)\+?\s*(años?|years?)\s*(?:de\s*)?(?:experiencia|experience)', True),
+    (r'(?:experiencia|experience)\s*(?:de\s*)?(\d+)\+?\s*(años?|years?)', False),
+    (r'(\d+)\s*-\s*(\d+)\s*(años?|years?)', True),
+)
+EXPERIENCE_UNITS = ('año', 'year')
+
+# Rules of the nodriver scraper. Word lists are substring checks, first group that hits wins
+TEXT_RULES = {
+    'experience_patterns': EXPERIENCE_PATTERNS,
+    # (minimum years, experience, career level)
+    'experience_levels': ((7, '{years}+ years', 'senior'), (3, '{years}+ years', 'mid'),
+                          (1, '{years}+ years', 'junior'), (0, '{years} years', 'entry')),
+    'experience_words': (
+        (('senior', 'sr.', 'lead', 'principal'), ('5+ years', 'senior')),
+        (('junior', 'jr.', 'entry level', 'sin experiencia'), ('0-2 years', 'entry')),
+        (('mid', 'intermediate', 'intermedio'), ('2-5 years', 'mid')),
+    ),
+    'qualification': (
+        (('phd', 'doctorado', 'doctorate', 'ph.d'), 'doctorate'),
+        (('maestría', 'master', 'msc', 'mba', "master's"), 'master'),
+        (('licenciatura', 'bachelor', 'grado', 'university degree', "bachelor's"), 'bachelor'),
+        (('técnico', 'technical', 'associate', 'diploma'), 'associate'),
+        (('secundaria', 'high school', 'bachillerato'), 'high_school'),
+    ),
+    'job_type': (
+        (('tiempo completo', 'full time', 'full-time'), 'full-time'),
+        (('medio tiempo', 'part time', 'part-time'), 'part-time'),
+        (('temporal', 'temporary'), 'temporary'),
+        (('contrato', 'contract'), 'contract'),
+        (('internship', 'pasantía', 'intern'), 'internship'),
+        (('freelance', 'por proyecto'), 'freelance'),
+    ),
+}
+
+# Details_Scraper: a few more words
+TEXT_RULES_DETAILS = dict(
+    TEXT_RULES,
+    experience_words=(
+        (('senior', 'sr.', 'lead', 'principal'), ('5+ years', 'senior')),
+        (('junior', 'jr.', 'entry level', 'entry-level', 'sin experiencia'), ('0-2 years', 'entry')),
+        (('mid', 'intermediate', 'intermedio'), ('2-5 years', 'mid')),
+    ),
+    qualification=(
+        (('phd', 'doctorado', 'doctorate', 'ph.d'), 'doctorate'),
+        (('maestría', 'master', 'msc', 'mba', "master's", 'postgrado'), 'master'),
+        (('licenciatura', 'bachelor', 'grado', 'universitario', 'university degree', "bachelor's"), 'bachelor'),
+        (('técnico', 'technical', 'associate', 'diploma'), 'associate'),
+        (('secundaria', 'high school', 'bachillerato'), 'high_school'),
+    ),
+    job_type=(
+        (('tiempo completo', 'full time', 'full-time'), 'full-time'),
+        (('medio tiempo', 'part time', 'part-time'), 'part-time'),
+        (('temporal', 'temporary'), 'temporary'),
+        (('contrato', 'contract', 'contractor'), 'contract'),
+        (('internship', 'pasantía', 'intern'), 'internship'),
+        (('freelance', 'por proyecto'), 'freelance'),
+    ),
+)
+
+# indeed_full_details_scraper: the original, shorter lists
+TEXT_RULES_BASIC = dict(
+    TEXT_RULES,
+    experience_patterns=EXPERIENCE_PATTERNS[:2],
+    experience_words=(
+        (('senior', 'sr.', 'lead'), ('5+ years', 'senior')),
+        (('junior', 'jr.', 'entry'), ('0-2 years', 'entry')),
+    ),
+    qualification=(
+        (('phd', 'doctorado'), 'doctorate'),
+        (('maestría', 'master', 'mba'), 'master'),
+        (('licenciatura', 'bachelor'), 'bachelor'),
+        (('técnico', 'technical'), 'associate'),
+    ),
+    job_type=(
+        (('tiempo completo', 'full time'), 'full-time'),
+        (('medio tiempo', 'part time'), 'part-time'),
+        (('temporal', 'temporary'), 'temporary'),
+        (('contrato', 'contract'), 'contract'),
+    ),
+)
+
+# Spanish-labelled output (nodriver scraper copy)
+TEXT_RULES_ES = dict(
+    TEXT_RULES,
+    experience_levels=((7, '{years}+ años', 'sénior'), (3, '{years}+ años', 'medio'),
+                       (1, '{years}+ años', 'júnior'), (0, '{years} años', 'entrada')),
+    experience_words=(
+        (('senior', 'sr.', 'lead', 'principal', 'sénior'), ('5+ años', 'sénior')),
+        (('junior', 'jr.', 'entry level', 'sin experiencia', 'júnior'), ('0-2 años', 'júnior')),
+        (('mid', 'intermediate', 'intermedio', 'medio'), ('2-5 años', 'medio')),
+    ),
+    qualification=tuple((words, label) for (words, _), label in zip(
+        TEXT_RULES['qualification'], ('doctorado', 'maestría', 'licenciatura', 'técnico', 'secundaria'))),
+    job_type=tuple((words, label) for (words, _), label in zip(
+        TEXT_RULES['job_type'], ('tiempo completo', 'medio tiempo', 'temporal', 'contrato', 'pasantía', 'freelance'))),
+)
+
+# TEXT_RULES_ES with English labels; indeed_localize.localize_jobs(..., 'es') turns its
+# output into exactly the TEXT_RULES_ES output (benchmark_enrichment.py --verify checks it)
+TEXT_RULES_EN = dict(
+    TEXT_RULES,
+    experience_words=(
+        (('senior', 'sr.', 'lead', 'principal', 'sénior'), ('5+ years', 'senior')),
+        (('junior', 'jr.', 'entry level', 'sin experiencia', 'júnior'), ('0-2 years', 'junior')),
+        (('mid', 'intermediate', 'intermedio', 'medio'), ('2-5 years', 'mid')),
+    ),
+)
+
+
+# Bump when the extraction code changes (rule and keyword tables are hashed in by enricher_version)
+ENRICHMENT_VERSION = 1
+
+
+def enricher_version(rules, matcher=None):
+    """Short digest of ENRICHMENT_VERSION, the rules and the matcher's keywords (see indeed_enrichment_cache)"""
+    keywords = (matcher.keyword_categories, matcher.order, matcher.default) if matcher is not None else None
+    spec = repr((ENRICHMENT_VERSION, rules, keywords))
+    return hashlib.blake2b(spec.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _may_precede_unit(char):
+    return char.isdecimal() or char.isspace() or char in '+-'
+
+
+class TextEnricher:
+    """
+    Every derived field of a description from one normalized copy of the text
+
+        fields = TEXT_ENRICHER.enrich(description, title)
+        # -> {'experience': '3+ years', 'career_level': 'mid', 'qualification': 'bachelor',
+        #     'job_type': 'full-time', 'category': 'IT/Software Development'}
+
+    Same results as the per-field extract_* functions it replaces (tests/test_enrichment.py
+    checks that on the checked-in datasets), but the text is lowercased once, the
+    experience regexes only run next to 'año'/'year' and the category is one matcher pass.
+    Without a title (or matcher) there is no 'category' key.
+
+    The category regex is most of the time per job. The word lists stay plain `in` checks:
+    folding them into one alternation scan is about 3x slower in `re` (benchmark_enrichment.py
+    --profile).
+    """
+
+    def __init__(self, rules=TEXT_RULES, matcher=CATEGORY_MATCHER):
+        self.rules = rules
+        self.matcher = matcher
+        self.version = enricher_version(rules, matcher)
+        self.patterns = [(re.compile(pattern), anchored) for pattern, anchored in rules['experience_patterns']]
+
+    def enrich(self, description, title=None):
+        text = description.lower() if description else ''
+        experience, career_level = self._experience(text) if text else (None, None)
+        fields = {
+            'experience': experience,
+            'career_level': career_level,
+            'qualification': self._first(text, self.rules['qualification']) if text else None,
+            'job_type': self._first(text, self.rules['job_type']) if text else None,
+        }
+        if title is not None and self.matcher is not None:
+            if title or description:
+                fields['category'] = self.matcher.best(self.matcher.scores(f"{title.lower()} {text}", lowered=True))
+            else:
+                fields['category'] = None
+        return fields
+
+    # single fields (each lowercases by itself, like the old extract_* functions)
+    def experience(self, text):
+        return self._experience(text.lower()) if text else (None, None)
+
+    def qualification(self, text):
+        return self._first(text.lower(), self.rules['qualification']) if text else None
+
+    def job_type(self, text):
+        return self._first(text.lower(), self.rules['job_type']) if text else None
+
+    # -------------------------
+    # Rules on lowercased text
+    # -------------------------
+    @staticmethod
+    def _first(text, rules):
+        for words, value in rules:
+            for word in words:
+                if word in text:
+                    return value
+        return None
+
+    def _experience(self, text):
+        units = None
+        for pattern, anchored in self.patterns:
+            if anchored:
+                if units is None:
+                    units = self._unit_positions(text)
+                match = self._search_before_units(pattern, text, units)
+            else:
+                match = pattern.search(text)
+            if match:
+                years = int(match.group(1))
+                for minimum, experience, level in self.rules['experience_levels']:
+                    if years >= minimum:
+                        return experience.format(years=years), level
+        found = self._first(text, self.rules['experience_words'])
+        return found if found else (None, None)
+
+    @staticmethod
+    def _unit_positions(text):
+        positions = []
+        for unit in EXPERIENCE_UNITS:
+            start = text.find(unit)
+            while start != -1:
+                positions.append(start)
+                start = text.find(unit, start + 1)
+        positions.sort()
+        return positions
+
+    @staticmethod
+    def _search_before_units(pattern, text, units):
+        """pattern.search(text) for a unit-anchored pattern: leftmost match starting in the run before a unit"""
+        for unit in units:
+            start = unit
+            while start > 0 and _may_precede_unit(text[start - 1]):
+                start -= 1
+            for position in range(start, unit):
+                match = pattern.match(text, position)
+                if match:
+                    return match
+        return None
+
+
+TEXT_ENRICHER = TextEnricher(TEXT_RULES)
+TEXT_ENRICHER_DETAILS = TextEnricher(TEXT_RULES_DETAILS, matcher=None)
+TEXT_ENRICHER_BASIC = TextEnricher(TEXT_RULES_BASIC)
+TEXT_ENRICHER_ES = TextEnricher(TEXT_RULES_ES, CATEGORY_MATCHER_ES)
+TEXT_ENRICHER_EN = TextEnricher(TEXT_RULES_EN, CATEGORY_MATCHER_EN)
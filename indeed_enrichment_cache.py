@@ -0,0 +1,155 @@
+"""
+Persistent enrichment cache shared across runs
+
+The same postings come back day after day, and every run used to derive their
+category, experience, qualification and job type from scratch. EnrichmentCache
+keeps TextEnricher.enrich() results in a SQLite file (.indeed_enrichment_cache.sqlite),
+keyed by a hash of title + description + the enricher's version:
+
+    cache = EnrichmentCache()
+    derived = cache.enrich_many(TEXT_ENRICHER, [(description, title), ...])   # one lookup for the batch
+    ...
+    cache.report()      # 🗃️ Enrichment cache: 180 hits / 225 lookups (80%), 1210 entries
+    cache.close()
+
+A description without text gets None. The version (indeed_enrichment.enricher_version)
+covers ENRICHMENT_VERSION and the rule/keyword tables. Editing either changes
+every key, so old results are never returned and age out of the LRU bound
+(`maxsize` entries, least recently used dropped first). If the file can't be
+opened, the cache is disabled and everything is enriched directly.
+
+Callers that enrich elsewhere (e.g. in a process pool) use the parts:
+
+    keys = cache.keys(enricher, texts)
+    found = cache.get_many(keys)            # {key: fields} of the hits
+    ...
+    cache.put_many({key: fields, ...})
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+
+CACHE_FILE = '.indeed_enrichment_cache.sqlite'
+
+# SQLite's default limit on host parameters per statement is 999
+_CHUNK = 500
+
+
+def enrichment_key(version, title, description):
+    """128-bit hash of the enricher version, title and description (title None: no category, not '')"""
+    text = '\0'.join((version, '\1' if title is None else title, description or ''))
+    return hashlib.blake2b(text.encode('utf-8', errors='surrogatepass'), digest_size=16).hexdigest()
+
+
+class EnrichmentCache:
+    """On-disk LRU of TextEnricher.enrich() results keyed by enrichment_key"""
+
+    def __init__(self, path=CACHE_FILE, maxsize=50000):
+        self.path = path
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.db = None
+        self._lock = threading.Lock()
+        if path and maxsize > 0:
+            try:
+                self.db = sqlite3.connect(path, check_same_thread=False)
+                self.db.execute('CREATE TABLE IF NOT EXISTS enrichment '
+                                '(key TEXT PRIMARY KEY, fields TEXT NOT NULL, used REAL NOT NULL)')
+                self.db.execute('CREATE INDEX IF NOT EXISTS enrichment_used ON enrichment (used)')
+                self.db.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ Enrichment cache disabled ({path}): {e}")
+                self.db = None
+
+    # -------------------------
+    # Bulk access
+    # -------------------------
+    def keys(self, enricher, texts):
+        """Cache keys of (description, title) pairs for `enricher`"""
+        return [enrichment_key(enricher.version, title, description) for description, title in texts]
+
+    def get_many(self, keys):
+        """{key: fields} of the keys in the cache (their LRU stamp is refreshed)"""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        if self.db is None or not keys:
+            self.misses += len(keys)
+            return found
+        try:
+            with self._lock:
+                for start in range(0, len(keys), _CHUNK):
+                    chunk = keys[start:start + _CHUNK]
+                    rows = self.db.execute(
+                        f"SELECT key, fields FROM enrichment WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+                    found.update((key, json.loads(fields)) for key, fields in rows)
+                if found:
+                    now = time.time()
+                    self.db.executemany('UPDATE enrichment SET used = ? WHERE key = ?', [(now, key) for key in found])
+                    self.db.commit()
+        except sqlite3.Error as e:
+            # e.g. locked by another run: enrich directly this time
+            print(f"⚠️ Enrichment cache lookup failed: {e}")
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, entries):
+        """Store {key: fields}, then drop the least recently used entries beyond maxsize"""
+        if self.db is None or not entries:
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                self.db.executemany('INSERT OR REPLACE INTO enrichment (key, fields, used) VALUES (?, ?, ?)',
+                                    [(key, json.dumps(fields, ensure_ascii=False), now)
+                                     for key, fields in entries.items()])
+                excess = self.size() - self.maxsize
+                if excess > 0:
+                    self.db.execute('DELETE FROM enrichment WHERE key IN '
+                                    '(SELECT key FROM enrichment ORDER BY used LIMIT ?)', (excess,))
+                self.db.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Enrichment cache write failed: {e}")
+
+    def enrich_many(self, enricher, texts):
+        """enricher.enrich(description, title) of every (description, title) pair, from the cache when known"""
+        texts = list(texts)
+        keys = self.keys(enricher, texts)
+        found = self.get_many([key for key, (description, _) in zip(keys, texts) if description])
+        computed = {}
+        for key, (description, title) in zip(keys, texts):
+            if description and key not in found and key not in computed:
+                computed[key] = enricher.enrich(description, title)
+        self.put_many(computed)
+        found.update(computed)
+        return [found[key] if description else None for key, (description, _) in zip(keys, texts)]
+
+    # -------------------------
+    # Housekeeping
+    # -------------------------
+    def size(self):
+        if self.db is None:
+            return 0
+        return self.db.execute('SELECT COUNT(*) FROM enrichment').fetchone()[0]
+
+    def clear(self):
+        if self.db is not None:
+            with self._lock:
+                self.db.execute('DELETE FROM enrichment')
+                self.db.commit()
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    def report(self):
+        lookups = self.hits + self.misses
+        if lookups and self.db is not None:
+            print(f"🗃️ Enrichment cache: {self.hits} hits / {lookups} lookups ({self.hits / lookups:.0%}), "
+                  f"{self.size()} entries")
@@ -1,31 +1,66 @@
 """
 Indeed Costa Rica Complete Job Scraper - FIXED VERSION
 With improved error handling for GitHub Actions
+
+Derived fields (category, experience, qualification, job type) are kept in
+.indeed_enrichment_cache.sqlite, shared with the nodriver scraper's entries of the
+same enricher version; delete the file to enrich everything again. It only helps
+where the file outlives the run: the scheduled workflow (indeed_scraper.yml)
+restores it, with .indeed_selector_stats.json, from the Actions cache of the branch.
 """
 
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.common.keys import Keys
 import json
 import csv
-import time
-import random
 import re
 import warnings
 import sys
 import os
 from datetime import datetime, timedelta
 
+from indeed_cards import CARD_TAGS, extract_mosaic_cards
+from indeed_enrichment import CATEGORY_MATCHER, TEXT_ENRICHER_BASIC
+from indeed_enrichment_cache import CACHE_FILE as ENRICHMENT_CACHE_FILE, EnrichmentCache
+from indeed_lazy_load import LazyLoader
+from indeed_network import SeleniumDocumentCapture
+from indeed_pacing import Pacer
+from indeed_page_scripts import arm_pane_wait, card_field, extract_cards, wait_for_pane
+from indeed_resource_blocker import ResourceBlocker
+from indeed_selectors import SelectorCascade
+
 
 
 default_deadline = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
+# Card fields read in-page by extract_cards (selectors tried in order)
+CARD_FIELDS = {
+    'title': card_field('h2.jobTitle a span', 'h2.jobTitle span', 'a.jcs-JobTitle span', 'span[id*="jobTitle"]', 'h2 span[title]'),
+    'apply_url': card_field('h2.jobTitle a, a.jcs-JobTitle', attr='href'),
+    'location': card_field('div[data-testid="text-location"]', 'div.companyLocation', 'span.companyLocation'),
+    'salary': card_field('div.salary-snippet-container, div.attribute_snippet'),
+    'snippet': card_field('div.job-snippet, ul.job-snippet, div[class*="snippet"]'),
+}
+PANE_DESCRIPTION_SELECTOR = "#jobDescriptionText, .jobsearch-JobComponent-description"
+# Job card selectors for the results page (tried best-first, see indeed_selectors)
+LISTING_SELECTORS = (
+    'div.job_seen_beacon',
+    'div.cardOutline',
+    'li.css-5lfssm',
+    'div[data-jk]',
+    'td.resultContent',
+    'div.slider_container div.slider_item',
+    'ul.jobsearch-ResultsList li',
+    'div[class*="job_seen"]',
+    'div[class*="result"]',
+)
+
 class IndeedFullDetailsScraper:
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, block_resources=True, enrichment_cache_file=ENRICHMENT_CACHE_FILE):
         """Initialize Selenium driver"""
         options = uc.ChromeOptions()
         
@@ -50,7 +85,24 @@ class IndeedFullDetailsScraper:
         
         print("🚀 Initializing Chrome driver...")
         try:
-            self.driver = uc.Chrome(options=options, version_main=None)
+            # CDP events feed the document capture (and the blocker's counts)
+            self.driver = uc.Chrome(options=options, version_main=None, enable_cdp_events=True)
+            # drop images/fonts/media/trackers - we only read DOM text
+            self.blocker = ResourceBlocker(enabled=block_resources)
+            self.blocker.attach_selenium(self.driver)
+            # the SERP's server response; pages whose mosaic JSON parses skip the scroll wait
+            self.capture = SeleniumDocumentCapture(self.driver)
+            if not self.capture.attach():
+                print("⚠️ Network capture unavailable, pages will be rendered")
+            self.raw_pages = 0
+            self.pacer = Pacer(initial_rate=0.5)
+            self.listing_cascade = SelectorCascade('selenium.full_details.cards', LISTING_SELECTORS)
+            # replaces the 3-5s render sleep + 2s scroll sleep
+            self.lazy_loader = LazyLoader(baseline=6.0, selector=', '.join(LISTING_SELECTORS))
+            self.listing_url = None
+            # derived fields of postings seen in earlier runs (enrich_details)
+            self.enrichment_cache = EnrichmentCache(enrichment_cache_file)
+            self.unenriched = []
             self.driver.set_page_load_timeout(30)
             self.wait = WebDriverWait(self.driver, 15)
             print("✅ Driver ready!\n")
@@ -60,49 +112,8 @@ class IndeedFullDetailsScraper:
     
     def extract_category(self, title, description):
         """Extract job category from title and description keywords"""
-        if not title and not description:
-            return None
-        
-        text = f"{title or ''} {description or ''}".lower()
-        
-        categories = {
-            'IT/Software Development': [
-                'software', 'developer', 'programming', 'engineer', 'web', 'mobile',
-                'frontend', 'backend', 'fullstack', 'devops', 'cloud', 'java', 'python',
-                'javascript', 'react', 'angular', 'node', 'php', 'dotnet', '.net',
-                'desarrollo', 'programador', 'desarrollador', 'sistemas', 'typescript'
-            ],
-            'Customer Service': [
-                'customer service', 'call center', 'support', 'help desk', 'servicio al cliente',
-                'atención al cliente', 'soporte', 'representante', 'agent', 'cliente'
-            ],
-            'Sales/Marketing': [
-                'sales', 'marketing', 'ventas', 'comercial', 'business development',
-                'account manager', 'vendedor', 'mercadeo', 'publicidad'
-            ],
-            'Finance/Accounting': [
-                'accountant', 'finance', 'accounting', 'contador', 'contabilidad', 'finanzas',
-                'auditor', 'financial', 'cpa', 'bookkeeper'
-            ],
-            'Human Resources': [
-                'human resources', 'hr', 'recruiter', 'recursos humanos', 'reclutamiento',
-                'recruitment', 'talent', 'talento'
-            ],
-            'Administrative': [
-                'administrative', 'assistant', 'secretary', 'office', 'receptionist',
-                'administrativo', 'asistente', 'secretaria'
-            ],
-            'Management': [
-                'manager', 'director', 'supervisor', 'lead', 'gerente', 'jefe'
-            ]
-        }
-        
-        for category, keywords in categories.items():
-            for keyword in keywords:
-                if keyword in text:
-                    return category
-        
-        return 'General/Other'
+        # one pass of the keyword regex compiled at import (see indeed_enrichment)
+        return CATEGORY_MATCHER.classify(title, description)
     
     def parse_date(self, date_str):
         """Parse Indeed date formats"""
@@ -154,81 +165,26 @@ class IndeedFullDetailsScraper:
     
     def extract_experience_from_text(self, text):
         """Extract experience requirements"""
-        if not text:
-            return None, None
-        
-        text_lower = text.lower()
-        
-        exp_patterns = [
-            r'(\d+)\+?\s*(años?|years?)\s*(?:de\s*)?(?:experiencia|experience)',
-            r'(?:experiencia|experience)\s*(?:de\s*)?(\d+)\+?\s*(años?|years?)'
-        ]
-        
-        for pattern in exp_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                years = int(match.group(1))
-                if years >= 7:
-                    return f"{years}+ years", 'senior'
-                elif years >= 3:
-                    return f"{years}+ years", 'mid'
-                elif years >= 1:
-                    return f"{years}+ years", 'junior'
-                else:
-                    return f"{years} years", 'entry'
-        
-        if any(word in text_lower for word in ['senior', 'sr.', 'lead']):
-            return '5+ years', 'senior'
-        elif any(word in text_lower for word in ['junior', 'jr.', 'entry']):
-            return '0-2 years', 'entry'
-        
-        return None, None
+        return TEXT_ENRICHER_BASIC.experience(text)
     
     def extract_qualification(self, text):
         """Extract education qualification"""
-        if not text:
-            return None
-        
-        text_lower = text.lower()
-        
-        if any(word in text_lower for word in ['phd', 'doctorado']):
-            return 'doctorate'
-        elif any(word in text_lower for word in ['maestría', 'master', 'mba']):
-            return 'master'
-        elif any(word in text_lower for word in ['licenciatura', 'bachelor']):
-            return 'bachelor'
-        elif any(word in text_lower for word in ['técnico', 'technical']):
-            return 'associate'
-        
-        return None
+        return TEXT_ENRICHER_BASIC.qualification(text)
     
     def extract_job_type(self, text):
         """Extract job type"""
-        if not text:
-            return None
-        
-        text_lower = text.lower()
-        
-        if 'tiempo completo' in text_lower or 'full time' in text_lower:
-            return 'full-time'
-        elif 'medio tiempo' in text_lower or 'part time' in text_lower:
-            return 'part-time'
-        elif 'temporal' in text_lower or 'temporary' in text_lower:
-            return 'temporary'
-        elif 'contrato' in text_lower or 'contract' in text_lower:
-            return 'contract'
-        
-        return None
+        return TEXT_ENRICHER_BASIC.job_type(text)
     
-    def click_job_and_extract_details(self, job_element, job_data):
+    def click_job_and_extract_details(self, job_element, job_data, jk=None):
         """Click job and extract full details"""
         try:
+            # Wait for the pane to show this job's description (not the previous one)
+            host = self.listing_url
+            self.pacer.wait(host)
+            arm_pane_wait(self.driver, PANE_DESCRIPTION_SELECTOR)
             job_element.click()
-            time.sleep(random.uniform(2, 3))
-            
-            # Wait for details to load
             try:
-                self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#jobDescriptionText, .jobsearch-JobComponent-description")))
+                self.pacer.record(host, wait_for_pane(self.driver, PANE_DESCRIPTION_SELECTOR, jk, timeout=15), 'pane timeout')
             except:
                 pass
             
@@ -247,25 +203,8 @@ class IndeedFullDetailsScraper:
                     full_description = desc_elem.text.strip()
                     if full_description:
                         job_data['_job_description'] = full_description
-                        
-                        category = self.extract_category(job_data['_job_title'], full_description)
-                        if category:
-                            job_data['_job_category'] = category
-                        
-                        exp, career_level = self.extract_experience_from_text(full_description)
-                        if exp:
-                            job_data['_job_experience'] = exp
-                        if career_level:
-                            job_data['_job_career_level'] = career_level
-                        
-                        qualification = self.extract_qualification(full_description)
-                        if qualification:
-                            job_data['_job_qualification'] = qualification
-                        
-                        if not job_data['_job_type']:
-                            job_type = self.extract_job_type(full_description)
-                            if job_type:
-                                job_data['_job_type'] = job_type
+                        # category, experience, qualification and type: enrich_details, once per run
+                        self.unenriched.append(job_data)
                         break
                 except:
                     continue
@@ -313,9 +252,33 @@ class IndeedFullDetailsScraper:
             # Don't print errors for individual job detail extraction
             pass
     
-    def extract_job_from_card(self, card):
-        """Extract job data from card"""
-        job_data = {
+    def enrich_details(self):
+        """Derived fields of the full descriptions read this run, in one enrichment cache batch"""
+        jobs, self.unenriched = self.unenriched, []
+        texts = [(job['_job_description'], job['_job_title']) for job in jobs]
+        for job_data, derived in zip(jobs, self.enrichment_cache.enrich_many(TEXT_ENRICHER_BASIC, texts)):
+            if derived['category']:
+                job_data['_job_category'] = derived['category']
+            if derived['experience']:
+                job_data['_job_experience'] = derived['experience']
+            if derived['career_level']:
+                job_data['_job_career_level'] = derived['career_level']
+            if derived['qualification']:
+                job_data['_job_qualification'] = derived['qualification']
+            if derived['job_type'] and not job_data['_job_type']:
+                job_data['_job_type'] = derived['job_type']
+
+    def finish_jobs(self, jobs):
+        """Enrich the scraped jobs; the ones still without a category get one from title + description"""
+        self.enrich_details()
+        for job_data in jobs:
+            if not job_data['_job_category']:
+                job_data['_job_category'] = self.extract_category(job_data['_job_title'], job_data['_job_description'])
+        return jobs
+    
+    def new_job_data(self):
+        """Empty job record"""
+        return {
             '_job_featured_image': None,
             '_job_title': None,
             '_job_featured': 0,
@@ -343,90 +306,123 @@ class IndeedFullDetailsScraper:
             '_job_location': None,
             '_job_map_location': None
         }
+    
+    def extract_job_from_card(self, card):
+        """Build job data from one entry returned by extract_cards (see CARD_FIELDS)"""
+        job_data = self.new_job_data()
+        values = card['values']
+        
+        # Title / URL
+        job_data['_job_title'] = values['title']
+        job_data['_job_apply_url'] = values['apply_url']
+        
+        # Location
+        if values['location']:
+            job_data['_job_location'] = values['location']
+            job_data['_job_address'] = values['location']
+            job_data['_job_map_location'] = values['location']
+        
+        # Salary
+        if values['salary']:
+            salary_info = self.extract_salary(values['salary'])
+            job_data.update(salary_info)
+        
+        # Snippet
+        if values['snippet']:
+            job_data['_job_description'] = values['snippet']
+            job_type = self.extract_job_type(values['snippet'])
+            if job_type:
+                job_data['_job_type'] = job_type
+        
+        # Check tags (label nodes or the card's text, see indeed_cards.CARD_TAGS)
+        tags = card['tags']
+        
+        if 'sponsored' in tags:
+            job_data['_job_featured'] = 1
+            job_data['_job_tag'].append('sponsored')
+        
+        if 'urgent' in tags:
+            job_data['_job_urgent'] = 1
+            job_data['_job_tag'].append('urgent')
         
-        try:
-            # Title - UPDATED SELECTORS
-            title_selectors = [
-                'h2.jobTitle a span',
-                'h2.jobTitle span',
-                'a.jcs-JobTitle span',
-                'span[id*="jobTitle"]',
-                'h2 span[title]'
-            ]
-            
-            for selector in title_selectors:
-                try:
-                    title_elem = card.find_element(By.CSS_SELECTOR, selector)
-                    job_data['_job_title'] = title_elem.text.strip()
-                    if job_data['_job_title']:
-                        break
-                except:
-                    continue
-            
-            # URL
-            try:
-                link = card.find_element(By.CSS_SELECTOR, 'h2.jobTitle a, a.jcs-JobTitle')
-                job_data['_job_apply_url'] = link.get_attribute('href')
-            except:
-                pass
-            
-            # Location
-            location_selectors = [
-                'div[data-testid="text-location"]',
-                'div.companyLocation',
-                'span.companyLocation'
-            ]
-            
-            for selector in location_selectors:
-                try:
-                    location_elem = card.find_element(By.CSS_SELECTOR, selector)
-                    location_text = location_elem.text.strip()
-                    if location_text:
-                        job_data['_job_location'] = location_text
-                        job_data['_job_address'] = location_text
-                        job_data['_job_map_location'] = location_text
-                        break
-                except:
-                    continue
-            
-            # Salary
-            try:
-                salary_elem = card.find_element(By.CSS_SELECTOR, 'div.salary-snippet-container, div.attribute_snippet')
-                salary_text = salary_elem.text.strip()
-                if salary_text:
-                    salary_info = self.extract_salary(salary_text)
-                    job_data.update(salary_info)
-            except:
-                pass
-            
-            # Snippet
-            try:
-                snippet_elem = card.find_element(By.CSS_SELECTOR, 'div.job-snippet, ul.job-snippet, div[class*="snippet"]')
-                snippet_text = snippet_elem.text.strip()
-                if snippet_text:
-                    job_data['_job_description'] = snippet_text
-                    job_type = self.extract_job_type(snippet_text)
-                    if job_type:
-                        job_data['_job_type'] = job_type
-            except:
-                pass
-            
-            # Check tags
-            card_html = card.get_attribute('innerHTML').lower()
+        return job_data
+    
+    def extract_job_from_mosaic_card(self, card):
+        """Build job data from a normalized mosaic card (see indeed_cards.extract_mosaic_cards)"""
+        job_data = self.new_job_data()
+        job_data['_job_title'] = card['title']
+        job_data['_job_apply_url'] = card['url']
+        
+        if card['location']:
+            job_data['_job_location'] = card['location']
+            job_data['_job_address'] = card['location']
+            job_data['_job_map_location'] = card['location']
+        
+        if card['salary']:
+            job_data.update(self.extract_salary(card['salary']))
+        
+        if card['snippet']:
+            job_data['_job_description'] = card['snippet']
+            job_type = self.extract_job_type(card['snippet'])
+            if job_type:
+                job_data['_job_type'] = job_type
+        
+        if card['sponsored']:
+            job_data['_job_featured'] = 1
+            job_data['_job_tag'].append('sponsored')
+        
+        if card['urgent']:
+            job_data['_job_urgent'] = 1
+            job_data['_job_tag'].append('urgent')
+        
+        return job_data
+    
+    def load_listing(self, url, attempts=2):
+        """
+        Open a SERP (paced): (mosaic cards or None, job card elements); no cards backs off and retries
+
+        The mosaic cards come from the server response. When they parse, the card
+        elements (only needed to click for details) are looked up without scrolling.
+        """
+        self.listing_url = url
+        for attempt in range(attempts):
+            self.pacer.wait(url)
+            self.capture.arm()
+            self.driver.get(url)
+            mosaic = extract_mosaic_cards(self.capture.wait())
             
-            if 'patrocinado' in card_html or 'sponsored' in card_html:
-                job_data['_job_featured'] = 1
-                job_data['_job_tag'].append('sponsored')
+            # Scroll until the card count stops changing, unless the response already had every card
+            if not mosaic:
+                self.lazy_loader.selenium(self.driver)
             
-            if 'urge' in card_html or 'urgently' in card_html:
-                job_data['_job_urgent'] = 1
-                job_data['_job_tag'].append('urgent')
+            # last page's winning selector first
+            _, cards = self.listing_cascade.find(lambda css: self.driver.find_elements(By.CSS_SELECTOR, css))
+            if mosaic or cards:
+                if mosaic:
+                    self.raw_pages += 1
+                    print(f"  ✅ Found {len(mosaic)} jobs (mosaic JSON, server response)\n")
+                else:
+                    print(f"  ✅ Found {len(cards)} jobs\n")
+                self.pacer.success(url)
+                return mosaic, cards or []
             
-        except Exception as e:
-            # Don't print errors for individual cards
-            pass
-        
-        return job_data
+            self.pacer.failure(url, 'no cards')
+        return None, []
+    
+    def listing_jobs(self, mosaic, job_cards, extract_full_details):
+        """(job_data, jk, card element or None) for every card of the loaded SERP"""
+        if mosaic:
+            elements = {}
+            if extract_full_details and job_cards:
+                # job key -> element, for the detail clicks
+                cards_info = extract_cards(self.driver, job_cards, {})
+                elements = {info['jk']: card for card, info in zip(job_cards, cards_info) if info['jk']}
+            return [(self.extract_job_from_mosaic_card(card), card['job_key'], elements.get(card['job_key']))
+                    for card in mosaic]
+        
+        # Read every card's fields in one round trip
+        cards_info = extract_cards(self.driver, job_cards, CARD_FIELDS, CARD_TAGS)
+        return [(self.extract_job_from_card(info), info['jk'], card) for card, info in zip(job_cards, cards_info)]
     
     def scrape_jobs(self, search_url, max_pages=5, max_jobs=None, extract_full_details=True):
         """Main scraping function"""
@@ -445,66 +441,35 @@ class IndeedFullDetailsScraper:
             print(f"📄 Page {page + 1}/{max_pages}")
             
             try:
-                self.driver.get(url)
-                time.sleep(random.uniform(3, 5))
+                mosaic, job_cards = self.load_listing(url)
                 
-                # Scroll to load
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-                time.sleep(2)
-                
-                # UPDATED JOB CARD SELECTORS
-                job_cards = None
-                selectors = [
-                    'div.job_seen_beacon',
-                    'div.cardOutline',
-                    'li.css-5lfssm',
-                    'div[data-jk]',
-                    'td.resultContent',
-                    'div.slider_container div.slider_item',
-                    'ul.jobsearch-ResultsList li',
-                    'div[class*="job_seen"]',
-                    'div[class*="result"]'
-                ]
-                
-                for selector in selectors:
-                    try:
-                        cards = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        if cards and len(cards) > 0:
-                            job_cards = cards
-                            print(f"  ✅ Found {len(cards)} jobs\n")
-                            break
-                    except:
-                        continue
-                
-                if not job_cards:
+                if not mosaic and not job_cards:
                     print("  ⚠️ No job cards found")
                     break
                 
+                try:
+                    listing = self.listing_jobs(mosaic, job_cards, extract_full_details)
+                except Exception as e:
+                    print(f"  ⚠️ Card extraction failed: {e}")
+                    break
+                
                 # Process jobs
-                for idx, card in enumerate(job_cards, 1):
+                for idx, (job_data, jk, card) in enumerate(listing, 1):
                     try:
-                        job_data = self.extract_job_from_card(card)
-                        
                         if not job_data['_job_title']:
                             continue
                         
                         title_display = job_data['_job_title'][:50]
                         print(f"  {idx:2d}. {title_display:50s}")
                         
-                        if extract_full_details:
-                            self.click_job_and_extract_details(card, job_data)
-                        
-                        if not job_data['_job_category']:
-                            category = self.extract_category(job_data['_job_title'], job_data['_job_description'])
-                            job_data['_job_category'] = category
+                        if extract_full_details and card is not None:
+                            self.click_job_and_extract_details(card, job_data, jk)
                         
                         all_jobs.append(job_data)
                         
                         if max_jobs and len(all_jobs) >= max_jobs:
                             print(f"\n✅ Reached max jobs limit ({max_jobs})")
-                            return all_jobs
-                        
-                        time.sleep(random.uniform(0.5, 1.5))
+                            return self.finish_jobs(all_jobs)
                         
                     except Exception as e:
                         continue
@@ -512,19 +477,30 @@ class IndeedFullDetailsScraper:
                 print()
                 
                 if page < max_pages - 1:
-                    delay = random.uniform(4, 7)
-                    print(f"  ⏳ Waiting {delay:.1f}s before next page...\n")
-                    time.sleep(delay)
+                    print(f"  ⏳ Pacing at {self.pacer.current_rate(url):.2f} req/s\n")
                 
             except Exception as e:
                 print(f"  ⚠️ Page error: {e}")
                 break
         
-        return all_jobs
+        return self.finish_jobs(all_jobs)
     
     def close(self):
         """Close browser safely"""
         print("\n🔒 Closing browser...")
+        if hasattr(self, 'blocker'):
+            self.blocker.report()
+        if hasattr(self, 'pacer'):
+            self.pacer.report()
+        if hasattr(self, 'listing_cascade'):
+            self.listing_cascade.report()
+        if hasattr(self, 'lazy_loader'):
+            self.lazy_loader.report()
+        if getattr(self, 'raw_pages', 0):
+            print(f"📡 {self.raw_pages} pages parsed straight from the server response (no render wait)")
+        if hasattr(self, 'enrichment_cache'):
+            self.enrichment_cache.report()
+            self.enrichment_cache.close()
         try:
             if hasattr(self, 'driver'):
                 self.driver.quit()
@@ -0,0 +1,259 @@
+"""
+HTML parser backends shared by the card and detail extractors
+
+    doc = parse_html(html)                  # backend from INDEED_HTML_PARSER or DEFAULT_BACKEND
+    doc = parse_html(html, 'selectolax')
+    for card in doc.select('div.job_seen_beacon'):
+        title = card.select_one('h2.jobTitle')
+        ...
+
+Backends:
+- 'html.parser' / 'lxml': BeautifulSoup documents (returned as-is)
+- 'selectolax':           lexbor (C) parser wrapped in FastNode (default when installed), which exposes the
+                          subset of the BeautifulSoup API the extractors use:
+                          select, select_one, get_text, get, has_attr, [attr], name, str()
+
+Extractors only use that subset (CSS selectors, no find/find_all), so every
+backend yields the same output. Run `python benchmark_parsers.py` to time the
+backends on the checked-in HTML and check they agree.
+
+Targeted parsing: a SERP is ~900 KB, but the cards only live in the job results
+container and a viewjob page's fields in the job component (header + description).
+parse_region() slices that element out of the raw HTML (balanced tags, skipping
+scripts and comments) and only builds a tree for it:
+
+    doc = parse_region(html, SERP_REGION)       # or VIEWJOB_REGION
+
+When no marker is found, the tags don't balance, or the slice lacks the region's
+`required` selector, it falls back to parse_html() of the whole document.
+"""
+
+import importlib.util
+import os
+import re
+
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+# only probed: BeautifulSoup imports lxml itself when asked for it
+LXML_AVAILABLE = importlib.util.find_spec('lxml') is not None
+
+
+BACKENDS = ('html.parser', 'lxml', 'selectolax')
+# fastest installed backend (benchmark_parsers.py checks they agree on the checked-in SERP)
+DEFAULT_BACKEND = 'selectolax' if SELECTOLAX_AVAILABLE else 'lxml' if LXML_AVAILABLE else 'html.parser'
+
+# Attributes BeautifulSoup returns as a list of tokens
+MULTI_VALUED_ATTRIBUTES = ('class', 'rel', 'rev', 'accept-charset', 'headers', 'accesskey')
+
+# get_text() skips the contents of these tags (like BeautifulSoup)
+NON_TEXT_TAGS = ('script', 'style', 'template', '-comment')
+
+# Regions for parse_region: opening-tag markers tried in order, and a selector the slice must contain
+SERP_REGION = {
+    'markers': (r'id="mosaic-jobResults"', r'id="mosaic-provider-jobcards"'),
+    'required': 'div.job_seen_beacon, div[data-jk], td.resultContent, a.tapItem, li.css-5lfssm',
+}
+VIEWJOB_REGION = {
+    'markers': (r'id="jobsearch-ViewjobPaneWrapper"',
+                r'class="(?:[^"]*\s)?jobsearch-ViewJobLayout-jobDisplay[\s"]',
+                r'class="(?:[^"]*\s)?jobsearch-JobComponent[\s"]'),
+    'required': '#jobDescriptionText, .jobsearch-JobComponent-description, .jobsearch-jobDescriptionText',
+}
+
+# Raw markup the tag balancer must step over
+_SKIP_RE = re.compile(r'<!--.*?-->|<script\b.*?</script\s*>|<style\b.*?</style\s*>', re.S | re.I)
+_TAG_NAME_RE = re.compile(r'<([a-zA-Z][a-zA-Z0-9]*)')
+
+
+def available_backends():
+    return [b for b in BACKENDS
+            if b == 'html.parser' or (b == 'lxml' and LXML_AVAILABLE) or (b == 'selectolax' and SELECTOLAX_AVAILABLE)]
+
+
+def resolve_backend(backend=None):
+    """Requested backend, else INDEED_HTML_PARSER, else DEFAULT_BACKEND (falls back if not installed)"""
+    backend = backend or os.getenv('INDEED_HTML_PARSER') or DEFAULT_BACKEND
+    if backend not in available_backends():
+        backend = DEFAULT_BACKEND
+    return backend
+
+
+def parse_html(html, backend=None):
+    """Parse a document (str or bytes) with the selected backend"""
+    backend = resolve_backend(backend)
+    if backend == 'selectolax':
+        if isinstance(html, bytes):
+            html = html.decode('utf-8', errors='replace')
+        return FastNode(LexborHTMLParser(html).root)
+    return BeautifulSoup(html, backend)
+
+
+def slice_region(html, markers):
+    """
+    Outer HTML of the first element whose opening tag matches one of `markers`, or None
+
+    Counts opening/closing tags of the element's name from its start until they balance
+    """
+    for marker in markers:
+        match = re.search(marker, html)
+        if not match:
+            continue
+        start = html.rfind('<', 0, match.start())
+        tag = _TAG_NAME_RE.match(html, start) if start >= 0 else None
+        if not tag:
+            continue
+        name = tag.group(1).lower()
+        tag_re = re.compile(rf'<!--.*?-->|<script\b.*?</script\s*>|<style\b.*?</style\s*>|<(/?){name}\b[^>]*?(/?)>',
+                            re.S | re.I) if name not in ('script', 'style') else _SKIP_RE
+        depth = 0
+        for m in tag_re.finditer(html, start):
+            if m.lastindex is None:
+                continue                        # comment / script / style
+            closing, self_closing = m.group(1), m.group(2)
+            if self_closing:
+                continue
+            depth += -1 if closing else 1
+            if depth == 0:
+                return html[start:m.end()]
+    return None
+
+
+def parse_region(html, region, backend=None):
+    """Tree of just the region (SERP_REGION / VIEWJOB_REGION), or of the whole document as fallback"""
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', errors='replace')
+    fragment = slice_region(html, region['markers'])
+    if fragment:
+        doc = parse_html(fragment, backend)
+        if doc.select_one(region['required']) is not None:
+            return doc
+    return parse_html(html, backend)
+
+
+def parse_fragment(html):
+    """
+    Root element of an HTML fragment (e.g. a WebElement's outerHTML)
+
+    Always html.parser: lxml and lexbor build a full document around the fragment and
+    drop table cells (td.resultContent cards) that aren't inside a table
+    """
+    return BeautifulSoup(html, 'html.parser').select_one('*')
+
+
+def node_field(*selectors, attr=None, sep=''):
+    """
+    Field spec for read_fields (and the in-page extractor in indeed_page_scripts):
+    the first element matching one of `selectors`, its get_text(sep, strip=True) or `attr` value
+    """
+    return {'css': list(selectors), 'attr': attr, 'sep': sep}
+
+
+def read_fields(node, fields):
+    """{name: value} of node_field specs; None when no selector matches"""
+    values = {}
+    for name, spec in fields.items():
+        element = None
+        for css in spec['css']:
+            element = node.select_one(css)
+            if element is not None:
+                break
+        if element is None:
+            values[name] = None
+        elif spec['attr']:
+            values[name] = element.get(spec['attr'])
+        else:
+            values[name] = element.get_text(spec['sep'], strip=True)
+    return values
+
+
+def select_by_class_pattern(node, tag, pattern, first=False):
+    """
+    Elements `tag` with a class token matching regex `pattern` (find_all(tag, class_=re.compile(...)))
+
+    CSS can't express a regex on a single class token, so candidates are filtered here
+    """
+    regex = re.compile(pattern)
+    matches = []
+    for element in node.select(f'{tag}[class]'):
+        if any(regex.search(token) for token in element.get('class') or ()):
+            if first:
+                return element
+            matches.append(element)
+    return None if first else matches
+
+
+class FastNode:
+    """selectolax node with the BeautifulSoup-style API used by the extractors"""
+
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+    @property
+    def name(self):
+        return self.node.tag
+
+    def select(self, css):
+        return [FastNode(n) for n in self.node.css(css)]
+
+    def select_one(self, css):
+        found = self.node.css_first(css)
+        return FastNode(found) if found is not None else None
+
+    def has_attr(self, attr):
+        return attr in self.node.attributes
+
+    def get(self, attr, default=None):
+        attributes = self.node.attributes
+        if attr not in attributes:
+            return default
+        value = attributes[attr] or ''
+        if attr in MULTI_VALUED_ATTRIBUTES:
+            return value.split()
+        return value
+
+    def __getitem__(self, attr):
+        if attr not in self.node.attributes:
+            raise KeyError(attr)
+        return self.get(attr)
+
+    def strings(self, strip=False):
+        """Text nodes in document order, skipping script/style/comments (BeautifulSoup._all_strings)"""
+        stack = [self.node.iter(include_text=True)]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                continue
+            tag = child.tag
+            if tag == '-text':
+                text = child.text_content or ''
+                if strip:
+                    text = text.strip()
+                    if not text:
+                        continue
+                yield text
+            elif tag not in NON_TEXT_TAGS:
+                stack.append(child.iter(include_text=True))
+
+    def get_text(self, separator='', strip=False):
+        return separator.join(self.strings(strip))
+
+    def __str__(self):
+        return self.node.html
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        return isinstance(other, FastNode) and self.node == other.node
+
+    def __hash__(self):
+        return hash(self.node.mem_id)
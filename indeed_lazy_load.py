@@ -0,0 +1,149 @@
+"""
+Scroll-until-stable loading of lazy SERP content
+
+The listing pages used to be scrolled with fixed sleeps (render wait, scroll to
+the middle, sleep again), which costs the same on a page that was complete at
+first paint. LazyLoader scrolls to the bottom in the page and watches the card
+count with a MutationObserver; it returns as soon as the count has not changed
+for `stable` seconds (at least one card), after `empty` seconds with the document
+loaded and still no card (blocked, captcha or no results), or after `cap` seconds:
+
+    loader = LazyLoader(baseline=4.0)          # the fixed waits it replaces, in seconds
+    result = loader.selenium(driver)           # or loader.playwright(page) / await loader.nodriver(tab)
+    # -> {'count': 15, 'elapsed': 0.9, 'stable': True, 'empty': False}
+    ...
+    loader.report()     # ⏬ Lazy load: 5 pages, 0.9s avg wait, 15.5s saved vs fixed sleeps, 1 without cards
+
+If the script can't run, the loader sleeps `baseline` like the old code did and
+returns None.
+"""
+
+import asyncio
+import json
+import time
+
+
+# Card markup of every SERP layout the scrapers know (see the card selector cascades)
+CARD_SELECTOR = 'div.job_seen_beacon, div[data-jk], td.resultContent, li.css-5lfssm, li[data-jk]'
+
+# (selector, stableMs, capMs, emptyMs) => Promise<{count, elapsed (ms), stable, empty}>
+LOAD_UNTIL_STABLE_FN = """(selector, stableMs, capMs, emptyMs) => new Promise(resolve => {
+    const start = performance.now();
+    const count = () => document.querySelectorAll(selector).length;
+    const bottom = () => window.scrollTo(0, document.body ? document.body.scrollHeight : 0);
+    let last = count(), lastChange = start, finished = false, observer = null, timer = null;
+    const finish = (stable, empty) => {
+        if (finished) return;
+        finished = true;
+        if (observer) observer.disconnect();
+        clearInterval(timer);
+        resolve({count: count(), elapsed: performance.now() - start, stable: stable, empty: empty});
+    };
+    const check = () => {
+        const current = count(), now = performance.now();
+        if (current !== last) {
+            // more cards rendered: keep scrolling so the next batch is requested
+            last = current;
+            lastChange = now;
+            bottom();
+        }
+        if (now - start >= capMs) finish(false, last === 0);
+        else if (last > 0 && now - lastChange >= stableMs) finish(true, false);
+        // loaded without a single card: nothing is coming, don't sit out the cap
+        else if (last === 0 && document.readyState === 'complete' && now - start >= emptyMs) finish(true, true);
+    };
+    observer = new MutationObserver(check);
+    observer.observe(document.documentElement, {childList: true, subtree: true});
+    // stability is the absence of mutations, so it has to be polled too
+    timer = setInterval(check, 100);
+    bottom();
+    check();
+})"""
+
+
+class LazyLoader:
+    """Scroll until the card count is stable; tracks the time saved against fixed sleeps"""
+
+    def __init__(self, baseline, selector=CARD_SELECTOR, stable=0.8, cap=8.0, empty=2.0):
+        self.baseline = baseline
+        self.selector = selector
+        self.stable = stable
+        self.cap = cap
+        self.empty = empty
+        self.pages = 0
+        self.capped = 0
+        self.empty_pages = 0
+        self.waited = 0.0
+
+    def _args(self, selector):
+        return selector or self.selector, int(self.stable * 1000), int(self.cap * 1000), int(self.empty * 1000)
+
+    def _record(self, result, started):
+        self.pages += 1
+        self.waited += time.perf_counter() - started
+        if result is None:
+            return None
+        result = {'count': result['count'], 'elapsed': result['elapsed'] / 1000, 'stable': result['stable'],
+                  'empty': result['empty']}
+        if not result['stable']:
+            self.capped += 1
+        if result['empty']:
+            self.empty_pages += 1
+        return result
+
+    # -------------------------
+    # Drivers
+    # -------------------------
+    def selenium(self, driver, selector=None):
+        """Selenium / undetected-chromedriver (execute_async_script, cap must stay under the script timeout)"""
+        started = time.perf_counter()
+        script = (f"const done = arguments[4]; "
+                  f"({LOAD_UNTIL_STABLE_FN})(arguments[0], arguments[1], arguments[2], arguments[3]).then(done);")
+        try:
+            result = driver.execute_async_script(script, *self._args(selector))
+        except Exception:
+            time.sleep(self.baseline)
+            result = None
+        return self._record(result, started)
+
+    def playwright(self, page, selector=None):
+        """Playwright sync API"""
+        started = time.perf_counter()
+        try:
+            result = page.evaluate(f"([s, stable, cap, empty]) => ({LOAD_UNTIL_STABLE_FN})(s, stable, cap, empty)",
+                                   list(self._args(selector)))
+        except Exception:
+            time.sleep(self.baseline)
+            result = None
+        return self._record(result, started)
+
+    async def nodriver(self, tab, selector=None):
+        """nodriver tab (Runtime.evaluate awaiting the promise)"""
+        started = time.perf_counter()
+        selector, stable, cap, empty = self._args(selector)
+        expression = f"({LOAD_UNTIL_STABLE_FN})({json.dumps(selector)}, {stable}, {cap}, {empty}).then(JSON.stringify)"
+        try:
+            result = await tab.evaluate(expression, await_promise=True)
+            result = json.loads(result) if isinstance(result, str) else None
+        except Exception:
+            result = None
+        if result is None:
+            await asyncio.sleep(self.baseline)
+        return self._record(result, started)
+
+    # -------------------------
+    # Reporting
+    # -------------------------
+    @property
+    def saved(self):
+        """Seconds saved against sleeping `baseline` on every page (negative: the waits cost more)"""
+        return self.baseline * self.pages - self.waited
+
+    def report(self):
+        if self.pages:
+            saved = (f"{self.saved:.1f}s saved vs fixed sleeps" if self.saved >= 0
+                     else f"{-self.saved:.1f}s more than fixed sleeps")
+            capped = f", {self.capped} hit the {self.cap:.0f}s cap" if self.capped else ''
+            empty = f", {self.empty_pages} without cards" if self.empty_pages else ''
+            print(f"⏬ Lazy load: {self.pages} pages, {self.waited / self.pages:.1f}s avg wait, "
+                  f"{saved}{capped}{empty}")
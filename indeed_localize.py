@@ -0,0 +1,199 @@
+"""
+Export-time localisation of scraped job records
+
+translate_to_spanish used to rebuild six mapping dicts for every job inside the
+scrape loop, so a crawl produced Spanish records only. The tables are now built
+once at import and frozen. Localisation is a pass over whole columns at save
+time, and every distinct value of a column is translated once. One English
+crawl gives both outputs:
+
+    jobs_es = localize_jobs(jobs, 'es')     # copies; `jobs` keeps the English labels
+    save_to_json(jobs, 'jobs_en.json')
+    save_to_json(jobs_es, 'jobs.json')
+
+A column is only touched when its value is set. Labels are looked up
+lowercased and stripped (categories as-is), and unknown values pass through
+unchanged.
+"""
+
+from types import MappingProxyType
+
+
+# -------------------------
+# Spanish tables (English label -> Spanish label)
+# -------------------------
+CATEGORY_ES = MappingProxyType({
+    'IT/Software Development': 'Desarrollo de TI/Software',
+    'Customer Service': 'Servicio al cliente',
+    'Sales and Marketing': 'Ventas y Marketing',
+    'Human Resources': 'Recursos Humanos',
+    'Finance and Accounting': 'Finanzas y Contabilidad',
+    'Administration': 'Administración',
+    'Education': 'Educación',
+    'Health': 'Salud',
+    'Engineering': 'Ingeniería',
+    'Design': 'Diseño',
+    'General/Other': 'General/Otro',
+})
+
+SALARY_TYPE_ES = MappingProxyType({
+    'hourly': 'por hora',
+    'hour': 'por hora',
+    'por hora': 'por hora',
+    'monthly': 'mensual',
+    'month': 'mensual',
+    'mensual': 'mensual',
+    'annual': 'anual',
+    'yearly': 'anual',
+    'year': 'anual',
+    'anual': 'anual',
+})
+
+CAREER_LEVEL_ES = MappingProxyType({
+    'senior': 'sénior',
+    'sénior': 'sénior',
+    'sr': 'sénior',
+    'sr.': 'sénior',
+    'junior': 'júnior',
+    'júnior': 'júnior',
+    'jr': 'júnior',
+    'jr.': 'júnior',
+    'entry': 'entrada',
+    'entry level': 'entrada',
+    'entrada': 'entrada',
+    'mid': 'medio',
+    'mid level': 'medio',
+    'medio': 'medio',
+    'intermediate': 'medio',
+    'intermedio': 'medio',
+})
+
+QUALIFICATION_ES = MappingProxyType({
+    'high school': 'secundaria',
+    'high_school': 'secundaria',        # the label indeed_enrichment emits
+    'secundaria': 'secundaria',
+    'bachillerato': 'secundaria',
+    'associate': 'técnico',
+    'technical': 'técnico',
+    'técnico': 'técnico',
+    'diploma': 'técnico',
+    'bachelor': 'licenciatura',
+    "bachelor's": 'licenciatura',
+    'licenciatura': 'licenciatura',
+    'grado': 'licenciatura',
+    'university degree': 'licenciatura',
+    'master': 'maestría',
+    "master's": 'maestría',
+    'maestría': 'maestría',
+    'mba': 'maestría',
+    'msc': 'maestría',
+    'doctorate': 'doctorado',
+    'doctorado': 'doctorado',
+    'phd': 'doctorado',
+    'ph.d': 'doctorado',
+    'ph.d.': 'doctorado',
+})
+
+JOB_TYPE_ES = MappingProxyType({
+    'full time': 'tiempo completo',
+    'full-time': 'tiempo completo',
+    'fulltime': 'tiempo completo',
+    'tiempo completo': 'tiempo completo',
+    'part time': 'medio tiempo',
+    'part-time': 'medio tiempo',
+    'parttime': 'medio tiempo',
+    'medio tiempo': 'medio tiempo',
+    'temporary': 'temporal',
+    'temporal': 'temporal',
+    'contract': 'contrato',
+    'contrato': 'contrato',
+    'internship': 'pasantía',
+    'intern': 'pasantía',
+    'pasantía': 'pasantía',
+    'freelance': 'freelance',
+    'por proyecto': 'freelance',
+})
+
+TAG_ES = MappingProxyType({
+    'sponsored': 'patrocinado',
+    'patrocinado': 'patrocinado',
+    'urgent': 'urgente',
+    'urgente': 'urgente',
+    'new': 'nuevo',
+    'nuevo': 'nuevo',
+    'costa rica': 'Costa Rica',
+})
+
+# "5+ years" -> "5+ años" (applied in order)
+EXPERIENCE_ES = (('years', 'años'), ('year', 'año'), ('Years', 'años'), ('Year', 'año'))
+
+
+# -------------------------
+# Column translators
+# -------------------------
+def exact(table):
+    return lambda value: table.get(value, value)
+
+
+def label(table):
+    return lambda value: table.get(str(value).lower().strip(), value)
+
+
+def replace_all(pairs):
+    def translate(value):
+        value = str(value)
+        for old, new in pairs:
+            value = value.replace(old, new)
+        return value
+    return translate
+
+
+# language -> {column: translator of one value}; list columns are translated element-wise
+LOCALIZATIONS = MappingProxyType({
+    'es': MappingProxyType({
+        '_job_category': exact(CATEGORY_ES),
+        '_job_salary_type': label(SALARY_TYPE_ES),
+        '_job_career_level': label(CAREER_LEVEL_ES),
+        '_job_qualification': label(QUALIFICATION_ES),
+        '_job_type': label(JOB_TYPE_ES),
+        '_job_tag': label(TAG_ES),
+        '_job_experience': replace_all(EXPERIENCE_ES),
+    }),
+})
+
+
+def localize_column(values, translate):
+    """Translated copy of one column's values; each distinct value goes through `translate` once"""
+    memo = {}
+
+    def cached(value):
+        try:
+            return memo[value]
+        except KeyError:
+            result = memo[value] = translate(value)
+            return result
+        except TypeError:
+            return translate(value)         # unhashable
+
+    out = []
+    for value in values:
+        if not value:
+            out.append(value)
+        elif isinstance(value, list):
+            out.append([cached(item) for item in value])
+        else:
+            out.append(cached(value))
+    return out
+
+
+def localize_jobs(jobs, language='es'):
+    """Copies of the job dicts with their label columns in `language` ('en' or None: plain copies)"""
+    localized = [dict(job) for job in jobs]
+    if not language or language == 'en':
+        return localized
+    for column, translate in LOCALIZATIONS[language].items():
+        values = [job.get(column) for job in localized]
+        for job, value, translated in zip(localized, values, localize_column(values, translate)):
+            if value:
+                job[column] = translated
+    return localized
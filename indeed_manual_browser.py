@@ -10,33 +10,49 @@ This bypasses all protection because we're using YOUR legitimate session
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 import json
 import csv
-import re
 from datetime import datetime, timedelta
-import time
+
+from indeed_cards import detect_card_tags, extract_mosaic_cards
+from indeed_html import SERP_REGION, parse_region, select_by_class_pattern
+from indeed_pacing import Pacer
+from indeed_parse_cache import ParseCache
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
 
 class IndeedManualCookieScraper:
     """
     Uses cookies from your browser session to bypass Cloudflare
     """
     
-    def __init__(self, cookies_dict=None):
+    def __init__(self, cookies_dict=None, user_agent=None, pool_size=10, pacer=None):
         """
         Initialize with cookies from your browser
         
         Args:
             cookies_dict: Dictionary of cookies from your browser
+            user_agent: User agent of the browser the cookies came from (cf_clearance is tied to it)
+            pool_size: Keep-alive connections kept per host (detail pages are fetched in parallel)
+            pacer: Shared Pacer (e.g. the browser scraper's), so both stay within one per-host rate
         """
         self.session = requests.Session()
         
+        # Connection pooling so parallel detail requests reuse keep-alive connections
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.pacer = pacer or Pacer(initial_rate=1.0, max_rate=4.0)
+        self.parse_cache = ParseCache()
+        
         # Set realistic headers
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'User-Agent': user_agent or DEFAULT_USER_AGENT,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'es-419,es;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
+            # no 'br': requests only decodes brotli when brotli/brotlicffi is installed
+            'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
             'Sec-Fetch-Dest': 'document',
@@ -50,6 +66,51 @@ class IndeedManualCookieScraper:
             for name, value in cookies_dict.items():
                 self.session.cookies.set(name, value)
     
+    @classmethod
+    def from_browser_cookies(cls, cookies, user_agent=None, pool_size=10, pacer=None):
+        """
+        Build a scraper from an automated browser's cookie jar (after it passed Cloudflare)
+        
+        Args:
+            cookies: List of dicts with name, value and optionally domain / path
+        """
+        scraper = cls(user_agent=user_agent, pool_size=pool_size, pacer=pacer)
+        for cookie in cookies:
+            scraper.session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain') or '', path=cookie.get('path') or '/'
+            )
+        return scraper
+    
+    def is_blocked(self, response):
+        """True if the response is a 403 / Cloudflare challenge instead of real content"""
+        if response.status_code in (403, 429, 503):
+            return True
+        text = response.text[:5000].lower()
+        return ('cloudflare' in text and 'verification' in text) or 'cf-chl' in text or 'just a moment' in text
+    
+    def fetch_detail_html(self, url, timeout=20, marker='jobDescriptionText'):
+        """
+        Fetch one job detail page (viewjob?jk=...). Returns None if blocked/challenged.
+
+        A 200 page without `marker` (login wall, unknown block page) is a failure too,
+        the same check the browser path makes on a detail page.
+        """
+        self.pacer.wait(url)
+        try:
+            response = self.session.get(url, timeout=timeout)
+        except Exception as e:
+            print(f"      ⚠️  HTTP error for {url}: {e}")
+            return None
+        if response.status_code != 200 or self.is_blocked(response):
+            self.pacer.failure(url, 'challenge' if response.status_code == 200 else str(response.status_code))
+            return None
+        if marker and marker not in response.text:
+            self.pacer.failure(url, 'no description')
+            return None
+        self.pacer.success(url)
+        return response.text
+    
     def scrape_jobs(self, url, max_pages=5):
         """Scrape jobs using session with cookies"""
         all_jobs = []
@@ -63,55 +124,81 @@ class IndeedManualCookieScraper:
             print(f"📄 Page {page + 1}/{max_pages}")
             
             try:
+                self.pacer.wait(page_url)
                 response = self.session.get(page_url, timeout=30)
                 
                 # Check if we're blocked
                 if response.status_code == 403:
                     print("  ❌ 403 Forbidden - Cookies may be expired")
                     print("  → Extract new cookies from your browser")
+                    self.pacer.failure(page_url, '403')
                     break
                 
-                if 'cloudflare' in response.text.lower() and 'verification' in response.text.lower():
+                if self.is_blocked(response):
                     print("  ❌ Cloudflare challenge detected")
                     print("  → Extract new cookies after passing CAPTCHA")
+                    self.pacer.failure(page_url, 'challenge')
                     break
                 
-                # Parse HTML
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Extract jobs
-                jobs = self.extract_jobs(soup)
+                # Extract jobs (a page seen before comes from the parse cache)
+                jobs = self.parse_cache.get_or_parse(response.text, 'serp', self.extract_page_jobs)
                 
                 if jobs:
                     print(f"  ✅ Found {len(jobs)} jobs")
+                    self.pacer.success(page_url)
                     all_jobs.extend(jobs)
                 else:
                     print("  ⚠️  No jobs found")
+                    self.pacer.failure(page_url, 'no cards')
                     # Save for debugging
                     with open(f'debug_no_jobs_page{page+1}.html', 'w', encoding='utf-8') as f:
-                        f.write(soup.prettify())
+                        f.write(response.text)
                     break
-                
-                # Delay between pages
-                if page < max_pages - 1:
-                    time.sleep(3)
             
             except Exception as e:
                 print(f"  ❌ Error: {e}")
                 break
         
+        self.parse_cache.report()
         return all_jobs
     
+    def extract_page_jobs(self, html):
+        """Jobs of a SERP from the embedded JSON, parsing the HTML cards only if it's missing"""
+        jobs = self.extract_jobs_from_mosaic(html)
+        if jobs is None:
+            jobs = self.extract_jobs(parse_region(html, SERP_REGION))
+        return jobs
+    
+    def extract_jobs_from_mosaic(self, html):
+        """Extract jobs from the embedded mosaic JSON (None if the page doesn't have it)"""
+        cards = extract_mosaic_cards(html)
+        if cards is None:
+            return None
+        
+        jobs = []
+        for card in cards:
+            if not card['title']:
+                continue
+            jobs.append({
+                'title': card['title'], 'company': card['company'], 'location': card['location'],
+                'salary': card['salary'], 'salary_type': None, 'description': card['snippet'],
+                'posted_date': card['posted'], 'apply_url': card['url'], 'job_id': card['job_key'],
+                'type': card['job_types'][0] if card['job_types'] else None,
+                'featured': card['sponsored'], 'urgent': card['urgent'],
+                'company_rating': card['company_rating'], 'source': 'indeed_cr'
+            })
+        return jobs
+    
     def extract_jobs(self, soup):
         """Extract jobs from HTML"""
         jobs = []
         
         # Find job cards - try multiple selectors
         job_cards = (
-            soup.find_all('div', class_='job_seen_beacon') or
-            soup.find_all('div', attrs={'data-jk': True}) or
-            soup.find_all('td', class_='resultContent') or
-            soup.find_all('div', class_=re.compile(r'jobsearch.*Card'))
+            soup.select('div.job_seen_beacon') or
+            soup.select('div[data-jk]') or
+            soup.select('td.resultContent') or
+            select_by_class_pattern(soup, 'div', r'jobsearch.*Card')
         )
         
         for card in job_cards:
@@ -135,20 +222,20 @@ class IndeedManualCookieScraper:
         job['job_id'] = card.get('data-jk')
         
         # Title
-        title_elem = card.find('h2', class_='jobTitle') or card.find('a', class_='jcs-JobTitle')
+        title_elem = card.select_one('h2.jobTitle') or card.select_one('a.jcs-JobTitle')
         if title_elem:
             job['title'] = title_elem.get_text(strip=True)
-            link = title_elem.find('a') if title_elem.name != 'a' else title_elem
+            link = title_elem.select_one('a') if title_elem.name != 'a' else title_elem
             if link and link.get('href'):
                 job['apply_url'] = f"https://cr.indeed.com{link['href']}" if not link['href'].startswith('http') else link['href']
         
         # Company
-        company_elem = card.find('span', {'data-testid': 'company-name'}) or card.find('span', class_='companyName')
+        company_elem = card.select_one('span[data-testid="company-name"]') or card.select_one('span.companyName')
         if company_elem:
             job['company'] = company_elem.get_text(strip=True)
         
         # Company rating
-        rating_elem = card.find('span', class_='ratingNumber')
+        rating_elem = card.select_one('span.ratingNumber')
         if rating_elem:
             try:
                 job['company_rating'] = float(rating_elem.get_text(strip=True))
@@ -156,30 +243,30 @@ class IndeedManualCookieScraper:
                 pass
         
         # Location
-        location_elem = card.find('div', {'data-testid': 'text-location'}) or card.find('div', class_='companyLocation')
+        location_elem = card.select_one('div[data-testid="text-location"]') or card.select_one('div.companyLocation')
         if location_elem:
             job['location'] = location_elem.get_text(strip=True)
         
         # Salary
-        salary_elem = card.find('div', class_='salary-snippet') or card.find('span', class_='salary')
+        salary_elem = card.select_one('div.salary-snippet') or card.select_one('span.salary')
         if salary_elem:
             job['salary'] = salary_elem.get_text(strip=True)
         
         # Description snippet
-        desc_elem = card.find('div', class_='job-snippet') or card.find('ul', class_='job-snippet')
+        desc_elem = card.select_one('div.job-snippet') or card.select_one('ul.job-snippet')
         if desc_elem:
             job['description'] = desc_elem.get_text(strip=True)
         
         # Posted date
-        date_elem = card.find('span', class_='date')
+        date_elem = card.select_one('span.date')
         if date_elem:
             job['posted_date'] = date_elem.get_text(strip=True)
         
         # Check for tags
-        html_text = str(card).lower()
-        if 'patrocinado' in html_text or 'sponsored' in html_text:
+        tags = detect_card_tags(card)
+        if 'sponsored' in tags:
             job['featured'] = True
-        if 'urgently' in html_text or 'urge contratar' in html_text:
+        if 'urgent' in tags:
             job['urgent'] = True
         
         return job
@@ -0,0 +1,192 @@
+"""
+Raw server HTML from the browser's network layer
+
+The SERP mosaic JSON and the viewjob description are already in the document
+the server sends, so there is no need to wait for render, scroll and read the
+live DOM when that response parses fine. DocumentCapture keeps the body of the
+main document response of a nodriver tab (Network.responseReceived /
+loadingFinished + Network.getResponseBody):
+
+    capture = DocumentCapture(tab)
+    await capture.attach()              # once per tab
+    capture.arm()                       # right before each navigation
+    await tab.get(url)
+    html = await capture.wait()         # body of the document response, or None
+
+SeleniumDocumentCapture does the same for an undetected-chromedriver driver
+started with enable_cdp_events=True (uc add_cdp_listener + execute_cdp_cmd):
+
+    capture = SeleniumDocumentCapture(driver)
+    capture.attach()                    # False when the driver has no CDP events
+    capture.arm()
+    driver.get(url)
+    html = capture.wait()
+
+uc polls the events from Chrome's performance log about once a second, so wait()
+can lag the response by that much; still well under the render + scroll wait.
+
+Playwright exposes the same thing as `(await page.goto(url)).text()`.
+"""
+
+import asyncio
+import base64
+import threading
+
+
+class DocumentCapture:
+    """Body of the next document response loaded in a nodriver tab"""
+
+    def __init__(self, tab):
+        self.tab = tab
+        self.status = None
+        self.captured = 0
+        self._pending = None
+        self._request_id = None
+
+    async def attach(self):
+        from nodriver import cdp
+
+        self.tab.add_handler(cdp.network.ResponseReceived, self._on_response)
+        self.tab.add_handler(cdp.network.LoadingFinished, self._on_finished)
+        self.tab.add_handler(cdp.network.LoadingFailed, self._on_failed)
+        await self.tab.send(cdp.network.enable())
+
+    def arm(self):
+        """Capture the first document response after this call"""
+        self._pending = asyncio.get_running_loop().create_future()
+        self._request_id = None
+        self.status = None
+
+    async def wait(self, timeout=15):
+        """The captured body (str), or None if nothing was captured within `timeout` seconds"""
+        pending = self._pending
+        if pending is None:
+            return None
+        try:
+            return await asyncio.wait_for(asyncio.shield(pending), timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._pending = None
+
+    # -------------------------
+    # CDP events
+    # -------------------------
+    def _resolve(self, body):
+        if self._pending is not None and not self._pending.done():
+            self._pending.set_result(body)
+
+    def _on_response(self, event):
+        from nodriver import cdp
+
+        if self._pending is None or self._request_id is not None:
+            return
+        if event.type_ == cdp.network.ResourceType.DOCUMENT and event.response.url.startswith('http'):
+            self._request_id = event.request_id
+            self.status = event.response.status
+
+    def _on_finished(self, event):
+        if self._request_id is not None and event.request_id == self._request_id:
+            asyncio.ensure_future(self._read_body(event.request_id))
+
+    def _on_failed(self, event):
+        if self._request_id is not None and event.request_id == self._request_id:
+            self._resolve(None)
+
+    async def _read_body(self, request_id):
+        from nodriver import cdp
+
+        try:
+            body, is_base64 = await self.tab.send(cdp.network.get_response_body(request_id))
+            if is_base64:
+                body = base64.b64decode(body).decode('utf-8', errors='replace')
+            self.captured += 1
+            self._resolve(body)
+        except Exception:
+            self._resolve(None)
+
+
+class SeleniumDocumentCapture:
+    """Body of the next document response loaded by an undetected-chromedriver driver"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.status = None
+        self.captured = 0
+        self.attached = False
+        self._armed = False
+        self._request_id = None
+        self._failed = False
+        self._done = threading.Event()
+
+    def attach(self):
+        """Listen for document responses; False if the driver wasn't started with enable_cdp_events"""
+        # uc delivers CDP events from its reactor thread when started with enable_cdp_events=True
+        if not (getattr(self.driver, 'reactor', None) and hasattr(self.driver, 'add_cdp_listener')):
+            return False
+        self.driver.execute_cdp_cmd('Network.enable', {})
+        self._listen('Network.responseReceived', self._on_response)
+        self._listen('Network.loadingFinished', self._on_finished)
+        self._listen('Network.loadingFailed', self._on_failed)
+        self.attached = True
+        return True
+
+    def _listen(self, event, callback):
+        """add_cdp_listener keeps one callback per event: chain the one already there (ResourceBlocker's)"""
+        previous = getattr(self.driver.reactor, 'handlers', {}).get(event.lower())
+        if previous:
+            def both(message):
+                previous(message)
+                callback(message)
+            self.driver.add_cdp_listener(event, both)
+        else:
+            self.driver.add_cdp_listener(event, callback)
+
+    def arm(self):
+        """Capture the first document response after this call"""
+        self._done.clear()
+        self._request_id = None
+        self._failed = False
+        self.status = None
+        self._armed = self.attached
+
+    def wait(self, timeout=15):
+        """The captured body (str), or None if nothing was captured within `timeout` seconds"""
+        if not self._armed:
+            return None
+        # events come from uc's reactor thread; the body is read here, on the driver's thread
+        finished = self._done.wait(timeout)
+        self._armed = False
+        if not finished or self._failed or self._request_id is None:
+            return None
+        try:
+            result = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': self._request_id})
+        except Exception:
+            return None
+        body = result.get('body')
+        if body and result.get('base64Encoded'):
+            body = base64.b64decode(body).decode('utf-8', errors='replace')
+        if body:
+            self.captured += 1
+        return body or None
+
+    # -------------------------
+    # CDP events (uc passes the raw {'method', 'params'} message)
+    # -------------------------
+    def _on_response(self, message):
+        params = message.get('params', {})
+        if not self._armed or self._request_id is not None:
+            return
+        response = params.get('response', {})
+        if params.get('type') == 'Document' and response.get('url', '').startswith('http'):
+            self._request_id = params.get('requestId')
+            self.status = response.get('status')
+
+    def _on_finished(self, message):
+        if self._request_id is not None and message.get('params', {}).get('requestId') == self._request_id:
+            self._done.set()
+
+    def _on_failed(self, message):
+        if self._request_id is not None and message.get('params', {}).get('requestId') == self._request_id:
+            self._failed = True
+            self._done.set()
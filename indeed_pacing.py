@@ -0,0 +1,135 @@
+"""
+Adaptive request pacing shared by the scrapers
+
+Instead of fixed random sleeps between pages and jobs, every request to a host
+goes through a Pacer, which keeps a request rate per host (AIMD):
+- clean response  -> rate += increase          (additive increase)
+- challenge page, 403/429 or empty card list -> rate *= decrease (multiplicative backoff)
+
+Usage:
+    pacer = Pacer(initial_rate=0.5)        # requests per second per host
+    pacer.wait(url)                        # or: await pacer.wait_async(url)
+    response = session.get(url)
+    if blocked:
+        pacer.failure(url, 'challenge')
+    else:
+        pacer.success(url)
+
+wait() reserves the next slot for the host, so concurrent callers (threads or
+asyncio tasks) are spaced 1/rate apart instead of all sleeping the same delay.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def host_of(url_or_host):
+    """'https://cr.indeed.com/jobs?q=' -> 'cr.indeed.com' (plain host names pass through)"""
+    if not url_or_host:
+        return ''
+    if '//' in url_or_host:
+        return urlsplit(url_or_host).netloc
+    return url_or_host
+
+
+class HostPace:
+    """Pacing state of one host"""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.next_at = 0.0
+        self.successes = 0
+        self.failures = {}
+        self.waited = 0.0
+
+
+class Pacer:
+    """AIMD request pacing with per-host state"""
+
+    def __init__(self, initial_rate=0.5, min_rate=0.05, max_rate=2.0,
+                 increase=0.05, decrease=0.5, jitter=0.25):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.jitter = jitter
+        self.hosts = {}
+        self._lock = threading.Lock()
+
+    def host_state(self, url_or_host):
+        host = host_of(url_or_host)
+        state = self.hosts.get(host)
+        if state is None:
+            state = self.hosts[host] = HostPace(self.initial_rate)
+        return state
+
+    def current_rate(self, url_or_host):
+        """Current allowed requests per second for the host"""
+        with self._lock:
+            return self.host_state(url_or_host).rate
+
+    # -------------------------
+    # Waiting
+    # -------------------------
+    def reserve(self, url_or_host):
+        """Reserve the next request slot for the host; returns seconds to wait"""
+        with self._lock:
+            state = self.host_state(url_or_host)
+            interval = 1.0 / state.rate
+            interval *= random.uniform(1 - self.jitter, 1 + self.jitter)
+            now = time.monotonic()
+            slot = max(now, state.next_at)
+            state.next_at = slot + interval
+            delay = slot - now
+            state.waited += delay
+            return delay
+
+    def wait(self, url_or_host):
+        delay = self.reserve(url_or_host)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def wait_async(self, url_or_host):
+        delay = self.reserve(url_or_host)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    # -------------------------
+    # Feedback
+    # -------------------------
+    def success(self, url_or_host):
+        with self._lock:
+            state = self.host_state(url_or_host)
+            state.successes += 1
+            state.rate = min(self.max_rate, state.rate + self.increase)
+
+    def failure(self, url_or_host, reason='error'):
+        """Back off after a challenge page, 403/429 or an empty card list"""
+        with self._lock:
+            state = self.host_state(url_or_host)
+            state.failures[reason] = state.failures.get(reason, 0) + 1
+            state.rate = max(self.min_rate, state.rate * self.decrease)
+            # the next request waits a full (slower) interval
+            state.next_at = max(state.next_at, time.monotonic() + 1.0 / state.rate)
+            rate = state.rate
+        print(f"  🐢 Backing off ({reason}): {rate:.2f} req/s")
+
+    def record(self, url_or_host, ok, reason='error'):
+        if ok:
+            self.success(url_or_host)
+        else:
+            self.failure(url_or_host, reason)
+
+    def report(self):
+        with self._lock:
+            hosts = list(self.hosts.items())
+        for host, state in hosts:
+            failures = ', '.join(f"{r}: {n}" for r, n in state.failures.items()) or 'none'
+            print(f"⏱️  {host or 'default'}: {state.rate:.2f} req/s, {state.successes} ok, "
+                  f"backoffs: {failures}, waited {state.waited:.0f}s")
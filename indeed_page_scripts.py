@@ -0,0 +1,294 @@
+"""
+In-page JavaScript shared by the browser scrapers
+
+Every find_element / get_attribute call is a WebDriver HTTP round trip (and a
+miss raises an exception), so card fields are read in the browser with one
+execute_script call per page instead:
+
+    fields = {
+        'title': card_field('h2.jobTitle a span', 'h2.jobTitle span'),
+        'apply_url': card_field('h2.jobTitle a, a.jcs-JobTitle', attr='href'),
+    }
+    cards = extract_cards(driver, card_elements, fields, tags=CARD_TAGS)
+    # -> [{'jk': '...', 'values': {'title': '...', 'apply_url': '...'}, 'tags': ['sponsored']}, ...]
+
+A field tries its selectors in order and keeps the first non-empty value
+(innerText, like WebElement.text, or the given attribute). `tags` (see
+indeed_cards.CARD_TAGS) are detected like detect_card_tags() does: from the
+card's lowercased textContent, read once per card, or a label node. The card's
+innerHTML is never serialized.
+
+probe_selectors() counts the matches of a whole selector cascade (CSS and XPath)
+in one call and hands back the elements of the first one that qualifies, instead
+of one find_elements round trip per selector:
+
+    counts, elements = probe_selectors(driver, cascade.ordered(), min_count=4)
+
+extract_scoped() runs the same read against one element, e.g. the detail pane
+after a click, so its fields and tags come back in a single round trip too.
+
+Clicking a card used to be followed by a fixed sleep and a wait for
+#jobDescriptionText, which is still in the page from the previous job.
+arm_pane_wait() / wait_for_pane() instead resolve as soon as the pane shows a
+new description for the clicked card's data-jk.
+
+nodriver: instead of shipping document.documentElement.outerHTML over CDP and
+rebuilding it in Python, PAGE_EXTRACTOR_JS is evaluated in the tab when needed
+and returns just the fields as compact JSON. It is an immediately invoked
+function, so nothing is left on window for the page's own scripts to find:
+
+    page = await extract_serp_in_page(tab, selectors, CARD_VALUES, CARD_TAGS, MOSAIC_KEYS)
+    # -> {'mosaic': [...]} or {'selector': 'div.job_seen_beacon', 'cards': [{'values', 'jk', 'tags'}]}
+    values = await extract_detail_in_page(tab, DETAIL_VALUES)
+
+Field specs are indeed_html.node_field()s, read exactly like read_fields() does
+on a parsed tree (first matching element, get_text(sep, strip=True) or an
+attribute), so both paths feed the same Python mapping. Both return None when
+the extractor could not run, which is the cue to fall back to outerHTML.
+"""
+
+import json
+
+
+# readNode(node, fields, tags): field values, data-jk and tags of one card / pane element
+READ_NODE_JS = """
+const read = (el, attr) => {
+    if (!el) return null;
+    const value = attr ? (el[attr] || el.getAttribute(attr)) : el.innerText;
+    return value ? String(value).trim() : null;
+};
+const readNode = (node, fields, tags) => {
+    const values = {};
+    for (const [name, spec] of Object.entries(fields)) {
+        values[name] = null;
+        for (const css of spec.css) {
+            let value = null;
+            try { value = read(node.querySelector(css), spec.attr); } catch (e) {}
+            if (value) { values[name] = value; break; }
+        }
+    }
+    const holder = node.matches('[data-jk]') ? node : node.querySelector('[data-jk]');
+    const names = Object.keys(tags);
+    const text = names.length ? node.textContent.toLowerCase() : '';
+    return {
+        jk: holder ? holder.getAttribute('data-jk') : null,
+        values: values,
+        tags: names.filter(name => tags[name].words.some(w => text.includes(w)) || node.querySelector(tags[name].css)),
+    };
+};
+"""
+
+EXTRACT_CARDS_JS = READ_NODE_JS + """
+const cards = arguments[0], fields = arguments[1], tags = arguments[2];
+return cards.map(card => readNode(card, fields, tags));
+"""
+
+# Same read, scoped to the first element matching one of the root selectors (e.g. the detail pane)
+EXTRACT_SCOPED_JS = READ_NODE_JS + """
+const [roots, fields, tags] = arguments;
+for (const css of roots) {
+    const root = document.querySelector(css);
+    if (root) return Object.assign(readNode(root, fields, tags), {root: css});
+}
+return null;
+"""
+
+
+def card_field(*selectors, attr=None):
+    """Field spec for extract_cards: CSS selectors tried in order, text or `attr` value"""
+    return {'css': list(selectors), 'attr': attr}
+
+
+def extract_cards(driver, cards, fields, tags=None):
+    """Read `fields` (and `tags`) of every card element with a single execute_script round trip"""
+    if not cards:
+        return []
+    return driver.execute_script(EXTRACT_CARDS_JS, list(cards), fields, tags or {}) or []
+
+
+def extract_scoped(driver, roots, fields, tags=None):
+    """
+    extract_cards for a single element: the first match of `roots` (CSS, tried in order)
+
+    Returns {'root': selector, 'jk', 'values', 'tags'}, or None when no root is in the page
+    """
+    return driver.execute_script(EXTRACT_SCOPED_JS, list(roots), fields, tags or {})
+
+
+# Match counts of every candidate selector, plus the elements of the first one with enough matches
+PROBE_SELECTORS_JS = """
+const [selectors, minCount] = arguments;
+const matches = ([type, selector]) => {
+    try {
+        if (type === 'XPATH') {
+            const found = document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            return Array.from({length: found.snapshotLength}, (_, i) => found.snapshotItem(i));
+        }
+        return Array.from(document.querySelectorAll(selector));
+    } catch (e) {
+        return null;
+    }
+};
+const counts = [];
+let elements = [];
+for (const spec of selectors) {
+    const found = matches(spec);
+    counts.push(found ? found.length : null);
+    if (found && !elements.length && found.length >= minCount) elements = found;
+}
+return {counts: counts, elements: elements};
+"""
+
+
+def probe_selectors(driver, selectors, min_count=1):
+    """
+    Count the matches of every (type, selector) - 'CSS' or 'XPATH' - with one execute_script
+
+    Returns ([count per selector, None if it is invalid], elements of the first selector with
+    at least `min_count` matches or [])
+    """
+    result = driver.execute_script(PROBE_SELECTORS_JS, [list(s) for s in selectors], min_count) or {}
+    return result.get('counts') or [None] * len(selectors), result.get('elements') or []
+
+
+# Right pane: remember what the description looks like before the click...
+ARM_PANE_WAIT_JS = """
+const node = document.querySelector(arguments[0]);
+window.__indeedPane = {node: node, text: node ? node.innerText : null};
+"""
+
+# ...then resolve as soon as a new description for the clicked job (vjk=jk) has rendered
+WAIT_FOR_PANE_JS = """
+const [selector, jk, timeoutMs, done] = arguments;
+const before = window.__indeedPane || {node: null, text: null};
+const start = Date.now();
+const paneJk = () => new URLSearchParams(location.search).get('vjk');
+const ready = () => {
+    const node = document.querySelector(selector);
+    if (!node || !node.innerText.trim()) return false;
+    if (node !== before.node || node.innerText !== before.text) {
+        return !jk || !paneJk() || paneJk() === jk;
+    }
+    // same text as before (e.g. a duplicated posting): trust the URL after a short grace period
+    return !!jk && paneJk() === jk && Date.now() - start > 1500;
+};
+let finished = false, observer = null, timer = null, limit = null;
+const finish = ok => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearInterval(timer);
+    clearTimeout(limit);
+    done(ok);
+};
+observer = new MutationObserver(() => { if (ready()) finish(true); });
+observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+// URL changes and the grace period are not DOM mutations
+timer = setInterval(() => { if (ready()) finish(true); }, 250);
+limit = setTimeout(() => finish(false), timeoutMs);
+if (ready()) finish(true);
+"""
+
+
+def arm_pane_wait(driver, selector):
+    """Snapshot the current right-pane description; call right before clicking a card"""
+    driver.execute_script(ARM_PANE_WAIT_JS, selector)
+
+
+def wait_for_pane(driver, selector, jk=None, timeout=15):
+    """
+    Block until the right pane shows the description of job `jk` (MutationObserver in-page)
+
+    Returns False on timeout, in which case the pane may still hold the previous job
+    """
+    return bool(driver.execute_async_script(WAIT_FOR_PANE_JS, selector, jk, int(timeout * 1000)))
+
+
+# Expression evaluating to {serp, detail}; run_page_extractor calls one of them in the same evaluation
+PAGE_EXTRACTOR_JS = """
+(() => {
+    const SKIP = new Set(['SCRIPT', 'STYLE', 'TEMPLATE']);
+    // BeautifulSoup get_text(sep, strip=True): stripped, non-empty text nodes joined by sep
+    const textOf = (el, sep) => {
+        const parts = [];
+        const walker = document.createTreeWalker(el, NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT, {
+            acceptNode: node => node.nodeType === Node.TEXT_NODE ? NodeFilter.FILTER_ACCEPT
+                : SKIP.has(node.nodeName) ? NodeFilter.FILTER_REJECT : NodeFilter.FILTER_SKIP,
+        });
+        for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+            const text = node.nodeValue.trim();
+            if (text) parts.push(text);
+        }
+        return parts.join(sep);
+    };
+    const readFields = (root, fields) => {
+        const values = {};
+        for (const [name, spec] of Object.entries(fields)) {
+            let el = null;
+            for (const css of spec.css) {
+                try { el = root.querySelector(css); } catch (e) {}
+                if (el) break;
+            }
+            values[name] = !el ? null : spec.attr ? el.getAttribute(spec.attr) : textOf(el, spec.sep);
+        }
+        return values;
+    };
+    const tagsOf = (card, tags) => {
+        const text = textOf(card, ' ').toLowerCase();
+        return Object.keys(tags).filter(name =>
+            tags[name].words.some(w => text.includes(w)) || card.querySelector(tags[name].css));
+    };
+    const pick = (obj, keys) => {
+        const out = {};
+        for (const key of keys) if (key in obj) out[key] = obj[key];
+        return out;
+    };
+    return {
+        serp(opts) {
+            const provider = ((window.mosaic || {}).providerData || {})['mosaic-provider-jobcards'];
+            const model = provider && provider.metaData && provider.metaData.mosaicProviderJobCardsModel;
+            const results = model && model.results;
+            if (Array.isArray(results) && results.length) {
+                return JSON.stringify({mosaic: results.map(r => pick(r, opts.mosaicKeys))});
+            }
+            for (const css of opts.selectors) {
+                let found = [];
+                try { found = document.querySelectorAll(css); } catch (e) {}
+                if (!found.length) continue;
+                return JSON.stringify({selector: css, cards: Array.from(found, card => {
+                    const holder = card.hasAttribute('data-jk') ? card : card.querySelector('[data-jk]');
+                    return {
+                        values: readFields(card, opts.fields),
+                        jk: holder ? holder.getAttribute('data-jk') : null,
+                        tags: tagsOf(card, opts.tags),
+                    };
+                })});
+            }
+            return JSON.stringify({selector: null, cards: []});
+        },
+        detail(fields) {
+            return JSON.stringify(readFields(document, fields));
+        },
+    };
+})()
+"""
+
+
+async def run_page_extractor(tab, call):
+    """Evaluate PAGE_EXTRACTOR_JS.<call> in the tab; the decoded JSON or None"""
+    try:
+        result = await tab.evaluate(f"{PAGE_EXTRACTOR_JS.strip()}.{call}")
+        return json.loads(result) if isinstance(result, str) else None
+    except Exception:
+        return None
+
+
+async def extract_serp_in_page(tab, selectors, fields, tags, mosaic_keys):
+    """Cards of the SERP in `tab`: the mosaic JSON results, else `fields` of the first matching selector"""
+    opts = {'selectors': list(selectors), 'fields': fields, 'tags': tags, 'mosaicKeys': list(mosaic_keys)}
+    return await run_page_extractor(tab, f"serp({json.dumps(opts)})")
+
+
+async def extract_detail_in_page(tab, fields):
+    """`fields` of the job detail page in `tab`"""
+    return await run_page_extractor(tab, f"detail({json.dumps(fields)})")
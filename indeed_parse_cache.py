@@ -0,0 +1,97 @@
+"""
+Content-hash keyed cache of parse results shared by the scrapers
+
+Retries, refreshes in the challenge loops and re-visited listings hand the
+extractors the same HTML again. ParseCache keys the extracted result (card
+list, detail fields) by a blake2b hash of the HTML, so a repeat skips the
+tree building and extraction entirely:
+
+    cache = ParseCache(maxsize=64)
+    jobs = cache.get_or_parse(html, 'serp', self.extract_page_jobs)
+    ...
+    found, fields = cache.lookup(html, 'viewjob')     # when the extraction runs elsewhere
+    cache.store(html, 'viewjob', fields)               # (e.g. in a parse pool worker)
+    cache.report()      # 🧠 Parse cache: 12 hits / 40 lookups (30%), 28 entries
+
+Results are deep-copied in and out, because callers go on to mutate the job
+dicts they get back.
+"""
+
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def html_digest(html):
+    """Fast 128-bit content hash of a document (str or bytes)"""
+    if isinstance(html, str):
+        html = html.encode('utf-8', errors='surrogatepass')
+    return hashlib.blake2b(html, digest_size=16).hexdigest()
+
+
+class ParseCache:
+    """Bounded LRU of extraction results keyed by (kind, html hash)"""
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get_or_parse(self, html, kind, extract):
+        """
+        extract(html) for this document, from the cache when the same HTML was seen before
+
+        `kind` separates extractors run on the same document ('serp', 'viewjob', ...)
+        """
+        if not html or self.maxsize <= 0:
+            return extract(html)
+        found, result = self.lookup(html, kind)
+        if found:
+            return result
+        result = extract(html)
+        self.store(html, kind, result)
+        return result
+
+    def lookup(self, html, kind):
+        """(True, cached result) or (False, None); for results computed elsewhere (see store)"""
+        if not html or self.maxsize <= 0:
+            return False, None
+        key = (kind, html_digest(html))
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return True, copy.deepcopy(self.entries[key])
+            self.misses += 1
+        return False, None
+
+    def store(self, html, kind, result):
+        if not html or self.maxsize <= 0:
+            return
+        key = (kind, html_digest(html))
+        with self._lock:
+            self.entries[key] = copy.deepcopy(result)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hit_rate, 'entries': len(self.entries)}
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def report(self):
+        lookups = self.hits + self.misses
+        if lookups:
+            print(f"🧠 Parse cache: {self.hits} hits / {lookups} lookups ({self.hit_rate:.0%}), "
+                  f"{len(self.entries)} entries")
@@ -0,0 +1,117 @@
+"""
+Process-pool parse + enrich stage for the async crawlers
+
+Building the tree of a viewjob page and running the description enrichment is
+pure CPU work. Inside a coroutine it blocks the event loop, and with it every
+other tab and CDP message. ParsePool hands that work to worker processes so the
+crawl loop only waits on I/O. Results are kept by job key and joined back once
+the page's fetches are done:
+
+    pool = ParsePool(workers=4)                     # 0 = run inline (no processes)
+    await pool.submit(jk, parse_detail_page, html, title)   # waits only for a free slot
+    ...
+    results = await pool.join()                     # {jk: result or the exception it raised}
+    pool.report()   # ⚙️ Parse pool: 40 jobs in 4 processes, 2.1s of parsing off the event loop, peak 8 in flight
+    pool.close()
+
+At most `max_in_flight` jobs are queued or running, so a fast crawl applies
+backpressure instead of buffering every page body. `fn` and its arguments must
+be picklable (module-level functions, plain data). If the pool can't start or
+breaks, the remaining work runs inline.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+def _timed(fn, *args):
+    """fn(*args) in a worker, with the time it took"""
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+class ParsePool:
+    """Bounded process pool for parse/enrich jobs, results joined by key"""
+
+    def __init__(self, workers=None, max_in_flight=None):
+        self.workers = (os.cpu_count() or 1) if workers is None else max(0, int(workers))
+        self.max_in_flight = max_in_flight or max(2, self.workers * 2)
+        self.executor = None
+        self.broken = False
+        self.tasks = {}
+        self._slots = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.jobs = 0
+        self.inline = 0
+        self.busy = 0.0
+
+    def _executor(self):
+        if self.executor is None and self.workers and not self.broken:
+            try:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            except (OSError, NotImplementedError) as e:
+                print(f"⚠️ Parse pool unavailable, parsing inline: {e}")
+                self.broken = True
+        return self.executor
+
+    async def submit(self, key, fn, *args):
+        """Queue fn(*args) under `key`; returns once a slot is free (the result comes from join)"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+        await self._slots.acquire()
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        self.tasks[key] = asyncio.ensure_future(self._run(fn, args))
+
+    async def _run(self, fn, args):
+        try:
+            executor = self._executor()
+            if executor is not None:
+                try:
+                    elapsed, result = await asyncio.get_running_loop().run_in_executor(executor, _timed, fn, *args)
+                    self.busy += elapsed
+                    self.jobs += 1
+                    return result
+                except BrokenProcessPool:
+                    print("⚠️ Parse pool broke, parsing inline from now on")
+                    self.broken = True
+                    self.executor = None
+            self.inline += 1
+            self.jobs += 1
+            return fn(*args)
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    def pending(self, key):
+        return key in self.tasks
+
+    async def join(self, keys=None):
+        """{key: result or exception} of everything submitted since the last join (or of just `keys`)"""
+        if keys is None:
+            tasks, self.tasks = self.tasks, {}
+        else:
+            tasks = {key: self.tasks.pop(key) for key in keys if key in self.tasks}
+        if not tasks:
+            return {}
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        return dict(zip(tasks, results))
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def report(self):
+        offloaded = self.jobs - self.inline
+        if offloaded:
+            inline = f", {self.inline} inline" if self.inline else ''
+            print(f"⚙️ Parse pool: {offloaded} jobs in {self.workers} processes, {self.busy:.1f}s of parsing "
+                  f"off the event loop, peak {self.peak_in_flight} in flight{inline}")
+        elif self.inline:
+            print(f"⚙️ Parse pool: {self.inline} jobs parsed inline")
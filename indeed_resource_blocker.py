@@ -0,0 +1,219 @@
+"""
+Shared request blocking for the browser scrapers
+
+We only read DOM text, so images, media, fonts and analytics/ad requests are
+dropped before they hit the network:
+- nodriver:                ResourceBlocker.attach_nodriver(tab)   (Fetch interception of the blocked
+                           resource types only, Network.setBlockedURLs for the domain list)
+- undetected-chromedriver: ResourceBlocker.attach_selenium(driver) (Network.setBlockedURLs)
+- Playwright:              ResourceBlocker.attach_playwright(context) (context.route)
+                           await ResourceBlocker.attach_playwright_async(context) (async API)
+
+Document requests and anything matching ALLOWED_PATTERNS (Cloudflare / captcha
+challenge endpoints) are never blocked, so the challenge scripts keep working.
+
+Blocked requests never download, so "bytes saved" is an estimate based on
+typical sizes per resource type.
+"""
+
+import asyncio
+from urllib.parse import urlsplit
+
+
+BLOCKED_RESOURCE_TYPES = ('image', 'media', 'font')
+
+BLOCKED_DOMAINS = (
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net',
+    'googlesyndication.com', 'googleadservices.com', 'adservice.google.com',
+    'facebook.net', 'connect.facebook.net', 'bat.bing.com', 'clarity.ms',
+    'hotjar.com', 'scorecardresearch.com', 'quantserve.com', 'adnxs.com',
+    'criteo.com', 'criteo.net', 'taboola.com', 'outbrain.com',
+    'amazon-adsystem.com', 'adsrvr.org', 'demdex.net', 'nr-data.net',
+    'segment.io', 'optimizely.com', 'tiktok.com', 'linkedin.com/px',
+)
+
+# Cloudflare / captcha challenge endpoints - always allowed
+ALLOWED_PATTERNS = (
+    'challenges.cloudflare.com', '/cdn-cgi/', 'turnstile',
+    'hcaptcha.com', 'recaptcha', 'gstatic.com/recaptcha',
+)
+
+# File extensions used for Network.setBlockedURLs (no resource type available there)
+RESOURCE_EXTENSIONS = {
+    'image': ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg', '.ico', '.avif', '.bmp'),
+    'media': ('.mp4', '.webm', '.mp3', '.m4a', '.ogg', '.wav', '.mov'),
+    'font': ('.woff', '.woff2', '.ttf', '.otf', '.eot'),
+}
+
+# Typical transfer sizes, used to estimate bytes saved
+AVERAGE_BYTES = {
+    'image': 25_000,
+    'media': 400_000,
+    'font': 35_000,
+    'script': 45_000,
+    'xhr': 3_000,
+    'fetch': 3_000,
+    'ping': 500,
+    'other': 5_000,
+}
+
+# CDP names of the resource types; nodriver only pauses requests of the blocked ones, so
+# scripts and XHRs that are let through never wait on a Python round trip
+CDP_RESOURCE_TYPES = {
+    'image': 'Image', 'media': 'Media', 'font': 'Font', 'stylesheet': 'Stylesheet',
+    'script': 'Script', 'xhr': 'XHR', 'fetch': 'Fetch', 'ping': 'Ping', 'other': 'Other',
+}
+
+
+class ResourceBlocker:
+    """Decides which requests to drop and keeps per-run statistics"""
+
+    def __init__(self, block_types=BLOCKED_RESOURCE_TYPES, block_domains=BLOCKED_DOMAINS,
+                 allow_patterns=ALLOWED_PATTERNS, enabled=True):
+        self.enabled = enabled
+        self.block_types = {t.lower() for t in block_types}
+        self.block_domains = tuple(d.lower() for d in block_domains)
+        self.allow_patterns = tuple(p.lower() for p in allow_patterns)
+        self.blocked = {}
+        self.allowed = 0
+
+    # -------------------------
+    # Decision / statistics
+    # -------------------------
+    def should_block(self, url, resource_type=None):
+        """True if a request for `url` of `resource_type` should be dropped"""
+        if not self.enabled or not url:
+            return False
+
+        url_low = url.lower()
+        if url_low.startswith(('data:', 'blob:', 'about:')):
+            return False
+        if any(p in url_low for p in self.allow_patterns):
+            return False
+
+        rtype = (resource_type or 'other').lower()
+        if rtype == 'document':
+            return False
+        if rtype in self.block_types:
+            return True
+
+        parts = urlsplit(url_low)
+        target = parts.netloc + parts.path
+        return any(target.startswith(d) or ('.' + d) in target for d in self.block_domains)
+
+    def record(self, resource_type):
+        rtype = (resource_type or 'other').lower()
+        self.blocked[rtype] = self.blocked.get(rtype, 0) + 1
+
+    def blocked_count(self):
+        return sum(self.blocked.values())
+
+    def bytes_saved(self):
+        """Estimated bytes not downloaded this run"""
+        return sum(AVERAGE_BYTES.get(t, AVERAGE_BYTES['other']) * n for t, n in self.blocked.items())
+
+    def report(self):
+        if not self.enabled:
+            return
+        by_type = ', '.join(f"{t}: {n}" for t, n in sorted(self.blocked.items(), key=lambda x: -x[1]))
+        print(f"🚫 Blocked {self.blocked_count()} requests (~{self.bytes_saved() / 1_000_000:.1f} MB saved)"
+              + (f" [{by_type}]" if by_type else ""))
+
+    def url_patterns(self):
+        """Wildcard URL patterns for Network.setBlockedURLs"""
+        patterns = []
+        for rtype in sorted(self.block_types):
+            for ext in RESOURCE_EXTENSIONS.get(rtype, ()):
+                patterns.append(f"*{ext}")
+                patterns.append(f"*{ext}?*")
+        return patterns + self.domain_patterns()
+
+    def domain_patterns(self):
+        """Network.setBlockedURLs patterns of the tracker/ad domains"""
+        return [f"*{domain}*" for domain in self.block_domains]
+
+    # -------------------------
+    # Backends
+    # -------------------------
+    async def attach_nodriver(self, tab):
+        """
+        Drop requests of a nodriver tab: the blocked resource types through the Fetch domain,
+        the domain list through Network.setBlockedURLs (blocked inside the browser)
+        """
+        if not self.enabled:
+            return
+        from nodriver import cdp
+
+        def on_request_paused(event):
+            rtype = event.resource_type.value if event.resource_type else 'Other'
+            if self.should_block(event.request.url, rtype):
+                self.record(rtype)
+                command = cdp.fetch.fail_request(event.request_id, cdp.network.ErrorReason.BLOCKED_BY_CLIENT)
+            else:
+                # challenge endpoints (ALLOWED_PATTERNS) and data: URLs
+                self.allowed += 1
+                command = cdp.fetch.continue_request(event.request_id)
+            asyncio.ensure_future(tab.send(command))
+
+        def on_loading_failed(event):
+            if event.blocked_reason == cdp.network.BlockedReason.INSPECTOR:
+                self.record(event.type_.value if event.type_ else 'other')
+
+        patterns = [
+            cdp.fetch.RequestPattern(url_pattern='*', resource_type=cdp.network.ResourceType.from_json(t))
+            for rtype, t in CDP_RESOURCE_TYPES.items() if rtype in self.block_types
+        ]
+        tab.add_handler(cdp.fetch.RequestPaused, on_request_paused)
+        tab.add_handler(cdp.network.LoadingFailed, on_loading_failed)
+        await tab.send(cdp.network.enable())
+        await tab.send(cdp.network.set_blocked_ur_ls(urls=self.domain_patterns()))
+        if patterns:
+            await tab.send(cdp.fetch.enable(patterns=patterns))
+
+    def attach_selenium(self, driver):
+        """Block by URL pattern in a Chrome WebDriver (counts come from uc CDP events if enabled)"""
+        if not self.enabled:
+            return
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.url_patterns()})
+
+        def on_loading_failed(message):
+            params = message.get('params', {})
+            if params.get('blockedReason'):
+                self.record(params.get('type'))
+
+        # undetected-chromedriver exposes CDP events when started with enable_cdp_events=True
+        if getattr(driver, 'reactor', None) and hasattr(driver, 'add_cdp_listener'):
+            driver.add_cdp_listener('Network.loadingFailed', on_loading_failed)
+
+    def attach_playwright(self, context):
+        """Route every request of a (sync API) Playwright context through the blocker"""
+        if not self.enabled:
+            return
+
+        def handle(route):
+            request = route.request
+            if self.should_block(request.url, request.resource_type):
+                self.record(request.resource_type)
+                route.abort('blockedbyclient')
+            else:
+                self.allowed += 1
+                route.continue_()
+
+        context.route('**/*', handle)
+
+    async def attach_playwright_async(self, context):
+        """Same as attach_playwright, for an async API Playwright context"""
+        if not self.enabled:
+            return
+
+        async def handle(route):
+            request = route.request
+            if self.should_block(request.url, request.resource_type):
+                self.record(request.resource_type)
+                await route.abort('blockedbyclient')
+            else:
+                self.allowed += 1
+                await route.continue_()
+
+        await context.route('**/*', handle)
@@ -16,11 +16,14 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
 import json
 import csv
 import time
-import re
+
+from indeed_cards import detect_card_tags, extract_mosaic_cards
+from indeed_html import SERP_REGION, parse_region
+from indeed_pacing import Pacer
+from indeed_parse_cache import ParseCache
 
 class IndeedManualCAPTCHAScraper:
     def __init__(self):
@@ -45,6 +48,9 @@ class IndeedManualCAPTCHAScraper:
             '''
         })
         
+        self.pacer = Pacer(initial_rate=0.5)
+        # the challenge loop re-reads the same page; its extraction is reused for page 1
+        self.parse_cache = ParseCache()
         print("✅ Browser ready!\n")
     
     def scrape_with_manual_captcha(self, url, max_pages=5):
@@ -89,10 +95,9 @@ class IndeedManualCAPTCHAScraper:
                 # Check if CAPTCHA is gone
                 if 'cloudflare' not in page_source or 'verification' not in page_source:
                     # Check if we see job listings
-                    soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                    job_cards = soup.find_all('div', class_='job_seen_beacon') or soup.find_all('div', attrs={'data-jk': True})
+                    jobs = self.parse_cache.get_or_parse(self.driver.page_source, 'serp', self.extract_page_jobs)
                     
-                    if job_cards:
+                    if jobs:
                         print("\n✅ CAPTCHA SOLVED! Found job listings!")
                         captcha_solved = True
                     else:
@@ -111,15 +116,17 @@ class IndeedManualCAPTCHAScraper:
             if page_num > 0:
                 page_url = f"{url}&start={page_num * 10}"
                 print(f"\n📄 Loading page {page_num + 1}...")
+                self.pacer.wait(page_url)
                 self.driver.get(page_url)
                 time.sleep(3)
             else:
+                page_url = url
                 print(f"\n📄 Page {page_num + 1}/{max_pages}")
             
-            # Extract jobs from current page
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            jobs = self.extract_jobs(soup)
+            # Extract jobs from current page (a page seen before comes from the parse cache)
+            jobs = self.parse_cache.get_or_parse(self.driver.page_source, 'serp', self.extract_page_jobs)
             
+            self.pacer.record(page_url, bool(jobs), 'no cards')
             if jobs:
                 print(f"✅ Found {len(jobs)} jobs on this page")
                 
@@ -129,22 +136,27 @@ class IndeedManualCAPTCHAScraper:
             else:
                 print("⚠️  No jobs found on this page")
                 break
-            
-            # Delay between pages
-            if page_num < max_pages - 1:
-                time.sleep(2)
         
+        self.pacer.report()
+        self.parse_cache.report()
         return all_jobs
     
+    def extract_page_jobs(self, html):
+        """Jobs of a SERP: embedded JSON first, HTML cards as fallback"""
+        jobs = self.extract_jobs_from_mosaic(html)
+        if jobs is None:
+            jobs = self.extract_jobs(parse_region(html, SERP_REGION))
+        return jobs
+    
     def extract_jobs(self, soup):
         """Extract jobs from page HTML"""
         jobs = []
         
         # Find job cards - try multiple selectors
         job_cards = (
-            soup.find_all('div', class_='job_seen_beacon') or
-            soup.find_all('div', attrs={'data-jk': True}) or
-            soup.find_all('td', class_='resultContent')
+            soup.select('div.job_seen_beacon') or
+            soup.select('div[data-jk]') or
+            soup.select('td.resultContent')
         )
         
         for card in job_cards:
@@ -154,9 +166,62 @@ class IndeedManualCAPTCHAScraper:
         
         return jobs
     
-    def extract_job_data(self, card):
-        """Extract data from a job card"""
-        job = {
+    def extract_jobs_from_mosaic(self, html):
+        """Extract jobs from the embedded mosaic JSON (None if the page doesn't have it)"""
+        cards = extract_mosaic_cards(html)
+        if cards is None:
+            return None
+        
+        jobs = []
+        for card in cards:
+            if not card['title']:
+                continue
+            job = self.empty_job()
+            job.update({
+                'job_id': card['job_key'],
+                'title': card['title'],
+                'apply_url': card['url'],
+                'company': card['company'],
+                'company_rating': card['company_rating'],
+                'location': card['location'],
+                'address': card['location'],
+                'description': card['snippet'],
+                'posted_date': card['posted'],
+                'featured_image': card['logo'],
+            })
+            if card['salary']:
+                job['salary'] = card['salary']
+                job['salary_type'] = self.detect_salary_type(card['salary'])
+            if card['snippet']:
+                job['type'] = self.detect_job_type(card['snippet'])
+            if card['sponsored']:
+                job['featured'] = True
+                job['tag'].append('sponsored')
+            if card['urgent']:
+                job['urgent'] = True
+                job['tag'].append('urgent')
+            jobs.append(job)
+        return jobs
+    
+    def detect_salary_type(self, salary_text):
+        if 'hora' in salary_text.lower() or 'hour' in salary_text.lower():
+            return 'hourly'
+        elif 'año' in salary_text.lower() or 'year' in salary_text.lower():
+            return 'yearly'
+        return 'monthly'
+    
+    def detect_job_type(self, desc_text):
+        desc_lower = desc_text.lower()
+        if 'tiempo completo' in desc_lower or 'full time' in desc_lower:
+            return 'full-time'
+        elif 'medio tiempo' in desc_lower or 'part time' in desc_lower:
+            return 'part-time'
+        elif 'contrato' in desc_lower or 'contract' in desc_lower:
+            return 'contract'
+        return None
+    
+    def empty_job(self):
+        return {
             'featured_image': None,
             'title': None,
             'featured': False,
@@ -189,31 +254,35 @@ class IndeedManualCAPTCHAScraper:
             'job_id': None,
             'source': 'indeed_cr'
         }
+    
+    def extract_job_data(self, card):
+        """Extract data from a job card"""
+        job = self.empty_job()
         
         try:
             # Job ID
             job['job_id'] = card.get('data-jk')
             
             # Title and URL
-            title_elem = card.find('h2', class_='jobTitle') or card.find('a', class_='jcs-JobTitle')
+            title_elem = card.select_one('h2.jobTitle') or card.select_one('a.jcs-JobTitle')
             if title_elem:
                 # Extract text
-                title_span = title_elem.find('span') or title_elem.find('a') or title_elem
+                title_span = title_elem.select_one('span') or title_elem.select_one('a') or title_elem
                 job['title'] = title_span.get_text(strip=True)
                 
                 # Extract URL
-                link = title_elem.find('a')
+                link = title_elem.select_one('a')
                 if link and link.get('href'):
                     href = link['href']
                     job['apply_url'] = f"https://cr.indeed.com{href}" if not href.startswith('http') else href
             
             # Company
-            company_elem = card.find('span', {'data-testid': 'company-name'}) or card.find('span', class_='companyName')
+            company_elem = card.select_one('span[data-testid="company-name"]') or card.select_one('span.companyName')
             if company_elem:
                 job['company'] = company_elem.get_text(strip=True)
             
             # Company Rating
-            rating_elem = card.find('span', class_='ratingNumber')
+            rating_elem = card.select_one('span.ratingNumber')
             if rating_elem:
                 try:
                     job['company_rating'] = float(rating_elem.get_text(strip=True))
@@ -221,58 +290,43 @@ class IndeedManualCAPTCHAScraper:
                     pass
             
             # Location
-            location_elem = card.find('div', {'data-testid': 'text-location'}) or card.find('div', class_='companyLocation')
+            location_elem = card.select_one('div[data-testid="text-location"]') or card.select_one('div.companyLocation')
             if location_elem:
                 location = location_elem.get_text(strip=True)
                 job['location'] = location
                 job['address'] = location
             
             # Salary
-            salary_elem = card.find('div', class_='salary-snippet') or card.find('span', class_='salary')
+            salary_elem = card.select_one('div.salary-snippet') or card.select_one('span.salary')
             if salary_elem:
                 salary_text = salary_elem.get_text(strip=True)
                 job['salary'] = salary_text
-                
-                # Detect salary type
-                if 'hora' in salary_text.lower() or 'hour' in salary_text.lower():
-                    job['salary_type'] = 'hourly'
-                elif 'año' in salary_text.lower() or 'year' in salary_text.lower():
-                    job['salary_type'] = 'yearly'
-                else:
-                    job['salary_type'] = 'monthly'
+                job['salary_type'] = self.detect_salary_type(salary_text)
             
             # Description
-            desc_elem = card.find('div', class_='job-snippet') or card.find('ul', class_='job-snippet')
+            desc_elem = card.select_one('div.job-snippet') or card.select_one('ul.job-snippet')
             if desc_elem:
                 desc_text = desc_elem.get_text(strip=True)
                 job['description'] = desc_text
-                
-                # Detect job type
-                desc_lower = desc_text.lower()
-                if 'tiempo completo' in desc_lower or 'full time' in desc_lower:
-                    job['type'] = 'full-time'
-                elif 'medio tiempo' in desc_lower or 'part time' in desc_lower:
-                    job['type'] = 'part-time'
-                elif 'contrato' in desc_lower or 'contract' in desc_lower:
-                    job['type'] = 'contract'
+                job['type'] = self.detect_job_type(desc_text)
             
             # Posted date
-            date_elem = card.find('span', class_='date')
+            date_elem = card.select_one('span.date')
             if date_elem:
                 job['posted_date'] = date_elem.get_text(strip=True)
             
             # Tags
-            card_html = str(card).lower()
-            if 'patrocinado' in card_html or 'sponsored' in card_html:
+            tags = detect_card_tags(card)
+            if 'sponsored' in tags:
                 job['featured'] = True
                 job['tag'].append('sponsored')
             
-            if 'urgently' in card_html or 'urge contratar' in card_html:
+            if 'urgent' in tags:
                 job['urgent'] = True
                 job['tag'].append('urgent')
             
             # Company logo
-            logo_elem = card.find('img', class_=re.compile(r'logo|avatar'))
+            logo_elem = card.select_one('img[class*="logo"], img[class*="avatar"]')
             if logo_elem and logo_elem.get('src'):
                 job['featured_image'] = logo_elem['src']
         
@@ -0,0 +1,206 @@
+"""
+Self-ordering selector cascades shared by the scrapers
+
+The card lookups walk a fallback list of selectors on every page, and each miss
+costs a full-document scan or a WebDriver round trip. A SelectorCascade keeps
+hit/miss counts per selector (persisted in .indeed_selector_stats.json between
+runs) and tries the selector with the best recent success rate first:
+
+    CARD_CASCADE = SelectorCascade('nodriver.cards', ['a.tapItem', 'div.job_seen_beacon', ...])
+    selector, cards = CARD_CASCADE.find(soup.select)
+    # -> ('div.job_seen_beacon', [...]) or (None, None) when every selector misses
+
+`probe(selector)` returns the matches; the first accepted result wins (by
+default any non-empty one). The winner gets a hit, the selectors tried before
+it a miss, and the ones after it are left alone, so on a normal day the first
+probe wins and nothing else is touched. Selectors the cascade was not built with
+are dropped from the stats file, so editing a list never resurrects old entries.
+
+The counts decay by DECAY on every lookup, so they weigh roughly the last
+1 / (1 - DECAY) pages. After a layout change, the old favourite drops behind the
+selector that now matches within a few pages, however long its record was.
+
+The hand-written order runs from precise to broad, and a broad selector
+(div[class*="job"]) also matches on pages where the precise ones are right. So
+a selector only moves ahead of one listed before it while that one has been
+probed and missed within the last REPROBE lookups. Past that, the earlier
+selector is probed first again. One interstitial page where only the catch-all
+matched therefore costs at most REPROBE pages of broad matches, not the rest of
+the run. The misses are not saved, so each run starts precise-first.
+The stats are written once, when the process exits (or on save()), under a
+lock file held across the read-merge-write so concurrent runs don't clobber
+each other.
+"""
+
+import atexit
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:         # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+STATS_FILE = '.indeed_selector_stats.json'
+# weight of the previous counts at each lookup (~ the last 10 pages count)
+DECAY = 0.9
+# a selector that missed lets later-listed ones go first for this many lookups, then is probed again
+REPROBE = 10
+
+_file_lock = threading.Lock()
+
+
+def selector_key(selector):
+    """Stats key of a selector: CSS strings as-is, ('XPATH', '//div') -> 'XPATH://div'"""
+    if isinstance(selector, (tuple, list)):
+        return ':'.join(str(part) for part in selector)
+    return str(selector)
+
+
+@contextmanager
+def locked_stats(stats_file=STATS_FILE):
+    """Hold the stats file's lock (threads and processes) for a read-modify-write"""
+    with _file_lock, open(f"{stats_file}.lock", 'a+') as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        elif msvcrt:
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+            elif msvcrt:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def load_stats(stats_file=STATS_FILE):
+    try:
+        with open(stats_file, encoding='utf-8') as f:
+            stats = json.load(f)
+        return stats if isinstance(stats, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+class SelectorCascade:
+    """Fallback selector list ordered by past success rate"""
+
+    def __init__(self, name, selectors, stats_file=STATS_FILE, decay=DECAY, reprobe=REPROBE):
+        self.name = name
+        self.selectors = list(selectors)
+        self.stats_file = stats_file
+        self.decay = decay
+        self.reprobe = reprobe
+        self.position = {selector_key(s): i for i, s in enumerate(self.selectors)}
+        # selector key -> lookup at which it last missed (cleared by a hit)
+        self.missed_at = {}
+        self.lookups = 0
+        saved = load_stats(stats_file).get(name, {}) if stats_file else {}
+        self.stats = {}
+        # lifetime counts from older stats files are scaled down to the decayed steady state
+        window = 1 / (1 - decay) if decay < 1 else float('inf')
+        for selector in self.selectors:
+            counts = saved.get(selector_key(selector)) or {}
+            hits, misses = float(counts.get('hits', 0)), float(counts.get('misses', 0))
+            scale = min(1.0, window / (hits + misses)) if hits + misses else 1.0
+            self.stats[selector_key(selector)] = {'hits': hits * scale, 'misses': misses * scale}
+        self._lock = threading.Lock()
+        self.dirty = False
+        if stats_file:
+            atexit.register(self.save)
+
+    def success_rate(self, selector):
+        """Laplace-smoothed rate of the decayed counts: unseen selectors start at 0.5"""
+        counts = self.stats[selector_key(selector)]
+        return (counts['hits'] + 1) / (counts['hits'] + counts['misses'] + 2)
+
+    def passed(self, selector):
+        """True if later-listed selectors may go before `selector`: it missed within the last `reprobe` lookups"""
+        missed = self.missed_at.get(selector_key(selector))
+        return missed is not None and self.lookups - missed < self.reprobe
+
+    def ordered(self):
+        """
+        Selectors by success rate, ties in the original (hand-written) order
+
+        A selector never goes before an earlier-listed one that has not recently missed (see passed)
+        """
+        position = self.position
+        remaining = sorted(self.selectors, key=lambda s: (-self.success_rate(s), position[selector_key(s)]))
+        order = []
+        while remaining:
+            # the first selector (hand order) that still has to be probed bounds who may go next
+            blocker = min((s for s in remaining if not self.passed(s)), key=lambda s: position[selector_key(s)],
+                          default=None)
+            limit = position[selector_key(blocker)] if blocker is not None else len(position)
+            selector = next(s for s in remaining if position[selector_key(s)] <= limit)
+            remaining.remove(selector)
+            order.append(selector)
+        return order
+
+    def find(self, probe, accept=bool):
+        """
+        Try the selectors best-first; returns (selector, result) of the first accepted result
+
+        A probe raising an exception counts as a miss. Returns (None, None) if nothing matched
+        """
+        tried = []
+        winner, result = None, None
+        for selector in self.ordered():
+            try:
+                found = probe(selector)
+            except Exception:
+                found = None
+            if found is not None and accept(found):
+                winner, result = selector, found
+                break
+            tried.append(selector)
+
+        with self._lock:
+            self.lookups += 1
+            for counts in self.stats.values():
+                counts['hits'] *= self.decay
+                counts['misses'] *= self.decay
+            for selector in tried:
+                self.stats[selector_key(selector)]['misses'] += 1
+                self.missed_at[selector_key(selector)] = self.lookups
+            if winner is not None:
+                self.stats[selector_key(winner)]['hits'] += 1
+                self.missed_at.pop(selector_key(winner), None)
+            self.dirty = True
+        return winner, result
+
+    def save(self):
+        """Merge this cascade's counts into the stats file (other cascades are kept); runs at exit"""
+        if not self.stats_file or not self.dirty:
+            return
+        try:
+            with locked_stats(self.stats_file):
+                stats = load_stats(self.stats_file)
+                with self._lock:
+                    stats[self.name] = {key: {name: round(value, 4) for name, value in counts.items()}
+                                        for key, counts in self.stats.items()}
+                    self.dirty = False
+                tmp = f"{self.stats_file}.tmp"
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(stats, f, indent=2)
+                os.replace(tmp, self.stats_file)
+        except OSError as e:
+            print(f"  ⚠️ Could not save selector stats: {e}")
+
+    def report(self):
+        print(f"🎯 {self.name}:")
+        for selector in self.ordered():
+            counts = self.stats[selector_key(selector)]
+            print(f"   {self.success_rate(selector):4.0%}  {counts['hits']:5.1f} hits {counts['misses']:5.1f} misses  "
+                  f"{selector_key(selector)}")
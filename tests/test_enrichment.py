@@ -0,0 +1,126 @@
+"""
+TextEnricher against the per-field extractors it replaced
+
+enrichment_golden.json holds what each scraper's extract_experience_from_text /
+extract_qualification / extract_job_type / extract_category returned for every job of
+the checked-in indeed_cr_jobs_*.json datasets, as of the commit before TextEnricher
+(a82209d^). Rows are [experience, career level, qualification, job type, category];
+Details_Scraper had no category. The values were produced by running those methods
+from `git show a82209d^:<scraper>`, so they do not depend on the current rule tables.
+
+Run:
+python -m pytest tests
+"""
+
+import json
+import os
+import random
+import re
+
+import pytest
+
+from indeed_enrichment import (CATEGORY_MATCHER, CATEGORY_MATCHER_EN, CATEGORY_MATCHER_ES, TEXT_ENRICHER,
+                               TEXT_ENRICHER_BASIC, TEXT_ENRICHER_DETAILS, TEXT_ENRICHER_EN, TEXT_ENRICHER_ES,
+                               word_tokens)
+from indeed_localize import localize_jobs
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GOLDEN_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'enrichment_golden.json')
+
+with open(GOLDEN_FILE, encoding='utf-8') as f:
+    GOLDEN = json.load(f)
+
+# golden key -> enricher that replaced the scraper's extract_* methods
+ENRICHERS = {
+    'nodriver': TEXT_ENRICHER,              # indeed_arc_details_scraper.py
+    'full_details': TEXT_ENRICHER_BASIC,    # indeed_full_details_scraper.py
+    'details': TEXT_ENRICHER_DETAILS,       # Details_Scraper.py
+    'copy_es': TEXT_ENRICHER_ES,            # indeed_arc_details_scraper copy.py (Spanish labels)
+}
+# enrich() keys in golden row order
+FIELDS = ('experience', 'career_level', 'qualification', 'job_type', 'category')
+COLUMNS = ('_job_experience', '_job_career_level', '_job_qualification', '_job_type', '_job_category')
+
+
+def load_jobs(dataset):
+    with open(os.path.join(ROOT, dataset), encoding='utf-8') as f:
+        return [(job.get('_job_title') or '', job.get('_job_description') or '') for job in json.load(f)]
+
+
+def as_row(fields):
+    return [fields[name] for name in FIELDS if name in fields]
+
+
+CASES = [(dataset, scraper) for dataset in GOLDEN for scraper in ENRICHERS]
+
+
+def test_golden_covers_datasets():
+    datasets = sorted(name for name in os.listdir(ROOT) if name.startswith('indeed_cr_jobs_') and name.endswith('.json'))
+    assert datasets == sorted(GOLDEN)
+    for dataset in datasets:
+        jobs = load_jobs(dataset)
+        assert all(len(rows) == len(jobs) for rows in GOLDEN[dataset].values())
+
+
+@pytest.mark.parametrize('dataset, scraper', CASES)
+def test_enrich_matches_legacy_extractors(dataset, scraper):
+    enricher = ENRICHERS[scraper]
+    for (title, description), expected in zip(load_jobs(dataset), GOLDEN[dataset][scraper]):
+        assert as_row(enricher.enrich(description, title)) == expected, title
+
+
+@pytest.mark.parametrize('dataset, scraper', CASES)
+def test_single_field_helpers_match_legacy_extractors(dataset, scraper):
+    # card snippets still go through the single-field helpers
+    enricher = ENRICHERS[scraper]
+    for (title, description), expected in zip(load_jobs(dataset), GOLDEN[dataset][scraper]):
+        assert list(enricher.experience(description)) == expected[:2], title
+        assert enricher.qualification(description) == expected[2], title
+        assert enricher.job_type(description) == expected[3], title
+
+
+@pytest.mark.parametrize('dataset', list(GOLDEN))
+def test_localized_copy_matches_legacy_spanish_extractors(dataset):
+    # the copy scraper now enriches in English and localises at save time
+    jobs = [dict(zip(COLUMNS, as_row(TEXT_ENRICHER_EN.enrich(description, title))))
+            for title, description in load_jobs(dataset)]
+    localized = localize_jobs(jobs, 'es')
+    assert [[job[column] for column in COLUMNS] for job in localized] == GOLDEN[dataset]['copy_es']
+
+
+# -------------------------
+# Category word index vs the keyword regex
+# -------------------------
+MATCHERS = {'en': CATEGORY_MATCHER, 'es': CATEGORY_MATCHER_ES, 'copy en': CATEGORY_MATCHER_EN}
+GLUE = [' ', '  ', '\n', '.', ',', '-', '/', '(', ')', '_', '•', '–', '¿', '“', '”', ' ', '́', '',
+        's', 'es', 'x', '1', 'ñ', 'é']
+
+
+def random_texts(matcher, count, seed):
+    """Keywords (cut, pluralised, glued to punctuation or letters) mixed with filler words"""
+    rng = random.Random(seed)
+    keywords = list(matcher.keyword_categories)
+    filler = ['the', 'al', 'de', 'service', 'center', 'net', 'asp', 'cliente', 'nodes', 'salesforce', 'hr']
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 40)):
+            word = rng.choice(keywords) if rng.random() < 0.6 else rng.choice(filler)
+            if rng.random() < 0.1:
+                word = word[:rng.randint(1, len(word))]
+            parts.append(word + rng.choice(GLUE))
+        yield ''.join(parts).lower()
+
+
+@pytest.mark.parametrize('name', list(MATCHERS))
+def test_word_index_matches_keyword_regex(name):
+    matcher = MATCHERS[name]
+    assert matcher.tokenized
+    texts = list(random_texts(matcher, 3000, seed=len(name)))
+    texts += [f"{title} {description}".lower() for dataset in GOLDEN for title, description in load_jobs(dataset)]
+    for text in texts:
+        assert matcher.scores(text, lowered=True) == matcher.regex_scores(text, lowered=True), text
+
+
+def test_word_tokens_match_regex_words():
+    for text in random_texts(CATEGORY_MATCHER_ES, 2000, seed=7):
+        assert word_tokens(text) == [word.encode('utf-8') for word in re.findall(r'\w+', text)]
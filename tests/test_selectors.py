@@ -0,0 +1,56 @@
+"""
+SelectorCascade ordering: a broad selector that wins once must not stay first
+
+Run:
+python -m pytest tests
+"""
+
+from indeed_selectors import REPROBE, SelectorCascade
+
+# precise to broad, like the scrapers' card lists
+SELECTORS = ['div.job_seen_beacon', 'div[data-jk]', 'td.resultContent', 'li[data-jk]', 'div[class*="job"]']
+CATCH_ALL = 'div[class*="job"]'
+
+
+def page(*matching):
+    """probe() of a page where only `matching` selectors find something"""
+    return lambda selector: ['node'] * (300 if selector == CATCH_ALL else 15) if selector in matching else []
+
+
+NORMAL = page('div.job_seen_beacon', 'div[data-jk]', CATCH_ALL)
+INTERSTITIAL = page(CATCH_ALL)
+
+
+def test_catch_all_win_does_not_stick():
+    cascade = SelectorCascade('test.cards', SELECTORS, stats_file=None)
+    assert cascade.find(NORMAL)[0] == 'div.job_seen_beacon'
+    assert cascade.find(INTERSTITIAL)[0] == CATCH_ALL
+
+    winners = [cascade.find(NORMAL)[0] for _ in range(50)]
+    # the precise selectors are probed again within REPROBE lookups and take over for good
+    assert CATCH_ALL not in winners[REPROBE:]
+    assert winners[-1] == 'div.job_seen_beacon'
+    assert cascade.ordered()[0] == 'div.job_seen_beacon'
+
+
+def test_layout_change_still_reorders():
+    cascade = SelectorCascade('test.cards', SELECTORS, stats_file=None)
+    moved = page('div[data-jk]', CATCH_ALL)
+    winners = [cascade.find(moved)[0] for _ in range(30)]
+    assert set(winners) == {'div[data-jk]'}
+    # the old favourite is only re-probed once per REPROBE lookups
+    probed = []
+    cascade.find(lambda selector: probed.append(selector) or moved(selector))
+    assert probed[-1] == 'div[data-jk]' and len(probed) <= 2
+
+
+def test_saved_catch_all_lead_does_not_carry_over(tmp_path):
+    stats_file = str(tmp_path / 'stats.json')
+    cascade = SelectorCascade('test.cards', SELECTORS, stats_file=stats_file)
+    for _ in range(5):
+        cascade.find(INTERSTITIAL)
+    cascade.save()
+
+    next_run = SelectorCascade('test.cards', SELECTORS, stats_file=stats_file)
+    assert next_run.success_rate(CATCH_ALL) > next_run.success_rate('div.job_seen_beacon')
+    assert next_run.find(NORMAL)[0] == 'div.job_seen_beacon'